@@ -0,0 +1,67 @@
+"""Model pickling and construction relying on Modelity internals.
+
+This is the only module using non-public parts of Modelity (field
+descriptors, :class:`Loc` and :obj:`Unset`), so that changes in those are
+limited to this module. Modelity versions this was verified with are pinned
+in ``pyproject.toml``; ``tests/unit/test_model.py`` checks that models sent
+to worker processes survive a pickle round trip.
+"""
+
+from collections.abc import MutableMapping, MutableSequence
+from typing import Optional, Union
+
+from modelity.loc import Loc
+from modelity.unset import Unset
+
+_container_types = {}
+
+
+def dump_state(obj) -> dict:
+    """Return field values of a model object as a dict that can be pickled.
+
+    Modelity wraps list and dict fields with proxy objects that cannot be
+    pickled, so those are converted back to plain containers.
+    """
+    state = {}
+    for name in obj.__class__.__model_fields__:
+        value = getattr(obj, name)
+        if isinstance(value, MutableSequence) and not isinstance(value, list):
+            value = list(value)
+        elif isinstance(value, MutableMapping) and not isinstance(value, dict):
+            value = dict(value)
+        state[name] = value
+    return state
+
+
+def fill_defaults(cls: type, state: dict) -> dict:
+    """Set defaults of fields missing in *state*, and return it."""
+    for name, field in cls.__model_fields__.items():
+        if name not in state:
+            state[name] = field.compute_default()
+    return state
+
+
+def restore_model(cls: type, state: dict):
+    """Create model object of type *cls* from already parsed field values.
+
+    Values are set directly, skipping field processors; containers are only
+    wrapped with the same proxy type Modelity would use for the field.
+    """
+    obj = cls.__new__(cls)
+    for name, value in state.items():
+        if isinstance(value, (list, dict)):
+            container_type = _find_container_type(cls, name, value)
+            if container_type is None:
+                value = cls.__model_fields__[name].descriptor.parse([], Loc(name), value)
+            elif container_type is not type(value):
+                value = container_type(value)
+        object.__setattr__(obj, name, value)
+    return obj
+
+
+def _find_container_type(cls: type, name: str, value: Union[list, dict]) -> Optional[type]:
+    key = cls, name, type(value)
+    if key not in _container_types:
+        empty = cls.__model_fields__[name].descriptor.parse([], Loc(name), type(value)())
+        _container_types[key] = None if empty is Unset else type(empty)
+    return _container_types[key]
@@ -21,3 +21,28 @@ class Context:
 
     #: Flag telling if we're running in a "dry run" mode.
     dry_run: bool = False
+
+    #: Path to a directory where Bumpify stores its cache files (relative to
+    #: :attr:`project_root_dir`).
+    #:
+    #: Caching is disabled if this is not set.
+    cache_dir: str = None
+
+    #: Number of processes to use for parsing commits.
+    #:
+    #: If not set, then value from the config file is used.
+    jobs: int = None
+
+    #: Flag telling if modified files should be flushed to the storage device
+    #: before creating version bump commit.
+    fsync: bool = False
+
+    #: Flag telling if execution time of hooks should be measured and
+    #: reported once Bumpify is about to exit.
+    profile_hooks: bool = False
+
+    #: Optional path to a file to write hook execution statistics to, in JSON
+    #: format (relative to :attr:`project_root_dir`).
+    #:
+    #: Setting this enables hook profiling.
+    profile_hooks_json: str = None
@@ -1,3 +1,6 @@
+import datetime
+from typing import Set
+
 from bumpify import utils
 from bumpify.core.config.interface import IConfigReaderWriter
 from bumpify.core.config.objects import LoadedSection
@@ -6,7 +9,7 @@ from bumpify.core.semver.interface import ISemVerApi
 from bumpify.core.semver.objects import Changelog, ChangelogEntry, SemVerConfig, Version
 from bumpify.core.vcs.interface import IVcsReaderWriter
 
-from .interface import IBumpCommand, IInitCommand
+from .interface import IBumpCommand, IDiscoverCommand, IInitCommand, INextVersionCommand
 
 
 class InitCommand(IInitCommand):
@@ -39,38 +42,42 @@ class BumpCommand(IBumpCommand):
         self._filesystem_reader_writer = filesystem_reader_writer
         self._vcs_reader_writer = vcs_reader_writer
 
-    def bump(self, presenter: IBumpCommand.IBumpPresenter):
+    def bump(self, presenter: IBumpCommand.IBumpPresenter, rollback: bool = False):
         # TODO: Also update version field in config
         current_branch = self._vcs_reader_writer.current_branch()
         bump_rule = self._semver_config.config.find_bump_rule(current_branch)
         if bump_rule is None:
             presenter.no_bump_rule_found(current_branch)
             return
+        # Changes left by interrupted bump, if any; these are already
+        # accepted if the bump commit was created before the interruption
+        head_rev = self._vcs_reader_writer.find_head_rev()
+        pending_paths = self._filesystem_reader_writer.pending_paths(head_rev)
+        if pending_paths:
+            if not rollback:
+                presenter.interrupted_bump_found(pending_paths)
+                return
+            presenter.interrupted_bump_rolled_back(self.__rollback(head_rev))
         self._filesystem_reader_writer.clear_modified_paths()
+        self._filesystem_reader_writer.set_checkpoint(head_rev)
+        # Release date is also used as the bump commit date, so that it is
+        # the same as creation date of the version tag when changelog is
+        # later generated from scratch; Git stores dates with 1s resolution
+        released = utils.utcnow().replace(microsecond=0)
         version_tags = self._semver_api.list_version_tags()
         if not version_tags:
             version = Version.from_str(self._semver_config.config.version)
-            utcnow = utils.utcnow()
             changelog = Changelog()
-            changelog.add_entry(ChangelogEntry(version=version, released=utcnow))
-            self._semver_api.update_changelog_files(changelog)
-            self._semver_api.update_version_files(version)
-            self._commit(version)
+            changelog.add_entry(ChangelogEntry(version=version, released=released))
+            self._commit(changelog, version, released)
             presenter.version_bumped(version)
             return
         unreleased_changes = self._semver_api.fetch_unreleased_changes(version_tags[-1])
-        if unreleased_changes is None:
-            presenter.no_changes_found(version_tags[-1].version)
-            return
-        if unreleased_changes.breaking_changes:
-            component = bump_rule.when_breaking
-        elif unreleased_changes.feats:
-            component = bump_rule.when_feat
-        elif unreleased_changes.fixes:
-            component = bump_rule.when_fix
-        else:
+        severity = None if unreleased_changes is None else unreleased_changes.severity
+        if severity is None:
             presenter.no_changes_found(version_tags[-1].version)
             return
+        component = bump_rule.find_component(severity)
         changelog = self._semver_api.fetch_changelog(version_tags)
         prev_version = changelog.entries[-1].version
         version = prev_version.bump(
@@ -80,36 +87,118 @@ class BumpCommand(IBumpCommand):
             ChangelogEntry(
                 version=version,
                 prev_version=prev_version,
-                released=utils.utcnow(),
+                released=released,
                 data=unreleased_changes,
             )
         )
-        self._semver_api.update_changelog_files(changelog)
-        self._semver_api.update_version_files(version)
-        self._commit(version, prev_version=prev_version)
+        self._commit(changelog, version, released, prev_version=prev_version)
         presenter.version_bumped(version, prev_version=prev_version)
 
-    def _commit(self, version: Version, prev_version: Version = None):
+    def _commit(
+        self,
+        changelog: Changelog,
+        version: Version,
+        released: datetime.datetime,
+        prev_version: Version = None,
+    ):
         version_str = version.to_str()
         prev_version_str = prev_version.to_str() if prev_version else "(null)"
-        self.__add_modified_paths_to_bump_commit()
-        bump_commit_rev = self.__create_bump_commit(version_str, prev_version_str)
+        try:
+            self._semver_api.update_files(changelog, version)
+            self._filesystem_reader_writer.sync()
+            paths_added = self.__add_modified_paths_to_bump_commit()
+            bump_commit_rev = self.__create_bump_commit(
+                version_str, prev_version_str, released, allow_empty=not paths_added
+            )
+        except BaseException:
+            self.__rollback()
+            raise
+        self._filesystem_reader_writer.clear_modified_paths()
         self.__create_version_tag(bump_commit_rev, version_str)
 
-    def __add_modified_paths_to_bump_commit(self):
+    def __rollback(self, checkpoint: str = None) -> Set[str]:
+        # Restored files might have already been added to the index
+        restored_paths = self._filesystem_reader_writer.rollback(checkpoint)
+        if restored_paths:
+            self._vcs_reader_writer.reset(*sorted(restored_paths))
+        return restored_paths
+
+    def __add_modified_paths_to_bump_commit(self) -> bool:
         modified_paths = sorted(self._filesystem_reader_writer.modified_paths())
+        if not modified_paths:
+            return False  # All files were already up to date
         self._vcs_reader_writer.add(*modified_paths)
+        return True
 
-    def __create_bump_commit(self, version_str: str, prev_version_str: str) -> str:
+    def __create_bump_commit(
+        self,
+        version_str: str,
+        prev_version_str: str,
+        released: datetime.datetime,
+        allow_empty: bool,
+    ) -> str:
         bump_commit_message = utils.format_str(
             self._semver_config.config.bump_commit_message_template,
             version_str=version_str,
             prev_version_str=prev_version_str,
         )
-        return self._vcs_reader_writer.commit(bump_commit_message)
+        return self._vcs_reader_writer.commit(
+            bump_commit_message, allow_empty=allow_empty, date=released
+        )
 
     def __create_version_tag(self, bump_commit_rev: str, version_str: str):
         version_tag_name = utils.format_str(
             self._semver_config.config.version_tag_name_template, version_str=version_str
         )
         self._vcs_reader_writer.tag(bump_commit_rev, version_tag_name)
+
+
+class NextVersionCommand(INextVersionCommand):
+
+    def __init__(
+        self,
+        semver_config: LoadedSection[SemVerConfig],
+        semver_api: ISemVerApi,
+        vcs_reader_writer: IVcsReaderWriter,
+    ):
+        self._semver_config = semver_config
+        self._semver_api = semver_api
+        self._vcs_reader_writer = vcs_reader_writer
+
+    def next_version(self, presenter: INextVersionCommand.INextVersionPresenter):
+        current_branch = self._vcs_reader_writer.current_branch()
+        bump_rule = self._semver_config.config.find_bump_rule(current_branch)
+        if bump_rule is None:
+            presenter.no_bump_rule_found(current_branch)
+            return
+        version_tags = self._semver_api.list_version_tags()
+        if not version_tags:
+            presenter.next_version_found(Version.from_str(self._semver_config.config.version))
+            return
+        prev_version = version_tags[-1].version
+        severity = self._semver_api.detect_bump_severity(version_tags[-1])
+        if severity is None:
+            presenter.no_changes_found(prev_version)
+            return
+        version = prev_version.bump(
+            bump_rule.find_component(severity), prerelease=bump_rule.prerelease
+        )
+        presenter.next_version_found(version, prev_version=prev_version)
+
+
+class DiscoverCommand(IDiscoverCommand):
+
+    def __init__(self, semver_config: LoadedSection[SemVerConfig], semver_api: ISemVerApi):
+        self._semver_config = semver_config
+        self._semver_api = semver_api
+
+    def discover(self, presenter: IDiscoverCommand.IDiscoverPresenter):
+        locations = self._semver_api.discover_version_files()
+        if not locations:
+            presenter.no_version_files_found()
+            return
+        configured_paths = set(x.path for x in self._semver_config.config.version_files)
+        for location in locations:
+            presenter.version_file_found(
+                location, configured=location.version_file.path in configured_paths
+            )
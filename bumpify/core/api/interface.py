@@ -1,7 +1,8 @@
 import abc
+from typing import Set
 
 from bumpify.core.config.objects import Config
-from bumpify.core.semver.objects import Version
+from bumpify.core.semver.objects import Version, VersionFileLocation
 
 
 class IInitCommand(abc.ABC):
@@ -82,6 +83,112 @@ class IBumpCommand(abc.ABC):
         def version_bumped(self, version: Version, prev_version: Version = None):
             pass
 
+        @abc.abstractmethod
+        def interrupted_bump_found(self, paths: Set[str]):
+            pass
+
+        @abc.abstractmethod
+        def interrupted_bump_rolled_back(self, paths: Set[str]):
+            pass
+
+    @abc.abstractmethod
+    def bump(self, presenter: IBumpPresenter, rollback: bool = False):
+        """Bump version of the project.
+
+        :param presenter:
+            Status presenter.
+
+        :param rollback:
+            Restore files left modified by a previous bump that was
+            interrupted before it created the bump commit.
+
+            If not set and such files are found, then the bump is skipped and
+            the presenter is informed.
+        """
+
+
+class INextVersionCommand(abc.ABC):
+    """An interface for the next version command.
+
+    This command calculates the version that would be created by the
+    :meth:`IBumpCommand.bump` method, but does not modify anything. Only the
+    severity of changes is analyzed, so it is significantly faster than the
+    bump itself.
+    """
+
+    class INextVersionPresenter(abc.ABC):
+        """Presenter interface for the :meth:`INextVersionCommand.next_version`
+        method."""
+
+        @abc.abstractmethod
+        def no_bump_rule_found(self, branch: str):
+            """Called when no bump rule was found for current branch.
+
+            :param branch:
+                The name of current branch.
+            """
+
+        @abc.abstractmethod
+        def no_changes_found(self, prev_version: Version):
+            """Called when there are no changes that would cause the version
+            to be bumped.
+
+            :param prev_version:
+                The most recent version.
+            """
+
+        @abc.abstractmethod
+        def next_version_found(self, version: Version, prev_version: Version = None):
+            """Called with the version that would be created by the bump.
+
+            :param version:
+                Next version.
+
+            :param prev_version:
+                The most recent version or ``None`` if next version would be
+                the initial one.
+            """
+
+    @abc.abstractmethod
+    def next_version(self, presenter: INextVersionPresenter):
+        """Calculate next version of the project.
+
+        :param presenter:
+            Status presenter.
+        """
+
+
+class IDiscoverCommand(abc.ABC):
+    """An interface for the version file discovery command.
+
+    This command finds known version files in the project, allowing to
+    check if all of them are listed in the config file.
+    """
+
+    class IDiscoverPresenter(abc.ABC):
+        """Presenter interface for the :meth:`IDiscoverCommand.discover`
+        method."""
+
+        @abc.abstractmethod
+        def no_version_files_found(self):
+            """Called when no version files were found."""
+
+        @abc.abstractmethod
+        def version_file_found(self, location: VersionFileLocation, configured: bool):
+            """Called for each version file found.
+
+            :param location:
+                Location of the version in a version file.
+
+            :param configured:
+                Flag telling if the file is already listed in the config
+                file.
+            """
+
     @abc.abstractmethod
-    def bump(self, presenter: IBumpPresenter):
-        pass
+    def discover(self, presenter: IDiscoverPresenter):
+        """Find version files in the project.
+
+        :param presenter:
+            Status presenter.
+        """
@@ -1,8 +1,10 @@
+from typing import Set
+
 from bumpify.core.console.interface import IConsoleOutput
 from bumpify.core.console.objects import Severity, Styled
-from bumpify.core.semver.objects import Version
+from bumpify.core.semver.objects import Version, VersionFileLocation
 
-from .interface import IBumpCommand, IInitCommand
+from .interface import IBumpCommand, IDiscoverCommand, IInitCommand, INextVersionCommand
 
 
 class InitPresenter(IInitCommand.IInitPresenter):
@@ -51,3 +53,68 @@ class BumpCommandPresenter(IBumpCommand.IBumpPresenter):
             "->",
             Styled(version.to_str(), bold=True),
         )
+
+    def interrupted_bump_found(self, paths: Set[str]):
+        self._cout.emit(
+            Severity.WARNING,
+            "Files left modified by interrupted bump found:",
+            *(Styled(x, bold=True) for x in sorted(paths)),
+        )
+        self._cout.emit(
+            Severity.WARNING,
+            "Bump was skipped; run it again with",
+            Styled("--rollback", bold=True),
+            "option to restore those files first",
+        )
+
+    def interrupted_bump_rolled_back(self, paths: Set[str]):
+        self._cout.emit(
+            Severity.INFO,
+            "Files left modified by interrupted bump were restored:",
+            *(Styled(x, bold=True) for x in sorted(paths)),
+        )
+
+
+class NextVersionCommandPresenter(INextVersionCommand.INextVersionPresenter):
+
+    def __init__(self, cout: IConsoleOutput):
+        self._cout = cout
+
+    def no_bump_rule_found(self, branch: str):
+        self._cout.emit(Severity.ERROR, "No bump rule found for branch:", Styled(branch, bold=True))
+
+    def no_changes_found(self, prev_version: Version):
+        self._cout.emit(
+            Severity.WARNING,
+            "No changes found between version",
+            Styled(prev_version.to_str(), bold=True),
+            "and current",
+            Styled("HEAD", bold=True),
+        )
+
+    def next_version_found(self, version: Version, prev_version: Version = None):
+        self._cout.emit(
+            Severity.INFO,
+            "Version would be bumped:",
+            Styled("(null)" if prev_version is None else prev_version.to_str(), bold=True),
+            "->",
+            Styled(version.to_str(), bold=True),
+        )
+
+
+class DiscoverCommandPresenter(IDiscoverCommand.IDiscoverPresenter):
+
+    def __init__(self, cout: IConsoleOutput):
+        self._cout = cout
+
+    def no_version_files_found(self):
+        self._cout.emit(Severity.WARNING, "No version files found")
+
+    def version_file_found(self, location: VersionFileLocation, configured: bool):
+        self._cout.emit(
+            Severity.INFO if configured else Severity.WARNING,
+            "Found version file:" if configured else "Found version file missing in config:",
+            Styled(f"{location.version_file.path}:{location.line}", bold=True),
+            "with version",
+            Styled(location.version.to_str(), bold=True),
+        )
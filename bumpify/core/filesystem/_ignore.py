@@ -0,0 +1,143 @@
+"""Matching of paths against gitignore-style patterns.
+
+See https://git-scm.com/docs/gitignore#_pattern_format for the description
+of the pattern format.
+"""
+
+import re
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+
+def _translate(pattern: str) -> str:
+    # Translate pattern with leading and trailing slashes already removed
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == n and (i == 0 or pattern[i - 1] == "/"):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            while i + 1 < n and pattern[i + 1] == "*":
+                i += 1
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1 : end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"(?!/)[{body}]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def _parse(line: str) -> Optional[Tuple[str, bool, bool]]:
+    # Returns tuple (regex, negated, dir_only) or None for blank lines and comments
+    line = line.rstrip("\r\n")
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    regex = _translate(line.lstrip("/"))
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return regex, negated, dir_only
+
+
+class IgnoreRules:
+    """A set of gitignore-style patterns.
+
+    :param patterns:
+        The patterns, in same format as lines of a ``.gitignore`` file.
+
+    :param base:
+        Path of a directory the patterns are relative to.
+
+        This is a path of a directory containing ``.gitignore`` file the
+        patterns were read from. Only paths inside that directory can be
+        matched.
+    """
+
+    def __init__(self, patterns: Iterable[str], base: str = ""):
+        self._base_prefix = base.rstrip("/") + "/" if base else ""
+        self._rules: List[Tuple[Pattern, bool, bool]] = []
+        for pattern in patterns:
+            parsed = _parse(pattern)
+            if parsed is not None:
+                regex, negated, dir_only = parsed
+                self._rules.append((re.compile(regex + r"\Z", re.DOTALL), negated, dir_only))
+        self._combined = None
+        if not any(negated for _, negated, _ in self._rules):
+            # Without negations, all patterns can be checked with single regex
+            self._combined = (
+                self._combine(self._rules),
+                self._combine([x for x in self._rules if not x[2]]),
+            )
+
+    def __bool__(self):
+        return bool(self._rules)
+
+    @staticmethod
+    def _combine(rules: List[Tuple[Pattern, bool, bool]]) -> Optional[Pattern]:
+        if not rules:
+            return None
+        return re.compile("|".join(f"(?:{x[0].pattern})" for x in rules), re.DOTALL)
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """Check if *path* is ignored by these rules.
+
+        Returns ``True`` if it is ignored, ``False`` if it is explicitly not
+        ignored by a negated pattern, or ``None`` if no pattern matches.
+
+        Parent directories of *path* are not checked.
+
+        :param path:
+            Path to be checked, with ``/`` as a separator.
+
+        :param is_dir:
+            Flag telling if *path* is a directory.
+        """
+        if self._base_prefix:
+            if not path.startswith(self._base_prefix):
+                return None
+            path = path[len(self._base_prefix) :]
+        if self._combined is not None:
+            regex = self._combined[0 if is_dir else 1]
+            if regex is not None and regex.fullmatch(path):
+                return True
+            return None
+        for regex, negated, dir_only in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not negated
+        return None
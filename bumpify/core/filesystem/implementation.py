@@ -1,14 +1,25 @@
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import mmap
 import os
+import shutil
+import stat
 import textwrap
-from typing import Iterator, Set
+import uuid
+from typing import BinaryIO, ContextManager, Iterable, Iterator, Optional, Set, Tuple, Union
 
 from bumpify import utils
 from bumpify.core.console.interface import IConsoleOutput
 from bumpify.core.console.objects import Severity, Styled
 
-from . import exc
+from . import _ignore, exc
 from .interface import IFileSystemReaderWriter, IFileSystemWriter
 
+logger = logging.getLogger(__name__)
+
 
 def _normalize_path(path: str) -> str:
     if path.startswith(os.path.sep):
@@ -16,19 +27,193 @@ def _normalize_path(path: str) -> str:
     return path
 
 
+def _file_size(abspath: str) -> Optional[int]:
+    try:
+        return os.stat(abspath).st_size
+    except FileNotFoundError:
+        return None
+
+
+def _file_digest(abspath: str) -> bytes:
+    h = hashlib.sha256()
+    with open(abspath, "rb") as fd:
+        for chunk in iter(lambda: fd.read(65536), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def _has_hard_links(abspath: str) -> bool:
+    try:
+        return os.stat(abspath).st_nlink > 1
+    except FileNotFoundError:
+        return False
+
+
+def _publish(tmp_abspath: str, abspath: str, in_place: bool):
+    if in_place:
+        shutil.copyfile(tmp_abspath, abspath)
+        os.remove(tmp_abspath)
+    else:
+        os.replace(tmp_abspath, abspath)
+
+
+def _fsync_path(abspath: str, directory: bool = False):
+    flags = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) if directory else os.O_RDONLY
+    try:
+        fd = os.open(abspath, flags)
+    except OSError:
+        if directory:
+            return  # Not supported on some platforms (f.e. Windows)
+        raise
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _Journal:
+    """Journal of files modified by :class:`FileSystemReaderWriter`.
+
+    Before a file is modified for the first time, its path is appended to
+    the journal file and its original content is kept as a backup, so that
+    files can be restored, even by another process, if the changes are not
+    completed.
+
+    If the journal cannot be written (f.e. when its directory is placed
+    inside ``.git`` of a worktree, where ``.git`` is a file), then a warning
+    is logged and files are modified without being journaled.
+    """
+
+    def __init__(self, journal_dir: str, fsync: bool):
+        self._journal_dir = journal_dir
+        self._journal_path = os.path.join(journal_dir, "journal.jsonl")
+        self._fsync = fsync
+        self._checkpoint = None
+        self._recorded_paths = set()
+        self._disabled = False
+
+    def set_checkpoint(self, checkpoint: str):
+        self._checkpoint = checkpoint
+
+    def record(self, path: str, abspath: str):
+        if self._disabled or path in self._recorded_paths:
+            return
+        try:
+            self._record(path, abspath)
+        except OSError as e:
+            logger.warning("Could not write journal of modified files: %s", e)
+            self._disabled = True
+
+    def _record(self, path: str, abspath: str):
+        os.makedirs(self._journal_dir, exist_ok=True)
+        backup = None
+        if os.path.isfile(abspath):
+            backup = str(len(self._recorded_paths))
+            backup_abspath = os.path.join(self._journal_dir, backup)
+            if os.path.lexists(backup_abspath):
+                os.remove(backup_abspath)
+            if _has_hard_links(abspath):
+                shutil.copy2(abspath, backup_abspath)  # The file is modified in place
+            else:
+                try:
+                    os.link(abspath, backup_abspath)  # The file is replaced, not modified
+                except OSError:
+                    shutil.copy2(abspath, backup_abspath)
+            if self._fsync:
+                _fsync_path(backup_abspath)
+        lines = []
+        if not self._recorded_paths:
+            lines.append(json.dumps({"checkpoint": self._checkpoint}) + "\n")
+        lines.append(json.dumps({"path": path, "backup": backup}) + "\n")
+        with open(
+            self._journal_path, "w" if not self._recorded_paths else "a", encoding="utf-8"
+        ) as fd:
+            fd.writelines(lines)
+            if self._fsync:
+                fd.flush()
+                os.fsync(fd.fileno())
+        self._recorded_paths.add(path)
+
+    def pending_paths(self, checkpoint: Optional[str]) -> Set[str]:
+        return set(item["path"] for item in self._load_pending(checkpoint))
+
+    def rollback(self, root_dir: str, checkpoint: Optional[str]) -> Set[str]:
+        result = set()
+        for item in reversed(self._load_pending(checkpoint)):
+            abspath = os.path.realpath(os.path.join(root_dir, item["path"]))
+            if item["backup"] is not None:
+                backup_abspath = os.path.join(self._journal_dir, item["backup"])
+                _publish(backup_abspath, abspath, _has_hard_links(abspath))
+            elif os.path.isfile(abspath):
+                os.remove(abspath)
+            result.add(item["path"])
+        self.discard()
+        return result
+
+    def discard(self):
+        shutil.rmtree(self._journal_dir, ignore_errors=True)
+        self._recorded_paths.clear()
+        self._disabled = False
+
+    def _load_pending(self, checkpoint: Optional[str]) -> list:
+        recorded_checkpoint, items = self._load()
+        if checkpoint is not None and recorded_checkpoint not in (None, checkpoint):
+            return []  # Changes were already accepted, f.e. committed
+        return items
+
+    def _load(self) -> Tuple[Optional[str], list]:
+        checkpoint, result = None, []
+        try:
+            with open(self._journal_path, encoding="utf-8") as fd:
+                for line in fd:
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        break  # Interrupted while writing last entry
+                    if "checkpoint" in item:
+                        checkpoint = item["checkpoint"]
+                    else:
+                        result.append(item)
+        except OSError:
+            pass  # No journal, or the journal directory cannot exist
+        return checkpoint, result
+
+
 class FileSystemReaderWriter(IFileSystemReaderWriter):
     """Default filesystem reader/writer.
 
+    Files are written atomically, by writing to a temporary file first and
+    then replacing the target file with it, so interrupted write never leaves
+    a truncated file. If the file already has the content being written, then
+    it is left untouched and is not added to modified paths. Symbolic links
+    are followed, so the file they point to is replaced instead, and files
+    having hard links are overwritten in place to keep those links.
+
     :param root_dir:
         File system root directory.
 
         This will be set to root directory of the managed project, making this
         class a gateway to project files.
+
+    :param journal_dir:
+        Path to a directory to keep journal of modified files in.
+
+        If given, then original content of modified files is kept until
+        :meth:`clear_modified_paths` is called, allowing to restore those
+        files with :meth:`rollback`, even if the process that modified them
+        was interrupted.
+
+    :param fsync:
+        Flush written files to the storage device when :meth:`sync` is called.
     """
 
-    def __init__(self, root_dir: str):
+    def __init__(self, root_dir: str, journal_dir: Optional[str] = None, fsync: bool = False):
         self._root_dir = root_dir
+        self._journal = None if journal_dir is None else _Journal(journal_dir, fsync)
+        self._fsync = fsync
         self._modified_paths = set()
+        self._unsynced_paths = set()
+        self._staged_files = None
 
     def _abspath(self, path: str) -> str:
         path = _normalize_path(path)
@@ -44,26 +229,104 @@ class FileSystemReaderWriter(IFileSystemReaderWriter):
             return self._root_dir
         return self._abspath(path)
 
-    def scan(self, exclude: Set[str] = None) -> Iterator[str]:
-
-        def gen(abspath: str, path: str):
-            for name in os.listdir(abspath):
-                name_abspath = os.path.join(abspath, name)
-                name_path = os.path.join(path, name)
-                if name_path not in exclude:
-                    if os.path.isdir(name_abspath):
-                        yield from gen(name_abspath, name_path)
-                    else:
-                        yield name_path
+    def scan(
+        self,
+        exclude: Set[str] = None,
+        ignore: Iterable[str] = None,
+        use_gitignore: bool = False,
+    ) -> Iterator[str]:
+
+        # Rules are kept in order of precedence: explicitly given patterns
+        # first, then patterns from .gitignore files, the deepest first
+        def load_gitignore(abspath: str, path: str, rules: tuple) -> tuple:
+            if not use_gitignore:
+                return rules
+            try:
+                with open(os.path.join(abspath, ".gitignore"), encoding="utf-8") as fd:
+                    gitignore_rules = _ignore.IgnoreRules(fd, base=path)
+            except (FileNotFoundError, NotADirectoryError, UnicodeDecodeError):
+                return rules
+            if not gitignore_rules:
+                return rules
+            return rules[:num_explicit] + (gitignore_rules,) + rules[num_explicit:]
+
+        def is_ignored(path: str, is_dir: bool, rules: Tuple[_ignore.IgnoreRules, ...]) -> bool:
+            for item in rules:
+                result = item.match(path, is_dir)
+                if result is not None:
+                    return result
+            return False
 
         exclude = set(_normalize_path(x) for x in (exclude or []))
-        yield from gen(self._root_dir, "")
+        ignore_rules = _ignore.IgnoreRules(ignore or [])
+        explicit_rules = (ignore_rules,) if ignore_rules else ()
+        num_explicit = len(explicit_rules)
+        # Directories are scanned depth-first, so at most one directory
+        # iterator per directory level is open at a time
+        root_rules = load_gitignore(self._root_dir, "", explicit_rules)
+        stack = [(os.scandir(self._root_dir), "", root_rules)]
+        try:
+            while stack:
+                entries, path, rules = stack[-1]
+                entry = next(entries, None)
+                if entry is None:
+                    entries.close()
+                    stack.pop()
+                    continue
+                entry_path = os.path.join(path, entry.name)
+                if entry_path in exclude:
+                    continue
+                is_dir = entry.is_dir()
+                if is_dir and use_gitignore and entry.name == ".git":
+                    continue
+                if rules and is_ignored(entry_path, is_dir, rules):
+                    continue
+                if is_dir:
+                    dir_rules = load_gitignore(entry.path, entry_path, rules)
+                    stack.append((os.scandir(entry.path), entry_path, dir_rules))
+                else:
+                    yield entry_path
+        finally:
+            for entries, _, _ in stack:
+                entries.close()
 
     def modified_paths(self) -> Set[str]:
         return set(self._modified_paths)
 
     def clear_modified_paths(self):
         self._modified_paths.clear()
+        if self._journal is not None:
+            self._journal.discard()
+
+    def sync(self):
+        if not self._fsync:
+            self._unsynced_paths.clear()
+            return
+        dirs = set()
+        for path in sorted(self._unsynced_paths):
+            abspath = os.path.realpath(self._abspath(path))
+            _fsync_path(abspath)
+            dirs.add(os.path.dirname(abspath))
+        for abspath in sorted(dirs):
+            _fsync_path(abspath, directory=True)
+        self._unsynced_paths.clear()
+
+    def set_checkpoint(self, checkpoint: str):
+        if self._journal is not None:
+            self._journal.set_checkpoint(checkpoint)
+
+    def pending_paths(self, checkpoint: str = None) -> Set[str]:
+        if self._journal is None:
+            return set()
+        return self._journal.pending_paths(checkpoint)
+
+    def rollback(self, checkpoint: str = None) -> Set[str]:
+        if self._journal is None:
+            return set()
+        restored_paths = self._journal.rollback(self._root_dir, checkpoint)
+        self._modified_paths.difference_update(restored_paths)
+        self._unsynced_paths.difference_update(restored_paths)
+        return restored_paths
 
     def exists(self, path: str) -> bool:
         return os.path.isfile(self._abspath(path))
@@ -75,12 +338,102 @@ class FileSystemReaderWriter(IFileSystemReaderWriter):
         with open(abspath, "rb") as fd:
             return fd.read()
 
+    def stat(self, path: str) -> os.stat_result:
+        if not self.exists(path):
+            raise exc.FileNotFound(path)
+        return os.stat(self._abspath(path))
+
+    @contextlib.contextmanager
+    def open_mapped(self, path: str) -> Iterator[Union[bytes, mmap.mmap]]:
+        if not self.exists(path):
+            raise exc.FileNotFound(path)
+        with open(self._abspath(path), "rb") as fd:
+            if os.fstat(fd.fileno()).st_size == 0:
+                yield b""  # Empty files cannot be mapped
+                return
+            # Files are replaced on write (unless having hard links), so the
+            # mapping remains unaffected
+            with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                yield buf
+
     def write(self, path: str, content: bytes):
         abspath = self._abspath(path)
-        os.makedirs(os.path.dirname(abspath), exist_ok=True)
-        with open(abspath, "wb") as fd:
+        if _file_size(abspath) == len(content):
+            if _file_digest(abspath) == hashlib.sha256(content).digest():
+                self._discard_staged(os.path.realpath(abspath))
+                return
+        with self._open_write(path, abspath, skip_unchanged=False) as fd:
             fd.write(content)
-        self._modified_paths.add(_normalize_path(path))
+
+    def open_write(self, path: str) -> ContextManager[BinaryIO]:
+        return self._open_write(path, self._abspath(path), skip_unchanged=True)
+
+    @contextlib.contextmanager
+    def _open_write(self, path: str, abspath: str, skip_unchanged: bool) -> Iterator[BinaryIO]:
+        # Symbolic links are kept, with the file they point to being replaced
+        abspath = os.path.realpath(abspath)
+        dirname, basename = os.path.split(abspath)
+        os.makedirs(dirname, exist_ok=True)
+        tmp_abspath = os.path.join(dirname, f".{basename}.{uuid.uuid4().hex[:8]}.tmp")
+        # Created with same permissions as new files created by open()
+        tmp_fd = os.open(tmp_abspath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with open(tmp_fd, "wb") as fd:
+                yield fd
+            if skip_unchanged and _file_size(abspath) == _file_size(tmp_abspath):
+                if _file_digest(abspath) == _file_digest(tmp_abspath):
+                    os.remove(tmp_abspath)
+                    self._discard_staged(abspath)
+                    return
+            if os.path.isfile(abspath):
+                os.chmod(tmp_abspath, stat.S_IMODE(os.stat(abspath).st_mode))
+            if self._staged_files is None:
+                self._publish_written(_normalize_path(path), tmp_abspath, abspath)
+                return
+        except BaseException:
+            if os.path.lexists(tmp_abspath):
+                os.remove(tmp_abspath)
+            raise
+        self._discard_staged(abspath)
+        self._staged_files[abspath] = _normalize_path(path), tmp_abspath
+
+    def _discard_staged(self, abspath: str):
+        # Content written to the same file later replaces the staged one
+        if self._staged_files and abspath in self._staged_files:
+            _, tmp_abspath = self._staged_files.pop(abspath)
+            os.remove(tmp_abspath)
+
+    def _publish_written(self, path: str, tmp_abspath: str, abspath: str):
+        # Replacing a file with hard links would detach it from its other
+        # links, so it is overwritten in place instead, at the cost of
+        # atomicity; checked before the journal links its backup
+        in_place = _has_hard_links(abspath)
+        if self._journal is not None:
+            self._journal.record(path, abspath)
+        _publish(tmp_abspath, abspath, in_place)
+        self._modified_paths.add(path)
+        self._unsynced_paths.add(path)
+
+    @contextlib.contextmanager
+    def staged(self) -> Iterator[None]:
+        if self._staged_files is not None:
+            yield
+            return
+        self._staged_files = {}
+        try:
+            yield
+            # Written files are journaled one by one while published, so
+            # these can still be rolled back if publishing fails
+            while self._staged_files:
+                abspath = next(iter(self._staged_files))
+                path, tmp_abspath = self._staged_files[abspath]
+                self._publish_written(path, tmp_abspath, abspath)
+                del self._staged_files[abspath]
+        finally:
+            for _, tmp_abspath in self._staged_files.values():
+                if os.path.lexists(tmp_abspath):
+                    os.remove(tmp_abspath)
+            self._staged_files = None
 
 
 class DryRunFileSystemReaderWriterProxy(IFileSystemWriter):
@@ -113,6 +466,18 @@ class DryRunFileSystemReaderWriterProxy(IFileSystemWriter):
     def clear_modified_paths(self):
         self._modified_paths.clear()
 
+    def sync(self):
+        pass
+
+    def set_checkpoint(self, checkpoint: str):
+        pass
+
+    def pending_paths(self, checkpoint: str = None) -> Set[str]:
+        return self._target.pending_paths(checkpoint)
+
+    def rollback(self, checkpoint: str = None) -> Set[str]:
+        return set()
+
     def write(self, path: str, content: bytes):
         action = Styled("overwrite" if self._target.exists(path) else "create", bold=True)
         path = _normalize_path(path)
@@ -124,6 +489,17 @@ class DryRunFileSystemReaderWriterProxy(IFileSystemWriter):
         else:
             self._write_bytes(path, action, content)
 
+    @contextlib.contextmanager
+    def open_write(self, path: str) -> Iterator[BinaryIO]:
+        # The content is needed as a whole to be printed, so it is buffered
+        buf = io.BytesIO()
+        yield buf
+        self.write(path, buf.getvalue())
+
+    @contextlib.contextmanager
+    def staged(self) -> Iterator[None]:
+        yield
+
     def _write_str(self, path: str, action: str, content: str):
         content = textwrap.indent(content, "  ")
         content = Styled(content, fg="blue")
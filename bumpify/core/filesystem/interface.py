@@ -1,4 +1,6 @@
 import abc
+import mmap
+import os
 import typing
 
 
@@ -20,11 +22,18 @@ class IFileSystemReader(abc.ABC):
         """
 
     @abc.abstractmethod
-    def scan(self, exclude: typing.Set[str] = None) -> typing.Iterator[str]:
+    def scan(
+        self,
+        exclude: typing.Set[str] = None,
+        ignore: typing.Iterable[str] = None,
+        use_gitignore: bool = False,
+    ) -> typing.Iterator[str]:
         """Scan through the filesystem, generating paths to existing files.
 
         Each generate path can later be used with other methods of this API
-        object.
+        object. Paths are generated lazily, while the filesystem is being
+        scanned, and directories that are excluded or ignored are not entered
+        at all.
 
         :param exclude:
             Paths to be excluded.
@@ -33,6 +42,19 @@ class IFileSystemReader(abc.ABC):
             ``/foo/bar.txt`` or ``/foo``). The only thing that needs to be
             remembered is that each path is treated as relative to file system
             root.
+
+        :param ignore:
+            Patterns of paths to be ignored.
+
+            These have same format as lines of ``.gitignore`` file (f.e.
+            ``node_modules/``, ``*.pyc`` or ``/build``) and are relative to
+            file system root. Take precedence over patterns read from
+            ``.gitignore`` files.
+
+        :param use_gitignore:
+            If ``True``, then also ignore paths matching patterns from
+            ``.gitignore`` files found while scanning, and skip ``.git``
+            directories.
         """
 
     @abc.abstractmethod
@@ -63,6 +85,34 @@ class IFileSystemReader(abc.ABC):
             Path to a file.
         """
 
+    @abc.abstractmethod
+    def stat(self, path: str) -> os.stat_result:
+        """Return status of a file at given *path*, f.e. its size and
+        modification time.
+
+        If *path* does not point to an existing file then :exc:`FileNotFound`
+        exception is raised.
+
+        :param path:
+            Path to a file.
+        """
+
+    @abc.abstractmethod
+    def open_mapped(self, path: str) -> typing.ContextManager[typing.Union[bytes, mmap.mmap]]:
+        """Map file at given *path* into memory for reading, returning context
+        manager that gives the mapped content.
+
+        Unlike :meth:`read`, this does not load the file into memory as a
+        whole, so only those parts that are actually accessed are read. The
+        content is available until the context manager exits.
+
+        If *path* does not point to an existing file then :exc:`FileNotFound`
+        exception is raised.
+
+        :param path:
+            Path to a file.
+        """
+
 
 class IFileSystemWriter(abc.ABC):
     """A write-only interface to access project files."""
@@ -70,14 +120,76 @@ class IFileSystemWriter(abc.ABC):
     @abc.abstractmethod
     def clear_modified_paths(self):
         """Clears set of modified paths returned by
-        :meth:`IFileSystemReader.modified_paths` method."""
+        :meth:`IFileSystemReader.modified_paths` method.
+
+        This also accepts all the changes made, so those can no longer be
+        reverted by :meth:`rollback`.
+        """
+
+    @abc.abstractmethod
+    def sync(self):
+        """Flush files written since the last call to this method to the
+        storage device, if enabled.
+
+        Allows to make writes durable in a single batch, instead of syncing
+        after each write.
+        """
+
+    @abc.abstractmethod
+    def set_checkpoint(self, checkpoint: str):
+        """Set checkpoint the changes made from now on are based on.
+
+        The checkpoint is stored along with original content of modified
+        files, so that other process can tell if those changes were already
+        accepted by other means before :meth:`clear_modified_paths` was
+        called (f.e. committed to a VCS repository).
+
+        :param checkpoint:
+            The checkpoint, f.e. the revision of current VCS ``HEAD``.
+        """
+
+    @abc.abstractmethod
+    def pending_paths(self, checkpoint: str = None) -> typing.Set[str]:
+        """Return set of paths modified by other process that was interrupted
+        before its changes were accepted.
+
+        These are the paths :meth:`rollback` would restore. Nothing is
+        modified by this method.
+
+        :param checkpoint:
+            Current checkpoint.
+
+            If given, then changes made at different checkpoint (see
+            :meth:`set_checkpoint`) are considered accepted and are not
+            returned.
+        """
+
+    @abc.abstractmethod
+    def rollback(self, checkpoint: str = None) -> typing.Set[str]:
+        """Restore original content of files modified since the last call to
+        :meth:`clear_modified_paths`, removing files that were created.
+
+        This can also be used to revert changes made by other process that
+        was interrupted before its changes were accepted. Return set of
+        restored paths, which is empty if there was nothing to restore or if
+        this is not supported.
+
+        :param checkpoint:
+            Current checkpoint.
+
+            If given, then changes made at different checkpoint (see
+            :meth:`set_checkpoint`) are considered accepted and are only
+            discarded, without restoring any files.
+        """
 
     @abc.abstractmethod
     def write(self, path: str, content: bytes):
         """Create or overwrite file at given *path*.
 
         When this method gets called and file is saved successfully, then
-        *path* is added to the set of modified paths.
+        *path* is added to the set of modified paths. Implementations may skip
+        writing if the file already has given *content*; the *path* is then not
+        added to the set of modified paths.
 
         :param path:
             Path to a file.
@@ -86,6 +198,35 @@ class IFileSystemWriter(abc.ABC):
             Data to be written to a file.
         """
 
+    @abc.abstractmethod
+    def open_write(self, path: str) -> typing.ContextManager[typing.BinaryIO]:
+        """Create or overwrite file at given *path*, returning context manager
+        that gives binary file object to write content to.
+
+        Unlike :meth:`write`, this allows to write file content piece by
+        piece, without keeping entire content in memory. Once the context
+        manager exits without an error, *path* is added to the set of modified
+        paths, unless the file is left untouched as its content did not change.
+
+        :param path:
+            Path to a file.
+        """
+
+    @abc.abstractmethod
+    def staged(self) -> typing.ContextManager[None]:
+        """Return context manager deferring files written with :meth:`write`
+        and :meth:`open_write` from being published until it exits.
+
+        Written content is kept aside and all files are published once the
+        context manager exits without an error; if an error occurs, then
+        written content is discarded, leaving all files untouched. Until
+        published, files still have their original content and are not added
+        to the set of modified paths.
+
+        Calls can be nested; files are then published by the outermost
+        context manager.
+        """
+
 
 class IFileSystemReaderWriter(IFileSystemReader, IFileSystemWriter):
     """A read-write interface to access project files."""
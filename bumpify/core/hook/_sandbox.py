@@ -0,0 +1,192 @@
+"""Hook worker process and the protocol used to communicate with it.
+
+Each message is a tuple, pickled and prefixed with its length encoded as 4
+byte big endian unsigned integer. Models are pickled as tuples of field
+values instead of dicts, as those are sent for each commit parsed.
+
+The worker is started with a ``load`` message, carrying compiled code of a
+hook file, resource limits to apply and module search path of the parent
+process, and replies with names of hooks found. Then it executes ``call`` and ``call_many`` requests, one at a time,
+until its input is closed. Each reply is either ``("ok", result)`` or
+``("error", traceback, exception)``; replies to ``call_many`` additionally
+end with list of durations of calls made.
+"""
+
+import io
+import marshal
+import os
+import pickle
+import select
+import struct
+import sys
+import time
+import traceback
+import types
+from typing import Any, Optional, Tuple
+
+from bumpify.model import Model
+
+from . import _utils
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+_HEADER = struct.Struct(">I")
+
+
+class _Pickler(pickle.Pickler):
+
+    def reducer_override(self, obj):
+        if isinstance(obj, Model):
+            _, (cls, state) = obj.__reduce__()
+            return _restore_model_from_values, (cls, tuple(state.values()))
+        return NotImplemented
+
+
+def _restore_model_from_values(cls: type, values: tuple) -> Model:
+    return cls.construct(**dict(zip(cls.__model_fields__, values)))
+
+
+def dump_message(message: tuple) -> bytes:
+    """Serialize message to a frame that can be sent with
+    :func:`write_frame`."""
+    buf = io.BytesIO()
+    buf.write(_HEADER.pack(0))
+    _Pickler(buf, pickle.HIGHEST_PROTOCOL).dump(message)
+    frame = buf.getbuffer()
+    frame[: _HEADER.size] = _HEADER.pack(len(frame) - _HEADER.size)
+    return frame.tobytes()
+
+
+def load_message(payload: bytes) -> tuple:
+    """Deserialize message from a payload returned by :func:`read_frame`."""
+    return pickle.loads(payload)
+
+
+def write_frame(fd: int, frame: bytes):
+    """Write entire frame to a file descriptor."""
+    view = memoryview(frame)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def read_frame(fd: int, deadline: float = None) -> bytes:
+    """Read payload of the next frame from a file descriptor.
+
+    Raises :exc:`EOFError` if the file descriptor was closed, or
+    :exc:`TimeoutError` if the frame was not read until *deadline*.
+
+    :param fd:
+        The file descriptor to read from.
+
+    :param deadline:
+        Optional deadline, as returned by :func:`time.monotonic`.
+    """
+    (size,) = _HEADER.unpack(_read_exactly(fd, _HEADER.size, deadline))
+    return _read_exactly(fd, size, deadline)
+
+
+def _read_exactly(fd: int, size: int, deadline: Optional[float]) -> bytes:
+    chunks = []
+    while size > 0:
+        if deadline is not None:
+            ready, _, _ = select.select([fd], [], [], max(0, deadline - time.monotonic()))
+            if not ready:
+                raise TimeoutError()
+        chunk = os.read(fd, size)
+        if not chunk:
+            raise EOFError()
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def main():
+    """Entry point of the worker process.
+
+    Messages are received from STDIN and replies are sent to STDOUT; hooks
+    writing to STDOUT will write to STDERR instead.
+    """
+    channel_in, channel_out = os.dup(0), os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+    _, module_name, abspath, code, limits, path = load_message(read_frame(channel_in))
+    sys.path[:] = path
+    _apply_limits(*limits)
+    try:
+        module = _exec_module(module_name, abspath, marshal.loads(code))
+    except BaseException:
+        _write_error(channel_out, sys.exc_info())
+        return
+    hooks = {}
+    for v in module.__dict__.values():
+        hook_name = _utils.get_hook_name(v)
+        if hook_name is not None:
+            hooks[hook_name] = v
+    write_frame(channel_out, dump_message(("ok", set(hooks))))
+    while True:
+        try:
+            request = load_message(read_frame(channel_in))
+        except EOFError:
+            return
+        kind, name, *params = request
+        if kind == "call":
+            args, kwargs = params
+            try:
+                frame = dump_message(("ok", hooks[name](*args, **kwargs)))
+            except Exception:
+                _write_error(channel_out, sys.exc_info())
+            else:
+                write_frame(channel_out, frame)
+            continue
+        (args_list,) = params
+        result, durations = [], []
+        try:
+            for args in args_list:
+                start = time.perf_counter()
+                try:
+                    result.append(hooks[name](*args))
+                finally:
+                    durations.append(time.perf_counter() - start)
+            frame = dump_message(("ok", result, durations))
+        except Exception:
+            _write_error(channel_out, sys.exc_info(), durations)
+        else:
+            write_frame(channel_out, frame)
+
+
+def _apply_limits(memory_limit: Optional[int], cpu_time_limit: Optional[int]):
+    if resource is None:
+        return
+    if memory_limit is not None:
+        limit = memory_limit * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_time_limit is not None:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_time_limit, cpu_time_limit))
+
+
+def _exec_module(name: str, abspath: str, code: types.CodeType) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__file__ = abspath
+    sys.modules[name] = module
+    try:
+        exec(code, module.__dict__)
+    finally:
+        sys.modules.pop(name, None)
+    return module
+
+
+def _write_error(fd: int, exc_info: Tuple[type, BaseException, Any], *extra: Any):
+    # Traceback starts at the hook file; exception is sent only if it can be
+    # pickled, as it may be an instance of a class defined in the hook file
+    exc_type, exc, tb = exc_info
+    formatted_tb = "".join(traceback.format_exception(exc_type, exc, tb.tb_next))
+    try:
+        frame = dump_message(("error", formatted_tb, exc, *extra))
+    except Exception:
+        frame = dump_message(("error", formatted_tb, None, *extra))
+    write_frame(fd, frame)
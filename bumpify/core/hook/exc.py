@@ -21,3 +21,28 @@ class HookExecFailed(HookError):
         super().__init__(original_exc)
         self.abspath = abspath
         self.traceback = traceback
+
+
+class HookCallFailed(HookError):
+    """Raised when a hook executed by a worker process failed, or when the
+    worker process itself failed."""
+
+    __message_template__ = "{self.name!r} in file: {self.abspath}\n{self.reason}"
+
+    #: Absolute path to the hook file.
+    abspath: str
+
+    #: Name of the hook.
+    name: str
+
+    #: The reason of the failure.
+    #:
+    #: This is either a traceback (originating at hook file), or description
+    #: of a worker process failure.
+    reason: str
+
+    def __init__(self, abspath: str, name: str, reason: str, original_exc: Exception = None):
+        super().__init__(original_exc)
+        self.abspath = abspath
+        self.name = name
+        self.reason = reason
@@ -0,0 +1,39 @@
+from typing import List
+
+from bumpify.core.console.interface import IConsoleOutput
+from bumpify.core.console.objects import Severity, Styled
+
+from .objects import HookStats
+
+
+def print_hook_stats(cout: IConsoleOutput, stats: List[HookStats]):
+    """Emit hook execution statistics to the console.
+
+    :param cout:
+        Console output object.
+
+    :param stats:
+        List of hook execution statistics.
+    """
+    if not stats:
+        cout.emit(Severity.INFO, "No hooks were used")
+        return
+    for item in stats:
+        cout.emit(
+            Severity.WARNING if item.errors else Severity.INFO,
+            "Hook",
+            Styled(item.name, bold=True),
+            f"called {item.calls} time(-s), failed {item.errors} time(-s):",
+            "total",
+            Styled(_format_time(item.total_time), bold=True),
+            "p50",
+            Styled(_format_time(item.p50_time), bold=True),
+            "p99",
+            Styled(_format_time(item.p99_time), bold=True),
+        )
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f}s"
+    return f"{seconds * 1000:.3f}ms"
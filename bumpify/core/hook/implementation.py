@@ -1,31 +1,118 @@
+import hashlib
+import importlib.util
+import logging
+import marshal
+import math
+import os
+import struct
+import subprocess
 import sys
+import threading
+import time
 import traceback
-from typing import Any, Callable, Dict, Set
+import types
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+import bumpify
 from bumpify.core.config.objects import LoadedConfig
-from bumpify.core.filesystem.interface import IFileSystemReader
+from bumpify.core.filesystem.exc import FileNotFound
+from bumpify.core.filesystem.interface import IFileSystemReader, IFileSystemReaderWriter
 from bumpify.core.hook.interface import IHookApi, IHookFunction
-from bumpify.core.hook.objects import HookConfig
+from bumpify.core.hook.objects import HookConfig, HookStats
 
-from . import _utils
-from .exc import HookExecFailed
+from . import _sandbox, _utils
+from .exc import HookCallFailed, HookExecFailed
 from .interface import IHookApiLoader
 
+logger = logging.getLogger(__name__)
+
+# Time to wait for a worker process to exit after its input was closed
+_WORKER_CLOSE_TIMEOUT = 5
+
+# Function receiving duration of a single hook call, and a flag telling if the
+# call has failed
+_RecordFunc = Callable[[float, bool], None]
+
+# Worker is started with "-c" rather than "-m", as otherwise objects defined
+# in the worker module would be pickled as objects of "__main__" module; the
+# directory Bumpify was imported from is appended to the module search path,
+# so that it cannot shadow standard library modules, until the worker gets
+# the search path of this process with the load message
+_BUMPIFY_PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(bumpify.__file__)))
+_WORKER_ARGS = [
+    sys.executable,
+    "-c",
+    f"import sys; sys.path.append({_BUMPIFY_PARENT_DIR!r}); "
+    f"from {_sandbox.__name__} import main; main()",
+]
+
 
 class _HookFunction(IHookFunction):
 
-    def __init__(self, func: Callable):
+    def __init__(self, func: Callable, module: types.ModuleType = None, attr: str = None):
         self._func = func
+        self._module = module
+        self._attr = attr
+
+    def __reduce__(self):
+        if self._module is None:
+            return _HookFunction, (self._func,)
+        # Hook module is not loaded in processes that were not forked after
+        # it was loaded, so the function is pickled as a hook file reference
+        return _restore_hook_function, (self._module.__name__, self._module.__file__, self._attr)
 
     def invoke(self, *args, **kwargs) -> Any:
         return self._func(*args, **kwargs)
 
+    def invoke_many(self, args_list: List[tuple]) -> list:
+        return [self._func(*args) for args in args_list]
+
+    def invoke_many_timed(self, args_list: List[tuple], record: _RecordFunc) -> list:
+        result = []
+        for args in args_list:
+            failed = True
+            start = time.perf_counter()
+            try:
+                result.append(self._func(*args))
+                failed = False
+            finally:
+                record(time.perf_counter() - start, failed)
+        return result
+
+
+def _restore_hook_function(module_name: str, abspath: str, attr: str) -> _HookFunction:
+    module = sys.modules.get(module_name)
+    if module is None:
+        with open(abspath, "rb") as fd:
+            code = compile(fd.read(), abspath, "exec", dont_inherit=True)
+        module = _make_hook_module(module_name, abspath)
+        sys.modules[module_name] = module
+        try:
+            exec(code, module.__dict__)
+        except BaseException:
+            sys.modules.pop(module_name, None)
+            raise
+    return _HookFunction(getattr(module, attr), module, attr)
+
+
+def _make_hook_module_name(abspath: str) -> str:
+    return f"_bumpify_hook_{hashlib.sha1(abspath.encode()).hexdigest()}"
+
+
+def _make_hook_module(name: str, abspath: str) -> types.ModuleType:
+    spec = importlib.util.spec_from_loader(name, loader=None, origin=abspath)
+    module = importlib.util.module_from_spec(spec)
+    module.__file__ = abspath
+    return module
+
 
 class HookApiLoader(IHookApiLoader):
     """Default implementation of the :class:`IHookApiLoader` interface.
 
-    It loads and executes Python scripts configured as Bumpify hooks to find
-    and register hook functions.
+    It loads configured Python scripts as Bumpify hook modules to find and
+    register hook functions. Hook modules are loaded only when a hook is
+    requested for the first time, and each module is executed in its own
+    namespace.
 
     :param loaded_config:
         Config object.
@@ -36,48 +123,381 @@ class HookApiLoader(IHookApiLoader):
         Filesystem reader instance.
 
         Used to read payload of a hook file.
+
+    :param cache_filesystem_reader_writer:
+        Optional filesystem to store compiled hook modules in.
+
+        When given, hook files are compiled only if modified since the last
+        run. Compiled code is validated with hook file's modification time
+        and size, like Python does for ``.pyc`` files in ``__pycache__``
+        directories.
+
+    If :attr:`HookConfig.sandbox` is set, then each hook file is executed by
+    a separate worker process instead, started when hooks are requested for
+    the first time and running until :meth:`IHookApi.close` is called.
     """
 
-    def __init__(self, loaded_config: LoadedConfig, filesystem_reader: IFileSystemReader):
+    def __init__(
+        self,
+        loaded_config: LoadedConfig,
+        filesystem_reader: IFileSystemReader,
+        cache_filesystem_reader_writer: IFileSystemReaderWriter = None,
+    ):
         self._loaded_config = loaded_config
         self._filesystem_reader = filesystem_reader
+        self._cache_filesystem_reader_writer = cache_filesystem_reader_writer
 
     def load(self) -> IHookApi:
         hook_config = self._loaded_config.config.load_section(HookConfig)
+        workers = []
         if not hook_config:
-            return self._HookApi({})
+            return self._HookApi(dict, workers)
+        if hook_config.sandbox is not None:
+            return self._HookApi(
+                lambda: self._start_hook_workers(hook_config.paths, hook_config.sandbox, workers),
+                workers,
+            )
+        return self._HookApi(lambda: self._load_hook_functions(hook_config.paths), workers)
+
+    def _load_hook_functions(self, paths: List[str]) -> Dict[str, IHookFunction]:
         all_hook_functions = {}
-        for path in hook_config.paths:
-            hook_payload = self._filesystem_reader.read(path)
-            try:
-                g = globals()
-                exec(hook_payload, g)
-                for k in list(g):
-                    v = g[k]
-                    hook_name = _utils.get_hook_name(v)
-                    if hook_name is not None:
-                        all_hook_functions[hook_name] = v
-                        del g[k]
-            except:
-                exc_type, exc, tb = sys.exc_info()
-                formatted_exc = traceback.format_exception(exc_type, exc, tb.tb_next)
-                tb = "".join(formatted_exc)
-                raise HookExecFailed(self._filesystem_reader.abspath(path), tb, exc)
-        return self._HookApi(all_hook_functions)
+        for path in paths:
+            module = self._load_hook_module(path)
+            for k, v in module.__dict__.items():
+                hook_name = _utils.get_hook_name(v)
+                if hook_name is not None:
+                    all_hook_functions[hook_name] = _HookFunction(v, module, k)
+        return all_hook_functions
+
+    def _start_hook_workers(
+        self, paths: List[str], sandbox: HookConfig.Sandbox, workers: List["_HookWorker"]
+    ) -> Dict[str, IHookFunction]:
+        all_hook_functions = {}
+        for index, path in enumerate(paths):
+            abspath, code = self._compile_hook_file(path)
+            worker = _HookWorker(abspath, sandbox)
+            workers.append(worker)
+            for hook_name in worker.start(f"_bumpify_hook_{index}", code):
+                all_hook_functions[hook_name] = _SandboxedHookFunction(worker, hook_name)
+        return all_hook_functions
+
+    def _compile_hook_file(self, path: str) -> Tuple[str, types.CodeType]:
+        abspath = self._filesystem_reader.abspath(path)
+        cache_key = self._make_cache_key(path, abspath)
+        code = self._load_compiled_code(cache_key)
+        if code is not None:
+            return abspath, code
+        source = self._filesystem_reader.read(path)
+        try:
+            code = compile(source, abspath, "exec", dont_inherit=True)
+        except (SyntaxError, ValueError) as e:
+            tb = "".join(traceback.format_exception_only(type(e), e))
+            raise HookExecFailed(abspath, tb, e)
+        self._save_compiled_code(cache_key, code)
+        return abspath, code
+
+    def _load_hook_module(self, path: str) -> types.ModuleType:
+        abspath, code = self._compile_hook_file(path)
+        name = _make_hook_module_name(abspath)
+        module = _make_hook_module(name, abspath)
+        # NOTE: Module stays registered under a name made of its path, so that
+        # hook functions and objects of classes it defines can be pickled and
+        # sent to worker processes parsing commits in parallel
+        sys.modules[name] = module
+        try:
+            exec(code, module.__dict__)
+        except:
+            sys.modules.pop(name, None)
+            exc_type, exc, tb = sys.exc_info()
+            formatted_exc = traceback.format_exception(exc_type, exc, tb.tb_next)
+            tb = "".join(formatted_exc)
+            raise HookExecFailed(abspath, tb, exc)
+        return module
+
+    def _make_cache_key(self, path: str, abspath: str) -> Optional[Tuple[str, bytes]]:
+        # Returns path to a cache file and the header of a valid cache file
+        if self._cache_filesystem_reader_writer is None:
+            return None
+        stat = self._filesystem_reader.stat(path)
+        header = importlib.util.MAGIC_NUMBER + struct.pack("<qq", stat.st_mtime_ns, stat.st_size)
+        return hashlib.sha1(abspath.encode()).hexdigest() + ".pyc", header
+
+    def _load_compiled_code(
+        self, cache_key: Optional[Tuple[str, bytes]]
+    ) -> Optional[types.CodeType]:
+        if cache_key is None:
+            return None
+        cache_path, header = cache_key
+        try:
+            data = self._cache_filesystem_reader_writer.read(cache_path)
+        except FileNotFound:
+            return None
+        if not data.startswith(header):
+            return None
+        try:
+            return marshal.loads(data[len(header) :])
+        except (EOFError, ValueError, TypeError):
+            return None  # Corrupted; must be compiled again
+
+    def _save_compiled_code(self, cache_key: Optional[Tuple[str, bytes]], code: types.CodeType):
+        if cache_key is None:
+            return
+        cache_path, header = cache_key
+        try:
+            self._cache_filesystem_reader_writer.write(cache_path, header + marshal.dumps(code))
+        except OSError as e:
+            logger.warning("Could not write compiled hook file: %s", e)
 
     class _HookApi(IHookApi):
 
-        def __init__(self, all_hook_functions: dict):
-            self._all_hook_functions = all_hook_functions
+        def __init__(
+            self,
+            load_func: Callable[[], Dict[str, IHookFunction]],
+            workers: List["_HookWorker"],
+        ):
+            self._load_func = load_func
+            self._workers = workers
+            self._all_hook_functions = None
+            self._lock = threading.Lock()
+
+        def _get_all_hook_functions(self) -> Dict[str, IHookFunction]:
+            if self._all_hook_functions is None:
+                with self._lock:
+                    if self._all_hook_functions is None:
+                        self._all_hook_functions = self._load_func()
+            return self._all_hook_functions
 
         def loaded_hook_names(self) -> Set[str]:
-            return set(self._all_hook_functions)
+            return set(self._get_all_hook_functions())
 
         def get_hook(self, name: str, default_func: Callable) -> IHookFunction:
-            maybe_hook = self._all_hook_functions.get(name)
+            maybe_hook = self._get_all_hook_functions().get(name)
             if maybe_hook is None:
                 return _HookFunction(default_func)
-            return _HookFunction(maybe_hook)
+            return maybe_hook
+
+        def close(self):
+            with self._lock:
+                for worker in self._workers:
+                    worker.close()
+                self._workers.clear()
+
+
+class _HookWorker:
+
+    def __init__(self, abspath: str, sandbox: HookConfig.Sandbox):
+        self._abspath = abspath
+        self._sandbox = sandbox
+        self._process = None
+        self._failure = None
+        self._lock = threading.Lock()
+
+    def start(self, module_name: str, code: types.CodeType) -> Set[str]:
+        self._process = subprocess.Popen(
+            _WORKER_ARGS, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        limits = self._sandbox.memory_limit, self._sandbox.cpu_time_limit
+        status, *reply = self._communicate(
+            ("load", module_name, self._abspath, marshal.dumps(code), limits, sys.path), 1
+        )
+        if status != "ok":
+            raise HookExecFailed(self._abspath, *reply)
+        return reply[0]
+
+    def call(self, name: str, args: tuple, kwargs: dict) -> Any:
+        return self._handle_reply(name, self._communicate(("call", name, args, kwargs), 1))
+
+    def call_many(self, name: str, args_list: List[tuple], record: _RecordFunc = None) -> list:
+        # Worker replies with duration of each call made, including the one
+        # that failed (if any)
+        if not args_list:
+            return []
+        start = time.perf_counter()
+        status, *payload = self._communicate(("call_many", name, args_list), len(args_list))
+        if status == "ok":
+            result, durations = payload
+        else:
+            reason, original_exc, *durations = payload
+            durations = durations[0] if durations else [time.perf_counter() - start]
+        if record is not None:
+            for index, duration in enumerate(durations, 1):
+                record(duration, status != "ok" and index == len(durations))
+        if status != "ok":
+            raise HookCallFailed(self._abspath, name, reason, original_exc)
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._process is None:
+                return
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=_WORKER_CLOSE_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+            self._failure = self._failure or "worker process was stopped"
+
+    def _handle_reply(self, name: str, reply: tuple) -> Any:
+        status, *payload = reply
+        if status != "ok":
+            raise HookCallFailed(self._abspath, name, *payload)
+        return payload[0]
+
+    def _communicate(self, message: tuple, num_calls: int) -> tuple:
+        # Returns worker's reply, or an error reply if the message could not
+        # be exchanged; the worker is killed if it did not reply in time or
+        # the reply could not be read
+        try:
+            frame = _sandbox.dump_message(message)
+        except Exception as e:
+            return "error", f"arguments cannot be sent to worker process: {e!r}", e
+        with self._lock:
+            if self._failure is not None:
+                return "error", self._failure, None
+            timeout = self._sandbox.timeout
+            deadline = None if timeout is None else time.monotonic() + timeout * num_calls
+            try:
+                _sandbox.write_frame(self._process.stdin.fileno(), frame)
+                payload = _sandbox.read_frame(self._process.stdout.fileno(), deadline)
+            except TimeoutError:
+                self._failure = f"worker process timed out after {timeout * num_calls:g} second(-s)"
+                self._process.kill()
+            except (EOFError, OSError):
+                self._process.kill()
+                self._failure = self._describe_exit_status(self._process.wait())
+            else:
+                try:
+                    return _sandbox.load_message(payload)
+                except Exception as e:
+                    return "error", f"result cannot be received from worker process: {e!r}", e
+            self._process.wait()
+            return "error", self._failure, None
+
+    @staticmethod
+    def _describe_exit_status(returncode: int) -> str:
+        if returncode < 0:
+            return f"worker process was killed by signal {-returncode}"
+        return f"worker process exited with code {returncode}"
+
+
+class _SandboxedHookFunction(IHookFunction):
+
+    def __init__(self, worker: _HookWorker, name: str):
+        self._worker = worker
+        self._name = name
+
+    def invoke(self, *args, **kwargs) -> Any:
+        return self._worker.call(self._name, args, kwargs)
+
+    def invoke_many(self, args_list: List[tuple]) -> list:
+        return self._worker.call_many(self._name, list(args_list))
+
+    def invoke_many_timed(self, args_list: List[tuple], record: _RecordFunc) -> list:
+        return self._worker.call_many(self._name, list(args_list), record)
+
+    def __reduce__(self):
+        raise TypeError("hooks executed by worker processes cannot be pickled")
+
+
+class ProfilingHookApiProxy(IHookApi):
+    """Proxy for the :class:`IHookApi` interface measuring execution time of
+    hook functions.
+
+    Only hooks loaded from hook files are measured; default functions used
+    when a hook was not found are invoked directly.
+
+    :param target:
+        The hook API to be profiled.
+    """
+
+    def __init__(self, target: IHookApi):
+        self._target = target
+        self._timings: Dict[str, _HookTimings] = {}
+        self._lock = threading.Lock()
+
+    def loaded_hook_names(self) -> Set[str]:
+        return self._target.loaded_hook_names()
+
+    def close(self):
+        self._target.close()
+
+    def get_hook(self, name: str, default_func: Callable) -> IHookFunction:
+        hook = self._target.get_hook(name, default_func)
+        if name not in self._target.loaded_hook_names():
+            return hook
+        with self._lock:
+            timings = self._timings.setdefault(name, _HookTimings())
+        return _ProfilingHookFunction(hook, timings)
+
+    def list_stats(self) -> List[HookStats]:
+        """Return execution statistics of hooks requested so far, sorted by
+        total execution time, in descending order."""
+        with self._lock:
+            result = [timings.make_stats(name) for name, timings in self._timings.items()]
+        result.sort(key=lambda x: x.total_time, reverse=True)
+        return result
+
+
+class _HookTimings:
+
+    def __init__(self):
+        self._durations = []
+        self._errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, duration: float, failed: bool):
+        with self._lock:
+            self._durations.append(duration)
+            self._errors += failed
+
+    def make_stats(self, name: str) -> HookStats:
+        with self._lock:
+            durations = sorted(self._durations)
+            errors = self._errors
+        return HookStats(
+            name=name,
+            calls=len(durations),
+            errors=errors,
+            total_time=math.fsum(durations),
+            p50_time=self._percentile(durations, 0.5),
+            p99_time=self._percentile(durations, 0.99),
+        )
+
+    @staticmethod
+    def _percentile(sorted_durations: List[float], p: float) -> float:
+        # Nearest-rank method
+        if not sorted_durations:
+            return 0.0
+        return sorted_durations[max(0, math.ceil(p * len(sorted_durations)) - 1)]
+
+
+class _ProfilingHookFunction(IHookFunction):
+
+    def __init__(self, target: IHookFunction, timings: _HookTimings):
+        self._target = target
+        self._timings = timings
+
+    def invoke(self, *args, **kwargs) -> Any:
+        failed = True
+        start = time.perf_counter()
+        try:
+            result = self._target.invoke(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self._timings.add(time.perf_counter() - start, failed)
+
+    def invoke_many(self, args_list: List[tuple]) -> list:
+        # Each call of a batch is timed separately, so that slow calls are
+        # not hidden by fast ones; hook functions that cannot time calls
+        # themselves are invoked one by one
+        invoke_many_timed = getattr(self._target, "invoke_many_timed", None)
+        if invoke_many_timed is not None:
+            return invoke_many_timed(args_list, self._timings.add)
+        return [self.invoke(*args) for args in args_list]
 
 
 class AlwaysDefaultHookApiLoader(IHookApiLoader):
@@ -94,3 +514,6 @@ class AlwaysDefaultHookApiLoader(IHookApiLoader):
 
         def get_hook(self, name: str, default_func: Callable) -> IHookFunction:
             return _HookFunction(default_func)
+
+        def close(self):
+            pass
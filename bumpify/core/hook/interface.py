@@ -1,5 +1,5 @@
 import abc
-from typing import Any, Callable, Set
+from typing import Any, Callable, List, Set
 
 
 class IHookFunction(abc.ABC):
@@ -14,9 +14,27 @@ class IHookFunction(abc.ABC):
         type hinting.
         """
 
+    @abc.abstractmethod
+    def invoke_many(self, args_list: List[tuple]) -> list:
+        """Invoke hook function once for each tuple of positional arguments
+        given and return list of results, in same order.
+
+        This should be preferred over calling :meth:`invoke` in a loop, as
+        hooks executed in worker processes will receive all arguments at
+        once.
+
+        :param args_list:
+            List of tuples with positional arguments.
+        """
+
 
 class IHookApi(abc.ABC):
-    """The API for interacting with loaded hooks."""
+    """The API for interacting with loaded hooks.
+
+    Hook files may be loaded lazily, when a hook is requested for the first
+    time, so methods of this interface may raise same exceptions as
+    :meth:`IHookApiLoader.load`.
+    """
 
     @abc.abstractmethod
     def loaded_hook_names(self) -> Set[str]:
@@ -40,6 +58,14 @@ class IHookApi(abc.ABC):
             :meth:`IHookFunction.invoke` method.
         """
 
+    @abc.abstractmethod
+    def close(self):
+        """Release resources used by loaded hooks, f.e. stop hook worker
+        processes.
+
+        Hooks cannot be used once this is called.
+        """
+
 
 class IHookApiLoader(abc.ABC):
     """An interface for loading Bumpify hooks."""
@@ -51,7 +77,9 @@ class IHookApiLoader(abc.ABC):
         This method will return :class:`IHookApi` object even if no hooks were
         configured, so there is no need to check that later.
 
-        This method may raise one of following exceptions:
+        Hook files may not be loaded until a hook is requested for the first
+        time using returned :class:`IHookApi` object. Loading hook files may
+        raise one of following exceptions:
 
         * :exc:`FileNotFound` if configured hook file could not be found
         * :exc:`HookError` (or one of its subclasses) if configured hook file
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from bumpify.model import Model
 from bumpify.core.config.objects import register_section
@@ -8,9 +8,58 @@ from bumpify.core.config.objects import register_section
 class HookConfig(Model):
     """Configuration object for hook module."""
 
+    class Sandbox(Model):
+        """Settings of hook worker processes."""
+
+        #: Maximal size of worker process' address space, in megabytes.
+        memory_limit: Optional[int] = None
+
+        #: Maximal CPU time a worker process can use, in seconds.
+        #:
+        #: A worker process exceeding this limit is killed.
+        cpu_time_limit: Optional[int] = None
+
+        #: Maximal time to wait for a single hook call to complete, in
+        #: seconds.
+        #:
+        #: A worker process that did not complete a call in time is killed.
+        timeout: Optional[float] = None
+
     #: List of hook file(-s) relative paths.
     #:
     #: Each element must point to an existing and valid Python module. Once
     #: configured, those modules will be loaded by Bumpify when a hook is
     #: going to be used for the first time.
     paths: List[str]
+
+    #: Run hooks in separate worker processes.
+    #:
+    #: If set, then each hook file is loaded by a long-lived worker process
+    #: that executes all calls to hooks defined in that file, so that hooks
+    #: cannot affect Bumpify itself. Arguments and results of hooks are
+    #: sent between processes using :mod:`pickle`, so hooks exchanging
+    #: objects of classes defined in hook files cannot be used. Resource
+    #: limits are supported only on POSIX systems.
+    sandbox: Optional[Sandbox] = None
+
+
+class HookStats(Model):
+    """Execution statistics of a single hook function."""
+
+    #: Name of the hook.
+    name: str
+
+    #: Number of hook invocations.
+    calls: int
+
+    #: Number of hook invocations that ended with an exception.
+    errors: int
+
+    #: Total time spent in the hook, in seconds.
+    total_time: float
+
+    #: Median of hook invocation time, in seconds.
+    p50_time: float
+
+    #: 99th percentile of hook invocation time, in seconds.
+    p99_time: float
@@ -1,49 +1,191 @@
-import io
+import codecs
+import itertools
 import json
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from bumpify.model import dump_valid
 
+from . import _msgpack
+from .interface import IChangelogFormatter
 from .objects import Changelog, ChangelogEntry
 
+_JSON_ENTRIES_START = '{\n  "entries": ['
+_JSON_ENTRIES_END = "\n  ]\n}"
 
-def format_as_json(changelog: Changelog) -> str:
-    """Formats changelog to JSON string."""
-    data = dump_valid(changelog, exclude_none=True)
-    return json.dumps(data, indent=2)
 
+class MarkdownChangelogFormatter(IChangelogFormatter):
+    """Formats changelog to Markdown, with newest release on top."""
 
-def format_as_markdown(changelog: Changelog) -> str:
-    """Formats changelog to Markdown string."""
+    def format(self, changelog: Changelog, encoding: str) -> Iterator[bytes]:
+        return _encode(iter_markdown(changelog), encoding)
 
-    def write_heading(entry: ChangelogEntry):
-        buf.write(f"## {entry.version.to_str()} ({entry.released.strftime('%Y-%m-%d')})\n\n")
+    def format_appended(
+        self, content: bytes, entries: List[ChangelogEntry], encoding: str
+    ) -> Optional[Iterator[bytes]]:
+        return _encode(iter_markdown_prepended(content.decode(encoding), entries), encoding)
 
-    def write_group(label: str, items: List[str]):
-        buf.write(f"### {label}\n\n")
-        for item in items:
-            buf.write(f"- {item}\n")
-        buf.write("\n")
 
-    def write_initial_release(entry: ChangelogEntry):
-        write_heading(entry)
-        buf.write("Initial release.\n\n")
+class JsonChangelogFormatter(IChangelogFormatter):
+    """Formats changelog to a single, indented JSON document."""
 
-    def write_release(entry: ChangelogEntry):
-        write_heading(entry)
-        if entry.data is None:
-            return
-        if entry.data.breaking_changes:
-            write_group("BREAKING CHANGES", entry.data.breaking_changes)
-        if entry.data.fixes:
-            write_group("Fix", [x.data.description for x in entry.data.fixes])
-        if entry.data.feats:
-            write_group("Feat", [x.data.description for x in entry.data.feats])
+    def format(self, changelog: Changelog, encoding: str) -> Iterator[bytes]:
+        return _encode(iter_json(changelog), encoding)
 
+    def format_appended(
+        self, content: bytes, entries: List[ChangelogEntry], encoding: str
+    ) -> Optional[Iterator[bytes]]:
+        chunks = iter_json_appended(content.decode(encoding), entries)
+        if chunks is None:
+            return None
+        return _encode(chunks, encoding)
+
+
+class JsonLinesChangelogFormatter(IChangelogFormatter):
+    """Formats changelog to JSON Lines, with one compact JSON object per
+    entry, oldest first.
+
+    As the newest entries are at the end of the file, these can be read
+    without parsing the entire file.
+    """
+
+    def format(self, changelog: Changelog, encoding: str) -> Iterator[bytes]:
+        return _encode(iter_json_lines(changelog.entries), encoding)
+
+    def format_appended(
+        self, content: bytes, entries: List[ChangelogEntry], encoding: str
+    ) -> Optional[Iterator[bytes]]:
+        text = content.decode(encoding)
+        if text and not text.endswith("\n"):
+            return None
+        return _encode(itertools.chain([text], iter_json_lines(entries)), encoding)
+
+
+class MessagePackChangelogFormatter(IChangelogFormatter):
+    """Formats changelog to a stream of MessagePack maps, with one map per
+    entry, oldest first."""
+
+    def format(self, changelog: Changelog, encoding: str) -> Iterator[bytes]:
+        return self._iter_entries(changelog.entries)
+
+    def format_appended(
+        self, content: bytes, entries: List[ChangelogEntry], encoding: str
+    ) -> Optional[Iterator[bytes]]:
+        return itertools.chain([content], self._iter_entries(entries))
+
+    @staticmethod
+    def _iter_entries(entries: List[ChangelogEntry]) -> Iterator[bytes]:
+        for entry in entries:
+            yield _msgpack.packb(dump_valid(entry, exclude_none=True))
+
+
+def make_changelog_formatters() -> Dict[str, IChangelogFormatter]:
+    """Create registry of built-in changelog formatters, mapping changelog
+    file extension to a formatter."""
+    return {
+        ".md": MarkdownChangelogFormatter(),
+        ".json": JsonChangelogFormatter(),
+        ".jsonl": JsonLinesChangelogFormatter(),
+        ".msgpack": MessagePackChangelogFormatter(),
+    }
+
+
+def _encode(chunks: Iterable[str], encoding: str) -> Iterator[bytes]:
+    encoder = codecs.getincrementalencoder(encoding)()
+    for chunk in chunks:
+        yield encoder.encode(chunk)
+    yield encoder.encode("", final=True)
+
+
+def iter_json(changelog: Changelog) -> Iterator[str]:
+    """Formats changelog to JSON, generating output chunk by chunk.
+
+    Entries are formatted one by one, so only a single entry is converted
+    to JSON data at a time.
+    """
+    if not changelog.entries:
+        yield _JSON_ENTRIES_START + "]\n}"
+        return
+    yield _JSON_ENTRIES_START
+    for i, entry in enumerate(changelog.entries):
+        if i > 0:
+            yield ","
+        yield from _iter_json_entry(entry)
+    yield _JSON_ENTRIES_END
+
+
+def iter_json_appended(content: str, entries: List[ChangelogEntry]) -> Optional[Iterator[str]]:
+    """Append *entries* to the entries array of a JSON changelog previously
+    created by :func:`iter_json`.
+
+    Only the new entries are formatted. Returns ``None`` if *content* does
+    not end with a non-empty entries array.
+    """
+    if not content.endswith(_JSON_ENTRIES_END):
+        return None
+
+    def gen():
+        yield content[: -len(_JSON_ENTRIES_END)]
+        for entry in entries:
+            yield ","
+            yield from _iter_json_entry(entry)
+        yield _JSON_ENTRIES_END
+
+    return gen()
+
+
+def iter_json_lines(entries: List[ChangelogEntry]) -> Iterator[str]:
+    """Formats changelog *entries* to JSON Lines, generating one line per
+    entry."""
+    for entry in entries:
+        yield json.dumps(dump_valid(entry, exclude_none=True), separators=(",", ":")) + "\n"
+
+
+def _iter_json_entry(entry: ChangelogEntry) -> Iterator[str]:
+    data = dump_valid(entry, exclude_none=True)
+    yield "\n    "
+    for chunk in json.JSONEncoder(indent=2).iterencode(data):
+        yield chunk.replace("\n", "\n    ")  # Newlines inside strings are always escaped
+
+
+def iter_markdown(changelog: Changelog) -> Iterator[str]:
+    """Formats changelog to Markdown, generating output chunk by chunk."""
     if not changelog.entries:
-        return ""
-    buf = io.StringIO()
+        return
     for entry in reversed(changelog.entries[1:]):
-        write_release(entry)
-    write_initial_release(changelog.entries[0])
-    return buf.getvalue()
+        yield from _iter_markdown_release(entry)
+    yield _format_markdown_heading(changelog.entries[0])
+    yield "Initial release.\n\n"
+
+
+def iter_markdown_prepended(content: str, entries: List[ChangelogEntry]) -> Iterator[str]:
+    """Prepend *entries* to a Markdown changelog previously created by
+    :func:`iter_markdown`.
+
+    Only the new entries are formatted; newest release is put on top.
+    """
+    for entry in reversed(entries):
+        yield from _iter_markdown_release(entry)
+    yield content
+
+
+def _format_markdown_heading(entry: ChangelogEntry) -> str:
+    return f"## {entry.version.to_str()} ({entry.released.strftime('%Y-%m-%d')})\n\n"
+
+
+def _iter_markdown_group(label: str, items: List[str]) -> Iterator[str]:
+    yield f"### {label}\n\n"
+    for item in items:
+        yield f"- {item}\n"
+    yield "\n"
+
+
+def _iter_markdown_release(entry: ChangelogEntry) -> Iterator[str]:
+    yield _format_markdown_heading(entry)
+    if entry.data is None:
+        return
+    if entry.data.breaking_changes:
+        yield from _iter_markdown_group("BREAKING CHANGES", entry.data.breaking_changes)
+    if entry.data.fixes:
+        yield from _iter_markdown_group("Fix", [x.data.description for x in entry.data.fixes])
+    if entry.data.feats:
+        yield from _iter_markdown_group("Feat", [x.data.description for x in entry.data.feats])
@@ -4,6 +4,8 @@ SEMVER_RE = re.compile(
     r"(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?"
 )
 
+SEMVER_BYTES_RE = re.compile(SEMVER_RE.pattern.encode("ascii"))
+
 SEMVER_EXACT_RE = re.compile(r"^" + SEMVER_RE.pattern + r"$")
 
 CONVENTIONAL_COMMIT_SUBJECT_RE = re.compile(
@@ -15,3 +17,14 @@ CONVENTIONAL_COMMIT_FOOTER_TAG_RE = re.compile(
     r"((?P<breaking_change_tag>BREAKING-CHANGE): )|"
     r"((?P<tag>(\w+(-\w+)*)): ))(?P<value>.+)$"
 )
+
+# Characters treated as line boundaries by :meth:`str.splitlines`.
+LINE_BREAK_CHARS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+# Subject regex anchored at the beginning of the whole message and consuming
+# the line break that ends the subject line. Lets us reject non-conventional
+# messages with a single match and without splitting the message into lines.
+CONVENTIONAL_COMMIT_SUBJECT_LINE_RE = re.compile(
+    r"(?P<type>\w+)(\((?P<scope>\w+)\))?(?P<breaking_sign>!)?: "
+    rf"(?P<description>[^{LINE_BREAK_CHARS}]+)(?:\r\n|[{LINE_BREAK_CHARS}]|\Z)"
+)
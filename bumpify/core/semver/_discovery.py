@@ -0,0 +1,68 @@
+import mmap
+from typing import Dict, List, Optional, Tuple, Union
+
+from . import _constants, _version_file_updater
+from .objects import SemVerConfig, Version
+
+
+def make_candidates(path: str) -> List[SemVerConfig.VersionFile]:
+    """Make list of version file configurations to be tried for a file at
+    given *path*, in order of preference.
+
+    Returns empty list if the file is not a known version file.
+
+    :param path:
+        Path to a file.
+    """
+    factories = _CANDIDATE_FACTORIES.get(path.rpartition("/")[2])
+    if factories is None:
+        return []
+    return [SemVerConfig.VersionFile(path=path, **kwargs) for kwargs in factories]
+
+
+def find_version(
+    version_file: SemVerConfig.VersionFile, buf: Union[bytes, mmap.mmap]
+) -> Optional[Tuple[int, int, Version]]:
+    """Find the current version in a version file.
+
+    Returns tuple with offsets of the start and end of the line containing
+    the version, and the version itself, or ``None`` if the version was not
+    found.
+
+    :param version_file:
+        Version file configuration.
+
+    :param buf:
+        The content of the version file.
+    """
+    span = _version_file_updater.find_version_line(version_file, buf)
+    if span is None:
+        return None
+    start, end = span
+    m = _constants.SEMVER_BYTES_RE.search(buf[start:end])
+    if m is None:
+        return None
+    if version_file.section is not None and not _is_in_section(version_file.section, buf, start):
+        return None
+    return start, end, Version.from_str(m.group().decode("ascii"))
+
+
+def _is_in_section(section: str, buf: Union[bytes, mmap.mmap], pos: int) -> bool:
+    # Check if the closest section header preceding *pos* is the expected one,
+    # as otherwise the version would belong to some other TOML table
+    header_start = buf.rfind(b"\n[", 0, pos) + 1
+    if header_start == 0 and buf[:1] != b"[":
+        return False
+    header_end = buf.find(b"\n", header_start)
+    return buf[header_start:header_end].strip() == section.encode("ascii")
+
+
+_CANDIDATE_FACTORIES: Dict[str, List[dict]] = {
+    "pyproject.toml": [
+        {"section": "[project]", "prefix": "version"},
+        {"section": "[tool.poetry]", "prefix": "version"},
+    ],
+    "package.json": [{"prefix": '"version"'}],
+    "Cargo.toml": [{"section": "[package]", "prefix": "version"}],
+    "__init__.py": [{"prefix": "__version__"}],
+}
@@ -1,24 +1,52 @@
-from typing import Optional
+from typing import Dict, Optional
 
-from bumpify.core.hook.interface import IHookApi
-from bumpify.core.vcs.objects import Commit
+from bumpify.core.hook.interface import IHookApi, IHookFunction
 
+from .interface import IChangelogFormatter
 from .objects import ConventionalCommit
 
 
-def invoke_parse_commit_hook(hook_api: IHookApi, commit: Commit) -> Optional[ConventionalCommit]:
-    """Invoke commit parsing hook.
+def get_parse_commit_hook(hook_api: IHookApi) -> IHookFunction:
+    """Get commit parsing hook.
 
-    Return :class:`ConventionalCommit` object parsed from *commit* or ``None``
-    to signal that a *commit* cannot be interpreted as a valid conventional
-    commit.
+    The hook is invoked with a single commit and returns
+    :class:`ConventionalCommit` object parsed from it, or ``None`` to signal
+    that the commit cannot be interpreted as a valid conventional commit.
+
+    :param hook_api:
+        Hook API to be used to access user-defined hook.
+    """
+    return hook_api.get_hook("core.semver.commit_parser", ConventionalCommit.from_commit)
+
+
+def get_parse_commits_batch_hook(hook_api: IHookApi) -> Optional[IHookFunction]:
+    """Get batch commit parsing hook, or return ``None`` if no such hook was
+    defined.
+
+    The batch hook is invoked with a list of commits and returns a sequence
+    of same length, with :class:`ConventionalCommit` object or ``None`` for
+    each commit given.
+
+    :param hook_api:
+        Hook API to be used to access user-defined hook.
+    """
+    if "core.semver.commit_parser_batch" not in hook_api.loaded_hook_names():
+        return None
+    return hook_api.get_hook("core.semver.commit_parser_batch", None)
+
+
+def invoke_changelog_formatters_hook(
+    hook_api: IHookApi, formatters: Dict[str, IChangelogFormatter]
+) -> Dict[str, IChangelogFormatter]:
+    """Invoke changelog formatters hook.
+
+    Return registry of changelog formatters to be used, mapping changelog
+    file extension to a formatter.
 
     :param hook_api:
         Hook API to be used to access user-defined hook.
 
-    :param commit:
-        Commit to be parsed.
+    :param formatters:
+        Registry of built-in changelog formatters.
     """
-    return hook_api.get_hook(
-        "core.semver.commit_parser", lambda commit: ConventionalCommit.from_commit(commit)
-    ).invoke(commit)
+    return hook_api.get_hook("core.semver.changelog_formatters", lambda x: x).invoke(formatters)
@@ -0,0 +1,78 @@
+"""Minimal MessagePack encoder.
+
+Supports only the types that dumped models consist of: ``None``, booleans,
+integers, floats, strings, bytes, lists, tuples and dicts. See
+https://github.com/msgpack/msgpack/blob/master/spec.md for the format
+specification.
+"""
+
+import struct
+from typing import Any, List
+
+
+def packb(obj: Any) -> bytes:
+    """Encode *obj* into MessagePack bytes.
+
+    :param obj:
+        The object to be encoded.
+    """
+    out = []
+    _pack(obj, out)
+    return b"".join(out)
+
+
+def _pack(obj: Any, out: List[bytes]):
+    if obj is None:
+        out.append(b"\xc0")
+    elif obj is True:
+        out.append(b"\xc3")
+    elif obj is False:
+        out.append(b"\xc2")
+    elif isinstance(obj, int):
+        out.append(_pack_int(obj))
+    elif isinstance(obj, float):
+        out.append(struct.pack(">Bd", 0xCB, obj))
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        out.append(_pack_header(len(data), 0xA0, 32, 0xD9, 0xDA, 0xDB))
+        out.append(data)
+    elif isinstance(obj, (bytes, bytearray)):
+        out.append(_pack_header(len(obj), None, 0, 0xC4, 0xC5, 0xC6))
+        out.append(bytes(obj))
+    elif isinstance(obj, (list, tuple)):
+        out.append(_pack_header(len(obj), 0x90, 16, None, 0xDC, 0xDD))
+        for item in obj:
+            _pack(item, out)
+    elif isinstance(obj, dict):
+        out.append(_pack_header(len(obj), 0x80, 16, None, 0xDE, 0xDF))
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    else:
+        raise TypeError(f"cannot encode object of type {type(obj).__name__!r}")
+
+
+def _pack_int(value: int) -> bytes:
+    if 0 <= value < 128:
+        return struct.pack(">B", value)
+    if -32 <= value < 0:
+        return struct.pack(">b", value)
+    if value >= 0:
+        for code, fmt, limit in ((0xCC, "B", 1 << 8), (0xCD, "H", 1 << 16), (0xCE, "I", 1 << 32)):
+            if value < limit:
+                return struct.pack(">B" + fmt, code, value)
+        return struct.pack(">BQ", 0xCF, value)
+    for code, fmt, limit in ((0xD0, "b", 1 << 7), (0xD1, "h", 1 << 15), (0xD2, "i", 1 << 31)):
+        if value >= -limit:
+            return struct.pack(">B" + fmt, code, value)
+    return struct.pack(">Bq", 0xD3, value)
+
+
+def _pack_header(length: int, fix_code: int, fix_limit: int, code8: int, code16: int, code32: int):
+    if length < fix_limit:
+        return struct.pack(">B", fix_code | length)
+    if code8 is not None and length < (1 << 8):
+        return struct.pack(">BB", code8, length)
+    if length < (1 << 16):
+        return struct.pack(">BH", code16, length)
+    return struct.pack(">BI", code32, length)
@@ -1,11 +1,85 @@
+import itertools
 import re
 import typing
 
 from . import _constants
 
+_BODY_OR_FOOTER, _BODY, _BODY_AFTER_BLANK_LINE, _FOOTER = range(4)
+
+
+def parse_conventional_commit(message: str) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """Parse conventional commit *message* in a single pass.
+
+    This is a fast equivalent of feeding :class:`ConventionalCommitParser`
+    with lines of *message* and calling its
+    :meth:`ConventionalCommitParser.output` method; the state machine is kept
+    as a reference implementation. Returns ``None`` if *message* is not a
+    conventional commit message.
+
+    :param message:
+        Commit message to be parsed.
+    """
+    if not message:
+        return ConventionalCommitParser().output()
+    match = _constants.CONVENTIONAL_COMMIT_SUBJECT_LINE_RE.match(message)
+    if match is None:
+        return None
+    description = match.group("description")
+    breaking_changes = [description] if match.group("breaking_sign") is not None else []
+    body = []
+    footer_tags = []
+    lines = message[match.end() :].splitlines()
+    if lines:
+        if lines[0]:
+            return None
+        footer_tag_match = _constants.CONVENTIONAL_COMMIT_FOOTER_TAG_RE.match
+        state = _BODY_OR_FOOTER
+        for line in itertools.islice(lines, 1, None):
+            if state == _BODY:
+                body.append(line)
+                if not line:
+                    state = _BODY_AFTER_BLANK_LINE
+                continue
+            footer_match = footer_tag_match(line)
+            if footer_match is not None:
+                key = (
+                    footer_match.group("breaking_change")
+                    or footer_match.group("breaking_change_tag")
+                    or footer_match.group("tag")
+                )
+                footer_tags.append([key, footer_match.group("value")])
+                state = _FOOTER
+            elif state == _FOOTER:
+                footer_tags[-1].append(line)
+            else:
+                body.append(line)
+                if state == _BODY_OR_FOOTER and not line:
+                    state = _BODY_AFTER_BLANK_LINE
+                else:
+                    state = _BODY
+    footers = {}
+    for tag in footer_tags:
+        key, value = tag[0], ("\n".join(tag[1:])).strip()
+        if key == "BREAKING CHANGE" or key == "BREAKING-CHANGE":
+            breaking_changes.append(value)
+        else:
+            footers[key] = value
+    return {
+        "type": match.group("type"),
+        "scope": match.group("scope"),
+        "description": description,
+        "body": ("\n".join(body)).strip() or None,
+        "breaking_changes": breaking_changes,
+        "footers": footers,
+    }
+
 
 class ConventionalCommitParser:
-    """State machine based parser for conventional commits."""
+    """State machine based parser for conventional commits.
+
+    This is the reference implementation; see :func:`parse_conventional_commit`
+    for the one used when parsing commits.
+    """
 
     def __init__(self):
         self._next_state = self._st_start
@@ -1,5 +1,8 @@
+import codecs
 import io
+import mmap
 import re
+from typing import Optional, Tuple, Union
 
 from . import _constants
 from .exc import VersionFileNotUpdated
@@ -78,3 +81,155 @@ class VersionFileUpdater:
     def _st_done(self, line: str):
         self._out.write(line)
         return self._st_done
+
+
+# Encodings in which bytes from ASCII range always encode ASCII characters
+_ASCII_COMPATIBLE_ENCODINGS = {"ascii", "utf-8", "iso8859-1", "cp1252"}
+
+# Characters removed by str.strip() that are encoded with single ASCII byte,
+# except for the line feed
+_ASCII_WHITESPACE = rb"[ \t\r\x0b\x0c\x1c-\x1f]*"
+
+
+def find_version_line(
+    version_file: SemVerConfig.VersionFile,
+    buf: Union[bytes, mmap.mmap],
+    version: Optional[Version] = None,
+) -> Optional[Tuple[int, int]]:
+    """Find a line of a version file that :class:`VersionFileUpdater` would
+    modify and return tuple with byte offsets of its start and end.
+
+    Instead of decoding the file and processing it line by line, the line is
+    found with a regular expression search over the raw buffer, so the
+    remaining part of the file is never examined. The buffer can be a
+    memory-mapped file.
+
+    Returns ``None`` if the line cannot be found this way, f.e. because the
+    encoding is not ASCII-compatible, non-ASCII content precedes the line, or
+    because there is no such line. Then :class:`VersionFileUpdater` must be
+    used instead, either to update the file or to report the error.
+
+    :param version_file:
+        Version file configuration.
+
+    :param buf:
+        The content of the version file.
+
+    :param version:
+        Version to be written to a file.
+
+        If omitted, then the line with the current version is found, instead
+        of the line to be modified when the file is updated to *version*.
+    """
+    vf = version_file
+    if codecs.lookup(vf.encoding).name not in _ASCII_COMPATIBLE_ENCODINGS:
+        return None
+    if vf.section is not None and not _is_simple_pattern(vf.section, vf.section.strip()):
+        return None
+    if vf.prefix is not None and not _is_simple_pattern(vf.prefix, vf.prefix.lstrip()):
+        return None
+    pos = 0
+    if vf.section is not None:
+        section_re = _ASCII_WHITESPACE + re.escape(vf.section.encode("ascii")) + _ASCII_WHITESPACE
+        m = re.compile(rb"^" + section_re + rb"$", re.MULTILINE).search(buf)
+        if m is None:
+            return None
+        pos = min(m.end() + 1, len(buf))
+    if vf.prefix is not None:
+        prefix_re = _ASCII_WHITESPACE + re.escape(vf.prefix.encode("ascii"))
+        m = re.compile(rb"^" + prefix_re, re.MULTILINE).search(buf, pos)
+        if m is None:
+            return None
+    else:
+        # Lines containing only the target version are left unchanged, so the
+        # lookup continues, just like in VersionFileUpdater
+        version_bytes = None if version is None else version.to_str().encode("ascii")
+        for m in _constants.SEMVER_BYTES_RE.finditer(buf, pos):
+            if m.group() != version_bytes:
+                break
+        else:
+            return None
+    start = buf.rfind(b"\n", 0, m.start()) + 1
+    end = buf.find(b"\n", m.end())
+    end = len(buf) if end == -1 else end + 1
+    if not buf[:end].isascii():
+        return None
+    return start, end
+
+
+def update_version_line(
+    version_file: SemVerConfig.VersionFile,
+    version: Version,
+    buf: Union[bytes, mmap.mmap],
+    start: int,
+    end: int,
+) -> Optional[bytes]:
+    """Update version file by replacing semantic version strings in a line
+    spanning from *start* to *end* byte offsets and return updated content.
+
+    The line must have been found by :func:`find_version_line`. Returns
+    ``None`` if the line no longer looks like the one to be modified.
+
+    :param version_file:
+        Version file configuration.
+
+    :param version:
+        Version to be written to a file.
+
+    :param buf:
+        The content of the version file.
+
+    :param start:
+        Offset of the first byte of the line.
+
+    :param end:
+        Offset of the byte following the last byte of the line, including
+        line feed.
+    """
+    if not 0 <= start < end <= len(buf):
+        return None
+    if (start > 0 and buf[start - 1] != 0x0A) or (end < len(buf) and buf[end - 1] != 0x0A):
+        return None
+    line = buf[start:end]
+    if b"\n" in line[:-1] or not line.isascii():
+        return None
+    version_bytes = version.to_str().encode("ascii")
+    if version_file.prefix is not None:
+        if not line.lstrip(b" \t\r\x0b\x0c\x1c\x1d\x1e\x1f").startswith(
+            version_file.prefix.encode("ascii")
+        ):
+            return None
+    elif all(x == version_bytes for x in _constants.SEMVER_BYTES_RE.findall(line)):
+        return None  # No version to be replaced in this line
+    new_line = _constants.SEMVER_BYTES_RE.sub(lambda _: version_bytes, line)
+    with memoryview(buf) as view:
+        return b"".join((view[:start], new_line, view[end:]))
+
+
+def update_version_file_buffer(
+    version_file: SemVerConfig.VersionFile, version: Version, buf: Union[bytes, mmap.mmap]
+) -> Optional[bytes]:
+    """Update version file given as a buffer of bytes and return updated
+    content.
+
+    This produces same result as :class:`VersionFileUpdater`, using
+    :func:`find_version_line` to find the line to be modified. Returns
+    ``None`` if :class:`VersionFileUpdater` must be used instead.
+
+    :param version_file:
+        Version file configuration.
+
+    :param version:
+        Version to be written to a file.
+
+    :param buf:
+        The content of the version file.
+    """
+    span = find_version_line(version_file, buf, version)
+    if span is None:
+        return None
+    return update_version_line(version_file, version, buf, *span)
+
+
+def _is_simple_pattern(value: str, stripped_value: str) -> bool:
+    return bool(value) and value == stripped_value and value.isascii() and "\n" not in value
@@ -37,3 +37,28 @@ class VersionFileNotUpdated(SemVerError):
         super().__init__()
         self.path = path
         self.reason = reason
+
+
+class CommitParserBatchHookError(SemVerError):
+    """Raised when batch commit parser hook returned wrong number of
+    results."""
+
+    __message_template__ = (
+        "commit parser batch hook returned {self.num_results} result(-s) "
+        "for {self.num_commits} commit(-s)"
+    )
+
+    #: Number of commits given to the hook.
+    num_commits: int
+
+    #: Number of results returned by the hook.
+    num_results: int
+
+    def __init__(self, num_commits: int, num_results: int):
+        super().__init__()
+        self.num_commits = num_commits
+        self.num_results = num_results
+
+    def __reduce__(self):
+        # Can be raised by worker processes, so must be picklable
+        return self.__class__, (self.num_commits, self.num_results)
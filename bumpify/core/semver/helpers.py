@@ -1,6 +1,12 @@
 import datetime
+import hashlib
+import json
 from typing import List
 
+from bumpify import __version__
+from bumpify.core.config.objects import Config
+from bumpify.core.filesystem.exc import FileNotFound
+from bumpify.core.filesystem.interface import IFileSystemReader
 from bumpify.core.vcs.helpers import make_dummy_commit, make_dummy_tag
 
 from .objects import ChangelogEntry, ChangelogEntryData, ConventionalCommit, Version, VersionTag
@@ -54,3 +60,27 @@ def make_dummy_conventional_commit(
     if maybe_conventional_commit is None:
         raise ValueError(f"not a conventional commit message: {message}")
     return maybe_conventional_commit
+
+
+def make_changelog_cache_fingerprint(config: Config, filesystem_reader: IFileSystemReader) -> str:
+    """Calculate fingerprint of the settings affecting the content of
+    changelog entries.
+
+    The fingerprint changes whenever Bumpify version, semantic versioning
+    configuration or any of the configured hook files changes.
+
+    :param config:
+        Config object.
+
+    :param filesystem_reader:
+        Filesystem reader to read hook files from.
+    """
+    fingerprint = hashlib.sha1(__version__.encode())
+    fingerprint.update(json.dumps(config.data.get("semver"), sort_keys=True, default=str).encode())
+    for path in (config.data.get("hook") or {}).get("paths", []):
+        fingerprint.update(path.encode())
+        try:
+            fingerprint.update(filesystem_reader.read(path))
+        except FileNotFound:
+            pass
+    return fingerprint.hexdigest()
@@ -12,3 +12,36 @@ def commit_parser_hook(func):
             ...
     """
     return hook("core.semver.commit_parser")(func)
+
+
+def commit_parser_batch_hook(func):
+    """Decorate user-defined hook function as a batch commit parser.
+
+    This is an alternative to :func:`commit_parser_hook` for parsers that
+    can process many commits more efficiently than one by one. When defined,
+    it is used instead of the commit parser hook. A decorated function must
+    satisfy following interface::
+
+        def hook(commits: List[Commit]) -> Sequence[Optional[ConventionalCommit]]:
+            ...
+
+    The returned sequence must contain exactly one item for each commit
+    given, in same order.
+    """
+    return hook("core.semver.commit_parser_batch")(func)
+
+
+def changelog_formatters_hook(func):
+    """Decorate user-defined hook function as a changelog formatters
+    registry provider.
+
+    The function receives registry of built-in changelog formatters, mapping
+    changelog file extension (f.e. ``.md``) to a formatter object, and returns
+    registry to be used. This can be used to add formatters for other file
+    extensions, or to replace built-in ones. A decorated function must satisfy
+    following interface::
+
+        def hook(formatters: Dict[str, IChangelogFormatter]) -> Dict[str, IChangelogFormatter]:
+            ...
+    """
+    return hook("core.semver.changelog_formatters")(func)
@@ -1,27 +1,133 @@
+import collections
+import concurrent.futures
+import hashlib
 import io
-from typing import List, Optional
+import itertools
+import json
+import logging
+import os
+import pickle
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
+from modelity.api import ParsingError
+
+from bumpify import exc
 from bumpify.core.config.objects import LoadedSection
+from bumpify.core.filesystem.exc import FileNotFound
+from bumpify.core.filesystem.helpers import read_json
 from bumpify.core.filesystem.interface import IFileSystemReaderWriter
-from bumpify.core.hook.interface import IHookApi
+from bumpify.core.hook.interface import IHookApi, IHookFunction
 from bumpify.core.semver.objects import (
     Changelog,
     ChangelogEntry,
     ChangelogEntryData,
+    ChangelogFileState,
+    ChangeSeverity,
     ConventionalCommit,
     Version,
+    VersionFileLocation,
     VersionTag,
 )
 from bumpify.core.vcs.interface import IVcsReaderWriter
+from bumpify.core.vcs.objects import Commit
+from bumpify.model import dump_valid
 
-from . import _changelog_formatters, _hook_invokers, _version_file_updater
-from .exc import UnsupportedChangelogFormat
-from .interface import ISemVerApi
+from . import _changelog_formatters, _discovery, _hook_invokers, _version_file_updater
+from .exc import CommitParserBatchHookError, UnsupportedChangelogFormat
+from .interface import IChangelogCache, IChangelogFormatter, ISemVerApi, IVersionFileIndex
 from .objects import SemVerConfig
 
+logger = logging.getLogger(__name__)
+
+_PARSE_CHUNK_SIZE = 512
+
+_FILE_WORKERS = 8
+
+# Version file, its updated content, and the number, start and end offsets of
+# the updated line (if known)
+_FormattedVersionFile = Tuple[SemVerConfig.VersionFile, bytes, Optional[Tuple[int, int, int]]]
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+def _invoke_hook_for_each(hook: IHookFunction, commits: List[Commit]) -> list:
+    return hook.invoke_many([(commit,) for commit in commits])
+
+
+def _invoke_batch_hook(hook: IHookFunction, commits: List[Commit]) -> list:
+    result = list(hook.invoke(commits))
+    if len(result) != len(commits):
+        raise CommitParserBatchHookError(len(commits), len(result))
+    return result
+
+
+def _iter_chunks(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_growing_chunks(items: Iterable[T], max_size: int) -> Iterator[List[T]]:
+    # Chunk size is doubled until it reaches *max_size*, so that only few
+    # items are consumed in advance if the caller stops early
+    items = iter(items)
+    size = 1
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+        size = min(2 * size, max_size)
+
+
+def _map_in_threads(func: Callable[[T], U], items: List[T]) -> List[U]:
+    # Results are returned in order; first exception (in order) is reraised
+    # and remaining work is cancelled
+    if len(items) < 2:
+        return [func(x) for x in items]
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(_FILE_WORKERS, len(items)))
+    try:
+        return list(executor.map(func, items))
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _is_picklable(obj: object) -> bool:
+    try:
+        pickle.dumps(obj)
+    except Exception:
+        return False
+    return True
+
 
 class SemVerApi(ISemVerApi):
-    """Default implementation of the semantic versioning API."""
+    """Default implementation of the semantic versioning API.
+
+    :param changelog_cache:
+        Optional cache for changelog entries of already released versions.
+
+        When given, :meth:`fetch_changelog` will only parse commits made after
+        the newest cached version tag, and :meth:`update_changelog_files` will
+        only format entries missing in changelog files, unless those files
+        were modified since they were last written.
+
+    :param parse_jobs:
+        Number of processes to use for parsing commits.
+
+        If greater than 1, then commits are parsed in chunks by a pool of
+        processes, but only if there are enough commits and the commit parser
+        hook can be pickled, which is not the case for hooks executed in a
+        sandbox or profiled. Otherwise, commits are parsed serially, in
+        chunks of growing size, so that hooks executed by worker processes
+        receive many commits at once.
+
+        If batch commit parser hook is defined, then it is always invoked
+        with chunks of commits, no matter how many jobs are used.
+    """
 
     def __init__(
         self,
@@ -29,11 +135,19 @@ class SemVerApi(ISemVerApi):
         filesystem_reader_writer: IFileSystemReaderWriter,
         vcs_reader_writer: IVcsReaderWriter,
         hook_api: IHookApi,
+        changelog_cache: IChangelogCache = None,
+        parse_jobs: int = 1,
+        version_file_index: IVersionFileIndex = None,
     ):
         self._semver_config = semver_config
         self._filesystem_reader_writer = filesystem_reader_writer
         self._vcs_reader_writer = vcs_reader_writer
         self._hook_api = hook_api
+        self._changelog_cache = changelog_cache
+        self._parse_jobs = parse_jobs
+        self._version_file_index = version_file_index
+        self._changelog_formatters = None
+        self._commit_parser_hooks = None
 
     def list_version_tags(self) -> List[VersionTag]:
         result = []
@@ -41,72 +155,508 @@ class SemVerApi(ISemVerApi):
             maybe_version_tag = VersionTag.from_tag(tag)
             if maybe_version_tag:
                 result.append(maybe_version_tag)
-        result.sort(key=lambda x: x.version)
+        result.sort(key=lambda x: x.version.sort_key)
         return result
 
     def list_conventional_commits(
         self, start_rev: str = None, end_rev: str = None
     ) -> List[ConventionalCommit]:
-        result = []
-        for commit in self._vcs_reader_writer.list_commits(start_rev=start_rev, end_rev=end_rev):
-            maybe_conventional_commit = _hook_invokers.invoke_parse_commit_hook(
-                self._hook_api, commit
-            )
-            if maybe_conventional_commit:
-                result.append(maybe_conventional_commit)
-        return result
+        return list(self._iter_conventional_commits(start_rev=start_rev, end_rev=end_rev))
 
     def fetch_unreleased_changes(self, version_tag: VersionTag) -> Optional[ChangelogEntryData]:
-        conventional_commits = self.list_conventional_commits(start_rev=version_tag.tag.rev)
-        if not conventional_commits:
-            return None
-        result = ChangelogEntryData()
-        for item in conventional_commits:
+        result = None
+        for item in self._iter_conventional_commits(start_rev=version_tag.tag.rev):
+            if result is None:
+                result = ChangelogEntryData()
             result.update(item)
         return result
 
+    def detect_bump_severity(self, version_tag: VersionTag) -> Optional[ChangeSeverity]:
+        result = None
+        for item in self._iter_conventional_commits(start_rev=version_tag.tag.rev):
+            severity = item.data.severity
+            if severity is not None and (result is None or severity > result):
+                result = severity
+                if result == ChangeSeverity.BREAKING:
+                    break
+        return result
+
     def fetch_changelog(self, version_tags: List[VersionTag]) -> Optional[Changelog]:
         result = Changelog()
         result.add_entry(
             ChangelogEntry(version=version_tags[0].version, released=version_tags[0].tag.created)
         )
-        prev_version_tag = version_tags[0]
-        for version_tag in version_tags[1:]:
-            conventional_commits = self.list_conventional_commits(
-                start_rev=prev_version_tag.tag.rev, end_rev=version_tag.tag.rev
-            )
+        start = 0
+        for prev_version_tag, version_tag in zip(version_tags, version_tags[1:]):
+            maybe_entry = self._load_cached_changelog_entry(prev_version_tag, version_tag)
+            if maybe_entry is None:
+                break
+            result.add_entry(maybe_entry)
+            start += 1
+        version_tags = version_tags[start:]
+        if len(version_tags) < 2:
+            return result
+        commit_lists = self._vcs_reader_writer.list_commits_partitioned(
+            [x.tag.rev for x in version_tags]
+        )
+        parsed_commits = self._parse_commits(itertools.chain.from_iterable(commit_lists))
+        for prev_version_tag, version_tag, commits in zip(
+            version_tags, version_tags[1:], commit_lists
+        ):
             changelog_entry_data = ChangelogEntryData()
-            for item in conventional_commits:
-                changelog_entry_data.update(item)
-            result.add_entry(
-                ChangelogEntry(
-                    version=version_tag.version,
-                    prev_version=prev_version_tag.version,
-                    released=version_tag.tag.created,
-                    data=changelog_entry_data if not changelog_entry_data.is_empty() else None,
+            for item in itertools.islice(parsed_commits, len(commits)):
+                if item is not None:
+                    changelog_entry_data.update(item)
+            entry = ChangelogEntry(
+                version=version_tag.version,
+                prev_version=prev_version_tag.version,
+                released=version_tag.tag.created,
+                data=changelog_entry_data if not changelog_entry_data.is_empty() else None,
+            )
+            result.add_entry(entry)
+            if self._changelog_cache is not None:
+                self._changelog_cache.save_entry(
+                    prev_version_tag.tag.rev, version_tag.tag.rev, entry
                 )
+        if self._changelog_cache is not None:
+            self._changelog_cache.flush()
+        return result
+
+    def _load_cached_changelog_entry(
+        self, prev_version_tag: VersionTag, version_tag: VersionTag
+    ) -> Optional[ChangelogEntry]:
+        if self._changelog_cache is None:
+            return None
+        maybe_entry = self._changelog_cache.load_entry(
+            prev_version_tag.tag.rev, version_tag.tag.rev
+        )
+        if maybe_entry is None:
+            return None
+        if maybe_entry.version != version_tag.version:
+            return None  # The tag was renamed; parse it again
+        if maybe_entry.prev_version != prev_version_tag.version:
+            return None
+        return maybe_entry
+
+    def _iter_conventional_commits(
+        self, start_rev: str = None, end_rev: str = None
+    ) -> Iterator[ConventionalCommit]:
+        commits = self._vcs_reader_writer.iter_commits(start_rev=start_rev, end_rev=end_rev)
+        return self._parse_conventional_commits(commits)
+
+    def _parse_conventional_commits(
+        self, commits: Iterable[Commit]
+    ) -> Iterator[ConventionalCommit]:
+        for maybe_conventional_commit in self._parse_commits(commits):
+            if maybe_conventional_commit:
+                yield maybe_conventional_commit
+
+    def _get_commit_parser_hooks(self) -> Tuple[IHookFunction, Optional[IHookFunction]]:
+        if self._commit_parser_hooks is None:
+            self._commit_parser_hooks = (
+                _hook_invokers.get_parse_commit_hook(self._hook_api),
+                _hook_invokers.get_parse_commits_batch_hook(self._hook_api),
+            )
+        return self._commit_parser_hooks
+
+    def _parse_commits(self, commits: Iterable[Commit]) -> Iterator[Optional[ConventionalCommit]]:
+        hook, batch_hook = self._get_commit_parser_hooks()
+        if batch_hook is not None:
+            hook, invoke_func = batch_hook, _invoke_batch_hook
+        else:
+            invoke_func = _invoke_hook_for_each
+        if self._parse_jobs > 1:
+            commits = iter(commits)
+            first_chunk = list(itertools.islice(commits, _PARSE_CHUNK_SIZE))
+            commits = itertools.chain(first_chunk, commits)
+            if len(first_chunk) == _PARSE_CHUNK_SIZE:
+                if _is_picklable(hook):
+                    return self._parse_commits_in_parallel(hook, invoke_func, commits)
+                logger.info("Commit parser hook cannot be pickled; parsing commits serially")
+        if batch_hook is not None:
+            return itertools.chain.from_iterable(
+                invoke_func(hook, chunk) for chunk in _iter_chunks(commits, _PARSE_CHUNK_SIZE)
             )
-            prev_version_tag = version_tag
+        return itertools.chain.from_iterable(
+            invoke_func(hook, chunk) for chunk in _iter_growing_chunks(commits, _PARSE_CHUNK_SIZE)
+        )
+
+    def _parse_commits_in_parallel(
+        self,
+        hook: IHookFunction,
+        invoke_func: Callable[[IHookFunction, List[Commit]], list],
+        commits: Iterator[Commit],
+    ) -> Iterator[Optional[ConventionalCommit]]:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=self._parse_jobs)
+        pending = collections.deque()
+        try:
+            for chunk in _iter_chunks(commits, _PARSE_CHUNK_SIZE):
+                pending.append(executor.submit(invoke_func, hook, chunk))
+                if len(pending) >= 2 * self._parse_jobs:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def discover_version_files(self) -> List[VersionFileLocation]:
+        candidates = []
+        for path in self._list_project_paths():
+            version_files = _discovery.make_candidates(path)
+            if version_files:
+                candidates.append(version_files)
+        result = [
+            x for x in _map_in_threads(self._discover_version_file, candidates) if x is not None
+        ]
+        result.sort(key=lambda x: x.version_file.path)
+        if self._version_file_index is not None:
+            for location in result:
+                self._version_file_index.save_location(location)
+            self._version_file_index.flush()
         return result
 
+    def _list_project_paths(self) -> Iterable[str]:
+        # Files are listed by the VCS, as it does not visit ignored
+        # directories; project tree is scanned if the VCS failed to do so
+        try:
+            return list(self._vcs_reader_writer.list_tracked_paths(include_untracked=True))
+        except exc.ShellCommandError as e:
+            logger.info("Could not list files with VCS; scanning project tree instead: %s", e)
+            return self._filesystem_reader_writer.scan(use_gitignore=True)
+
+    def _discover_version_file(
+        self, version_files: List[SemVerConfig.VersionFile]
+    ) -> Optional[VersionFileLocation]:
+        path = version_files[0].path
+        try:
+            with self._filesystem_reader_writer.open_mapped(path) as buf:
+                for vf in version_files:
+                    found = _discovery.find_version(vf, buf)
+                    if found is not None:
+                        start, end, version = found
+                        line = buf[:start].count(b"\n") + 1
+                        return self._make_version_file_location(vf, version, line, start, end)
+        except FileNotFound:
+            pass  # Removed while scanning
+        return None
+
+    def _make_version_file_location(
+        self, vf: SemVerConfig.VersionFile, version: Version, line: int, start: int, end: int
+    ) -> VersionFileLocation:
+        stat = self._filesystem_reader_writer.stat(vf.path)
+        return VersionFileLocation(
+            version_file=vf,
+            version=version,
+            line=line,
+            offset=start,
+            length=end - start,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+        )
+
+    def update_files(self, changelog: Changelog, version: Version):
+        changelog_formatters = self._find_changelog_formatters()
+        version_files_content = self._format_version_files(version)
+        # Changelog files are formatted while being written, so files are
+        # staged to leave all of them untouched if any formatter fails
+        with self._filesystem_reader_writer.staged():
+            changelog_file_states = self._write_changelog_files(changelog, changelog_formatters)
+            self._write_version_files(version_files_content)
+        self._save_changelog_file_states(changelog_file_states)
+        self._save_version_file_locations(version_files_content, version)
+
     def update_changelog_files(self, changelog: Changelog):
+        changelog_formatters = self._find_changelog_formatters()
+        with self._filesystem_reader_writer.staged():
+            changelog_file_states = self._write_changelog_files(changelog, changelog_formatters)
+        self._save_changelog_file_states(changelog_file_states)
+
+    def _find_changelog_formatters(
+        self,
+    ) -> List[Tuple[SemVerConfig.ChangelogFile, IChangelogFormatter]]:
+        result = []
         for changelog_file in self._semver_config.config.changelog_files:
-            if changelog_file.path.endswith(".json"):
-                changelog_data = _changelog_formatters.format_as_json(changelog)
-            elif changelog_file.path.endswith(".md"):
-                changelog_data = _changelog_formatters.format_as_markdown(changelog)
-            else:
+            _, ext = os.path.splitext(changelog_file.path)
+            formatter = self._get_changelog_formatters().get(ext)
+            if formatter is None:
                 raise UnsupportedChangelogFormat(changelog_file.path)
-            self._filesystem_reader_writer.write(
-                changelog_file.path, changelog_data.encode(changelog_file.encoding)
+            result.append((changelog_file, formatter))
+        return result
+
+    def _write_changelog_files(
+        self,
+        changelog: Changelog,
+        changelog_formatters: List[Tuple[SemVerConfig.ChangelogFile, IChangelogFormatter]],
+    ) -> List[Tuple[str, ChangelogFileState]]:
+        result = []
+        for changelog_file, formatter in changelog_formatters:
+            chunks = self._format_changelog_file_appended(changelog_file, changelog, formatter)
+            if chunks is None:
+                chunks = formatter.format(changelog, changelog_file.encoding)
+            digest = hashlib.sha256()
+            with self._filesystem_reader_writer.open_write(changelog_file.path) as fd:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    fd.write(chunk)
+            if changelog.entries:
+                state = ChangelogFileState(
+                    num_entries=len(changelog.entries),
+                    version=changelog.entries[-1].version,
+                    encoding=changelog_file.encoding,
+                    digest=digest.hexdigest(),
+                )
+                result.append((changelog_file.path, state))
+        return result
+
+    def _save_changelog_file_states(self, states: List[Tuple[str, ChangelogFileState]]):
+        # Saved once files are published, as these describe written content
+        if self._changelog_cache is None:
+            return
+        for path, state in states:
+            self._changelog_cache.save_file_state(path, state)
+        self._changelog_cache.flush()
+
+    def _get_changelog_formatters(self) -> Dict[str, IChangelogFormatter]:
+        if self._changelog_formatters is None:
+            self._changelog_formatters = _hook_invokers.invoke_changelog_formatters_hook(
+                self._hook_api, _changelog_formatters.make_changelog_formatters()
             )
+        return self._changelog_formatters
+
+    def _format_changelog_file_appended(
+        self,
+        changelog_file: SemVerConfig.ChangelogFile,
+        changelog: Changelog,
+        formatter: IChangelogFormatter,
+    ) -> Optional[Iterator[bytes]]:
+        # Returns None if the changelog file has to be formatted from scratch,
+        # i.e. when it no longer matches the state cached when it was written
+        if self._changelog_cache is None:
+            return None
+        state = self._changelog_cache.load_file_state(changelog_file.path)
+        if state is None or state.encoding != changelog_file.encoding:
+            return None
+        if not 0 < state.num_entries <= len(changelog.entries):
+            return None
+        if changelog.entries[state.num_entries - 1].version != state.version:
+            return None
+        try:
+            content = self._filesystem_reader_writer.read(changelog_file.path)
+        except FileNotFound:
+            return None
+        if hashlib.sha256(content).hexdigest() != state.digest:
+            return None
+        return formatter.format_appended(
+            content, changelog.entries[state.num_entries :], state.encoding
+        )
 
     def update_version_files(self, version: Version):
-        for vf in self._semver_config.config.version_files:
-            dest = io.StringIO()
-            updater = _version_file_updater.VersionFileUpdater(vf, version, dest)
-            initial_content = self._filesystem_reader_writer.read(vf.path).decode(vf.encoding)
-            for line in io.StringIO(initial_content):
-                updater.feed(line)
-            updater.feed("")
-            self._filesystem_reader_writer.write(vf.path, dest.getvalue().encode(vf.encoding))
+        version_files_content = self._format_version_files(version)
+        self._write_version_files(version_files_content)
+        self._save_version_file_locations(version_files_content, version)
+
+    def _format_version_files(self, version: Version) -> List[_FormattedVersionFile]:
+        # Reading and updating files is done concurrently, but nothing is
+        # written until all version files are successfully updated
+        return _map_in_threads(
+            lambda vf: self._format_version_file(vf, version),
+            self._semver_config.config.version_files,
+        )
+
+    def _format_version_file(
+        self, vf: SemVerConfig.VersionFile, version: Version
+    ) -> _FormattedVersionFile:
+        with self._filesystem_reader_writer.open_mapped(vf.path) as buf:
+            content = None
+            location = self._load_version_file_location(vf)
+            if location is not None:
+                line, start, end = location.line, location.offset, location.offset + location.length
+                content = _version_file_updater.update_version_line(vf, version, buf, start, end)
+            if content is None:
+                span = _version_file_updater.find_version_line(vf, buf, version)
+                if span is not None:
+                    start, end = span
+                    line = buf[:start].count(b"\n") + 1
+                    content = _version_file_updater.update_version_line(
+                        vf, version, buf, start, end
+                    )
+            if content is not None:
+                return vf, content, (line, start, end + len(content) - len(buf))
+        dest = io.StringIO()
+        updater = _version_file_updater.VersionFileUpdater(vf, version, dest)
+        initial_content = self._filesystem_reader_writer.read(vf.path).decode(vf.encoding)
+        for line in io.StringIO(initial_content):
+            updater.feed(line)
+        updater.feed("")
+        return vf, dest.getvalue().encode(vf.encoding), None
+
+    def _load_version_file_location(
+        self, vf: SemVerConfig.VersionFile
+    ) -> Optional[VersionFileLocation]:
+        # Returns None if the file was modified since it was indexed
+        if self._version_file_index is None:
+            return None
+        location = self._version_file_index.load_location(vf.path)
+        if location is None or location.version_file != vf:
+            return None
+        stat = self._filesystem_reader_writer.stat(vf.path)
+        if (stat.st_mtime_ns, stat.st_size) != (location.mtime_ns, location.size):
+            return None
+        return location
+
+    def _write_version_files(self, version_files: List[_FormattedVersionFile]):
+        for vf, content, _ in version_files:
+            self._filesystem_reader_writer.write(vf.path, content)
+
+    def _save_version_file_locations(
+        self, version_files: List[_FormattedVersionFile], version: Version
+    ):
+        # Locations include size and modification time of published files
+        if self._version_file_index is None:
+            return
+        for vf, _, line_span in version_files:
+            if line_span is not None:
+                location = self._make_version_file_location(vf, version, *line_span)
+                self._version_file_index.save_location(location)
+        self._version_file_index.flush()
+
+
+class ChangelogCache(IChangelogCache):
+    """Default implementation of the :class:`IChangelogCache` interface.
+
+    Entries and changelog file states are stored in a single JSON file,
+    together with a *fingerprint* of the settings that were used to create
+    those entries. If the fingerprint changes, then all cached entries and
+    file states are discarded.
+
+    :param filesystem_reader_writer:
+        Filesystem to store cache file in.
+
+        This must not be the project's filesystem, as files written there are
+        added to the bump commit.
+
+    :param path:
+        Path to a cache file.
+
+    :param fingerprint:
+        Fingerprint of settings affecting the content of changelog entries.
+
+        See :func:`bumpify.core.semver.helpers.make_changelog_cache_fingerprint`.
+    """
+
+    def __init__(
+        self, filesystem_reader_writer: IFileSystemReaderWriter, path: str, fingerprint: str
+    ):
+        self._filesystem_reader_writer = filesystem_reader_writer
+        self._path = path
+        self._fingerprint = fingerprint
+        self._data = None
+        self._modified = False
+
+    @staticmethod
+    def _make_key(prev_rev: str, rev: str) -> str:
+        return f"{prev_rev}..{rev}"
+
+    def _load(self) -> dict:
+        if self._data is not None:
+            return self._data
+        self._data = {"entries": {}, "files": {}}
+        try:
+            data = read_json(self._filesystem_reader_writer, self._path)
+        except (FileNotFound, ValueError):
+            return self._data
+        if isinstance(data, dict) and data.get("fingerprint") == self._fingerprint:
+            self._data["entries"] = data.get("entries", {})
+            self._data["files"] = data.get("files", {})
+        return self._data
+
+    def load_entry(self, prev_rev: str, rev: str) -> Optional[ChangelogEntry]:
+        data = self._load()["entries"].get(self._make_key(prev_rev, rev))
+        if data is None:
+            return None
+        return ChangelogEntry(**data)
+
+    def save_entry(self, prev_rev: str, rev: str, entry: ChangelogEntry):
+        self._load()["entries"][self._make_key(prev_rev, rev)] = dump_valid(
+            entry, exclude_none=True
+        )
+        self._modified = True
+
+    def load_file_state(self, path: str) -> Optional[ChangelogFileState]:
+        data = self._load()["files"].get(path)
+        if data is None:
+            return None
+        return ChangelogFileState(**data)
+
+    def save_file_state(self, path: str, state: ChangelogFileState):
+        self._load()["files"][path] = dump_valid(state)
+        self._modified = True
+
+    def flush(self):
+        if not self._modified:
+            return
+        payload = json.dumps({"fingerprint": self._fingerprint, **self._load()})
+        try:
+            self._filesystem_reader_writer.write(self._path, payload.encode())
+        except OSError as e:
+            logger.warning("Could not write changelog cache: %s", e)
+        else:
+            self._modified = False
+
+
+class VersionFileIndex(IVersionFileIndex):
+    """Default implementation of the :class:`IVersionFileIndex` interface.
+
+    Locations are stored in a single JSON file.
+
+    :param filesystem_reader_writer:
+        Filesystem to store index file in.
+
+        This must not be the project's filesystem, as files written there are
+        added to the bump commit.
+
+    :param path:
+        Path to an index file.
+    """
+
+    def __init__(self, filesystem_reader_writer: IFileSystemReaderWriter, path: str):
+        self._filesystem_reader_writer = filesystem_reader_writer
+        self._path = path
+        self._locations = None
+        self._modified = False
+
+    def _load(self) -> dict:
+        if self._locations is not None:
+            return self._locations
+        self._locations = {}
+        try:
+            data = read_json(self._filesystem_reader_writer, self._path)
+        except (FileNotFound, ValueError):
+            return self._locations
+        if isinstance(data, dict) and isinstance(data.get("locations"), dict):
+            self._locations = data["locations"]
+        return self._locations
+
+    def load_location(self, path: str) -> Optional[VersionFileLocation]:
+        data = self._load().get(path)
+        if data is None:
+            return None
+        try:
+            return VersionFileLocation(**data)
+        except (TypeError, ParsingError):
+            return None  # Written by incompatible version
+
+    def save_location(self, location: VersionFileLocation):
+        self._load()[location.version_file.path] = dump_valid(location)
+        self._modified = True
+
+    def flush(self):
+        if not self._modified:
+            return
+        payload = json.dumps({"locations": self._load()})
+        try:
+            self._filesystem_reader_writer.write(self._path, payload.encode())
+        except OSError as e:
+            logger.warning("Could not write version file index: %s", e)
+        else:
+            self._modified = False
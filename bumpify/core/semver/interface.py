@@ -1,7 +1,17 @@
 import abc
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
-from .objects import Changelog, ChangelogEntryData, ConventionalCommit, Version, VersionTag
+from .objects import (
+    Changelog,
+    ChangelogEntry,
+    ChangelogEntryData,
+    ChangelogFileState,
+    ChangeSeverity,
+    ConventionalCommit,
+    Version,
+    VersionFileLocation,
+    VersionTag,
+)
 
 
 class ISemVerQueryApi(abc.ABC):
@@ -50,6 +60,21 @@ class ISemVerQueryApi(abc.ABC):
             changes that should go to a next version's changelog.
         """
 
+    @abc.abstractmethod
+    def detect_bump_severity(self, version_tag: VersionTag) -> Optional[ChangeSeverity]:
+        """Detect the highest severity of changes made between *version_tag*
+        (exclusive) and current HEAD.
+
+        This is a lightweight alternative to :meth:`fetch_unreleased_changes`
+        for when only the severity is needed. Commits are read one by one and
+        the search stops as soon as breaking change is found.
+
+        Returns ``None`` if no changes affecting the version were made.
+
+        :param version_tag:
+            Version tag pointing to a commit to start search from (exclusive).
+        """
+
     @abc.abstractmethod
     def fetch_changelog(self, version_tags: List[VersionTag]) -> Changelog:
         """Fetch changelog for given list of version tags.
@@ -64,10 +89,39 @@ class ISemVerQueryApi(abc.ABC):
             The list must not be empty.
         """
 
+    @abc.abstractmethod
+    def discover_version_files(self) -> List[VersionFileLocation]:
+        """Scan the project for known version files (``pyproject.toml``,
+        ``package.json``, ``Cargo.toml`` and ``__init__.py`` with
+        ``__version__``) and return locations of versions found in those
+        files, sorted by path.
+
+        Paths ignored by ``.gitignore`` files are skipped. Found locations are
+        also recorded in the version file index, if available, allowing to
+        update those files without searching for the version.
+        """
+
 
 class ISemVerCommandApi(abc.ABC):
     """Command API for semantic versioning."""
 
+    @abc.abstractmethod
+    def update_files(self, changelog: Changelog, version: Version):
+        """Update all configured changelog files and version files.
+
+        Unlike calling :meth:`update_changelog_files` and
+        :meth:`update_version_files` one after another, no file is written
+        unless all version files were successfully updated and all changelog
+        files were successfully formatted.
+
+        :param changelog:
+            The changelog object to be used to replace current content of
+            changelog files.
+
+        :param version:
+            The version to be written to version files.
+        """
+
     @abc.abstractmethod
     def update_changelog_files(self, changelog: Changelog):
         """Update all configured changelog files by encoding and writing
@@ -90,3 +144,143 @@ class ISemVerCommandApi(abc.ABC):
 
 class ISemVerApi(ISemVerCommandApi, ISemVerQueryApi):
     """Command/query API for semantic versioning."""
+
+
+class IChangelogFormatter(abc.ABC):
+    """Interface for changelog file formatters.
+
+    Formatter is chosen by the extension of a changelog file. Custom
+    formatters can be registered with
+    :func:`bumpify.core.semver.hooks.changelog_formatters_hook` hook.
+    """
+
+    @abc.abstractmethod
+    def format(self, changelog: Changelog, encoding: str) -> Iterator[bytes]:
+        """Format *changelog*, generating changelog file content chunk by
+        chunk.
+
+        :param changelog:
+            The changelog to be formatted.
+
+        :param encoding:
+            Changelog file encoding.
+
+            Binary formats can ignore this.
+        """
+
+    @abc.abstractmethod
+    def format_appended(
+        self, content: bytes, entries: List[ChangelogEntry], encoding: str
+    ) -> Optional[Iterator[bytes]]:
+        """Add new changelog *entries* to changelog file *content*, previously
+        created by this formatter, and generate updated content chunk by
+        chunk.
+
+        Only new entries should be formatted. Return ``None`` if this is not
+        supported, or if *content* was not recognized, to format the whole
+        changelog with :meth:`format` instead.
+
+        :param content:
+            Current content of a changelog file.
+
+        :param entries:
+            Changelog entries to be added, sorted from oldest to newest.
+
+        :param encoding:
+            Changelog file encoding.
+        """
+
+
+class IChangelogCache(abc.ABC):
+    """Interface for storing changelog entries of already released versions.
+
+    Once a version tag is created, the changelog entry for that version never
+    changes, so it can be stored and reused later instead of parsing the same
+    commits again and again. The cache also keeps track of changelog files
+    written, so that only new entries need to be added to those files.
+    """
+
+    @abc.abstractmethod
+    def load_entry(self, prev_rev: str, rev: str) -> Optional[ChangelogEntry]:
+        """Load changelog entry for a release tagged at *rev*, or return
+        ``None`` if no entry is cached.
+
+        :param prev_rev:
+            Revision of the previous version tag.
+
+        :param rev:
+            Revision of the version tag.
+        """
+
+    @abc.abstractmethod
+    def save_entry(self, prev_rev: str, rev: str, entry: ChangelogEntry):
+        """Add changelog entry to the cache.
+
+        Saved entries are persisted by :meth:`flush`.
+
+        :param prev_rev:
+            Revision of the previous version tag.
+
+        :param rev:
+            Revision of the version tag.
+
+        :param entry:
+            Changelog entry to be saved.
+        """
+
+    @abc.abstractmethod
+    def load_file_state(self, path: str) -> Optional[ChangelogFileState]:
+        """Load state of a changelog file, or return ``None`` if no state is
+        cached for that file.
+
+        :param path:
+            Path to a changelog file.
+        """
+
+    @abc.abstractmethod
+    def save_file_state(self, path: str, state: ChangelogFileState):
+        """Save state of a changelog file that was just written.
+
+        Saved states are persisted by :meth:`flush`.
+
+        :param path:
+            Path to a changelog file.
+
+        :param state:
+            The state of a changelog file.
+        """
+
+    @abc.abstractmethod
+    def flush(self):
+        """Persist all entries and file states saved since last call to this
+        method."""
+
+
+class IVersionFileIndex(abc.ABC):
+    """Interface for storing locations of versions in version files.
+
+    Each location is valid only as long as the version file is not modified
+    by anything else than Bumpify.
+    """
+
+    @abc.abstractmethod
+    def load_location(self, path: str) -> Optional[VersionFileLocation]:
+        """Load location of the version in a version file, or return ``None``
+        if the file was not indexed.
+
+        :param path:
+            Path to a version file.
+        """
+
+    @abc.abstractmethod
+    def save_location(self, location: VersionFileLocation):
+        """Save location of the version in a version file, replacing
+        location previously saved for the same file.
+
+        :param location:
+            The location to save.
+        """
+
+    @abc.abstractmethod
+    def flush(self):
+        """Persist all locations saved since last call to this method."""
@@ -1,8 +1,9 @@
 import dataclasses
 import datetime
 import enum
+import functools
 import re
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from bumpify.core.config.objects import register_section
 from bumpify.core.vcs.objects import Commit, Tag
@@ -10,6 +11,40 @@ from bumpify.model import Model
 
 from . import _constants, _parsing
 
+# Parsing results are cached, as the same tag names and version strings are
+# parsed over and over again (f.e. every release tag on each bump); a new
+# Version object is still created each time as models are mutable.
+_VERSION_CACHE_SIZE = 16384
+
+
+@functools.lru_cache(maxsize=_VERSION_CACHE_SIZE)
+def _parse_version(value: str) -> Optional[Tuple[int, int, int, tuple, Optional[str]]]:
+
+    def to_int_or_to_str(v: str):
+        if v.isnumeric():
+            return int(v)
+        return v
+
+    m = _constants.SEMVER_EXACT_RE.match(value)
+    if m is None:
+        return None
+    prerelease = m.group("prerelease")
+    return (
+        int(m.group("major")),
+        int(m.group("minor")),
+        int(m.group("patch")),
+        tuple(to_int_or_to_str(x) for x in prerelease.split(".")) if prerelease else (),
+        m.group("buildmetadata"),
+    )
+
+
+@functools.lru_cache(maxsize=_VERSION_CACHE_SIZE)
+def _find_version_str(value: str) -> Optional[str]:
+    m = _constants.SEMVER_RE.search(value)
+    if m is None:
+        return None
+    return m.group(0)
+
 
 class VersionComponent(enum.Enum):
     """Enumeration with version component names."""
@@ -20,6 +55,15 @@ class VersionComponent(enum.Enum):
     PATCH = "patch"
 
 
+class ChangeSeverity(enum.IntEnum):
+    """Enumeration with severities of changes that affect the version, ordered
+    from the least to the most severe one."""
+
+    FIX = 1
+    FEAT = 2
+    BREAKING = 3
+
+
 @register_section("semver")
 class SemVerConfig(Model):
     """Model to store semantic versioning configuration."""
@@ -58,7 +102,11 @@ class SemVerConfig(Model):
         #: Path to a changelog file.
         #:
         #: The extension of a file given here determines the format of a
-        #: resulting changelog. The path is relative to project's root directory.
+        #: resulting changelog. Following extensions are supported out of the
+        #: box: ``.md`` (Markdown), ``.json`` (JSON), ``.jsonl`` (JSON Lines)
+        #: and ``.msgpack`` (MessagePack). Other formats can be added using
+        #: :func:`bumpify.core.semver.hooks.changelog_formatters_hook` hook.
+        #: The path is relative to project's root directory.
         path: str
 
         #: Changelog file encoding.
@@ -90,6 +138,19 @@ class SemVerConfig(Model):
         #: When this is given, then a prerelease version will be created.
         prerelease: Optional[str] = None
 
+        def find_component(self, severity: ChangeSeverity) -> VersionComponent:
+            """Find version component to be bumped for a change of given
+            *severity*.
+
+            :param severity:
+                The severity of a change.
+            """
+            if severity == ChangeSeverity.BREAKING:
+                return self.when_breaking
+            if severity == ChangeSeverity.FEAT:
+                return self.when_feat
+            return self.when_fix
+
     #: Current version of a project.
     #:
     #: This will be used as initial version if no releases are made yet, or as
@@ -135,6 +196,14 @@ class SemVerConfig(Model):
     #: generation.
     version_tag_name_template: str = "v{version_str}"
 
+    #: Number of processes to use for parsing commits.
+    #:
+    #: Parsing is done in the current process by default. Setting this to a
+    #: value greater than 1 speeds up changelog generation for repositories
+    #: with long history, as commits are split into chunks parsed in parallel
+    #: by a pool of processes.
+    parse_jobs: int = 1
+
     def find_bump_rule(self, branch: str) -> Optional[BumpRule]:
         """Find bump rule object for given branch name.
 
@@ -170,27 +239,31 @@ class Version(Model):
     buildmetadata: Optional[str] = None
 
     def __lt__(self, other: "Version") -> bool:
-        if self.major != other.major:
-            return self.major < other.major
-        if self.minor != other.minor:
-            return self.minor < other.minor
-        if self.patch != other.patch:
-            return self.patch < other.patch
-        if self.prerelease != other.prerelease:
-            for left, right in zip(self.prerelease, other.prerelease):
-                if left != right:
-                    if isinstance(left, int) and isinstance(right, str):
-                        return True
-                    if isinstance(left, str) and isinstance(right, int):
-                        return False
-                    return left < right
-            return True
-        return False
+        return self.sort_key < other.sort_key
 
     def __gt__(self, other: "Version") -> bool:
-        if self.__eq__(other):
-            return False
-        return not self.__lt__(other)
+        return self.sort_key > other.sort_key
+
+    @property
+    def sort_key(self) -> tuple:
+        """Tuple that orders versions by SemVer precedence when compared with
+        other version's sort key.
+
+        Use it as a key function when sorting many versions, so that keys are
+        computed once per version and compared with plain tuple comparisons.
+        Build metadata is ignored, as required by the SemVer spec.
+        """
+        if not self.prerelease:
+            return self.major, self.minor, self.patch, (1,)
+        prerelease_key = [0]
+        for x in self.prerelease:
+            if isinstance(x, int):
+                prerelease_key.append((0, x))
+            elif x.isdecimal():
+                prerelease_key.append((0, int(x)))
+            else:
+                prerelease_key.append((1, x))
+        return self.major, self.minor, self.patch, tuple(prerelease_key)
 
     def to_str(self) -> str:
         """Convert this model to a semantic version string."""
@@ -300,26 +373,15 @@ class Version(Model):
             String to be parsed.
         """
 
-        def to_int_or_to_str(v: str):
-            if v.isnumeric():
-                return int(v)
-            return v
-
-        m = _constants.SEMVER_EXACT_RE.match(value)
-        if m is None:
+        parsed = _parse_version(value)
+        if parsed is None:
             return None
-        major = m.group("major")
-        minor = m.group("minor")
-        patch = m.group("patch")
-        prerelease = m.group("prerelease")
-        buildmetadata = m.group("buildmetadata")
-        if prerelease is not None:
-            prerelease = [to_int_or_to_str(x) for x in prerelease.split(".")]
-        return Version(
+        major, minor, patch, prerelease, buildmetadata = parsed
+        return Version.construct(
             major=major,
             minor=minor,
             patch=patch,
-            prerelease=prerelease or [],
+            prerelease=list(prerelease),
             buildmetadata=buildmetadata,
         )
 
@@ -338,10 +400,10 @@ class Version(Model):
         :param value:
             The value to extract version from.
         """
-        m = _constants.SEMVER_RE.search(value)
-        if m is None:
+        version_str = _find_version_str(value)
+        if version_str is None:
             return None
-        return cls.from_str(m.group(0))
+        return cls.from_str(version_str)
 
 
 @dataclasses.dataclass
@@ -405,6 +467,18 @@ class ConventionalCommitData(Model):
     #: Placeholder for non breaking change footers parsed from commit message.
     footers: Dict[str, str] = {}
 
+    @property
+    def severity(self) -> Optional[ChangeSeverity]:
+        """Severity of this change, or ``None`` if this change does not affect
+        the version."""
+        if self.breaking_changes:
+            return ChangeSeverity.BREAKING
+        if self.type == "feat":
+            return ChangeSeverity.FEAT
+        if self.type == "fix":
+            return ChangeSeverity.FIX
+        return None
+
     @classmethod
     def from_commit_message(cls, message: str) -> Optional["ConventionalCommitData"]:
         """Parse given commit message into a new instance of
@@ -415,11 +489,10 @@ class ConventionalCommitData(Model):
         :param message:
             Commit message to be parsed.
         """
-        parser = _parsing.ConventionalCommitParser()
-        for line in message.splitlines():
-            if not parser.feed(line):
-                return None
-        return cls(**parser.output())
+        output = _parsing.parse_conventional_commit(message)
+        if output is None:
+            return None
+        return cls.construct(**output)
 
 
 class ConventionalCommit(Model):
@@ -445,7 +518,7 @@ class ConventionalCommit(Model):
         data = ConventionalCommitData.from_commit_message(commit.message)
         if data is None:
             return None
-        return cls(
+        return cls.construct(
             commit=commit,
             data=data,
         )
@@ -481,6 +554,18 @@ class ChangelogEntryData(Model):
                 out.extend(item.data.breaking_changes)
         return out
 
+    @property
+    def severity(self) -> Optional[ChangeSeverity]:
+        """The highest severity of all changes, or ``None`` if there are no
+        changes that affect the version."""
+        if self.breaking_changes:
+            return ChangeSeverity.BREAKING
+        if self.feats:
+            return ChangeSeverity.FEAT
+        if self.fixes:
+            return ChangeSeverity.FIX
+        return None
+
     def is_empty(self) -> bool:
         """Check if this description object contains data."""
         return not self.fixes and not self.feats and not self.others
@@ -566,3 +651,59 @@ class Changelog(Model):
             Changelog entry object.
         """
         self.entries.append(entry)
+
+
+class ChangelogFileState(Model):
+    """Model describing a changelog file as it was last written by Bumpify.
+
+    This allows to update changelog file incrementally, by formatting only
+    entries that are missing in that file.
+    """
+
+    #: Number of changelog entries written to the file.
+    num_entries: int
+
+    #: Version of the newest changelog entry written to the file.
+    version: Version
+
+    #: Encoding of the file.
+    encoding: str
+
+    #: SHA-256 digest of the file's content.
+    #:
+    #: Used to detect if the file was modified since it was last written by
+    #: Bumpify; if so, then the file must be formatted from scratch.
+    digest: str
+
+
+class VersionFileLocation(Model):
+    """Model describing location of the version string in a version file.
+
+    Locations are kept in the version file index, allowing to update version
+    files without searching for the version string, as long as the file has
+    not been modified since it was indexed.
+    """
+
+    #: Configuration of the version file.
+    version_file: SemVerConfig.VersionFile
+
+    #: Version found in the version file.
+    version: Version
+
+    #: Number of the line containing the version (starting from 1).
+    line: int
+
+    #: Byte offset of the line containing the version.
+    offset: int
+
+    #: Length of the line containing the version, in bytes.
+    length: int
+
+    #: Modification time of the version file, in nanoseconds.
+    #:
+    #: Together with :attr:`size`, used to detect if the file was modified
+    #: since it was indexed.
+    mtime_ns: int
+
+    #: Size of the version file, in bytes.
+    size: int
@@ -1,4 +1,10 @@
-from typing import List
+import datetime
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from bumpify import exc, utils
 from bumpify.core.filesystem.interface import IFileSystemReader
@@ -6,10 +12,228 @@ from bumpify.core.vcs import exc as vcs_exc
 from bumpify.core.vcs.interface import IVcsConnector, IVcsReaderWriter
 from bumpify.core.vcs.objects import Commit, Tag
 
+logger = logging.getLogger(__name__)
 
-def _shell_exec(root_dir: str, *args) -> bytes:
+_ENV = {"LANG": "en_GB"}
+
+_LOG_FORMAT = "--format=%H%x00%an%x00%ae%x00%aI%x00%B%x01"
+
+_LOG_CHUNK_SIZE = 64 * 1024
+
+
+def _shell_exec(root_dir: str, *args, env: dict = None) -> bytes:
     with utils.cwd(root_dir):
-        return utils.shell_exec(*args, env={"LANG": "en_GB"})
+        return utils.shell_exec(*args, env=dict(_ENV, **env) if env else _ENV)
+
+
+def _popen(root_dir: str, *args: str, **kwargs) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(_ENV)
+    logger.debug("Starting shell command: %r", args)
+    return subprocess.Popen(args, cwd=root_dir, env=env, **kwargs)
+
+
+def _parse_log_record(raw_commit: bytes) -> Commit:
+    (
+        commit_id,
+        author,
+        author_email,
+        author_date,
+        message,
+    ) = raw_commit.strip().split(b"\x00")
+    return Commit.construct(
+        rev=commit_id.decode(),
+        author=author.decode(),
+        author_email=author_email.decode(),
+        author_date=datetime.datetime.fromisoformat(author_date.decode()),
+        message=message.decode().strip(),
+    )
+
+
+def _iter_records(stream: BinaryIO, separator: bytes) -> Iterator[bytes]:
+    # Split stream into records as soon as these are read
+    buffer = bytearray()
+    while True:
+        chunk = stream.read1(_LOG_CHUNK_SIZE)
+        if not chunk:
+            break
+        start = len(buffer)
+        buffer += chunk
+        begin, end = 0, buffer.find(separator, start)
+        while end != -1:
+            yield bytes(buffer[begin:end])
+            begin = end + 1
+            end = buffer.find(separator, begin)
+        del buffer[:begin]
+
+
+def _iter_log(root_dir: str, rev_range: Optional[str]) -> Iterator[Commit]:
+    """Run ``git log`` for given *rev_range* and yield commits, oldest first,
+    as soon as they are read from its output.
+
+    Yields nothing if Git fails (f.e. when the range is invalid or the
+    repository has no commits yet).
+    """
+    args = ("git", "log", "--reverse", _LOG_FORMAT)
+    if rev_range is not None:
+        args += (rev_range,)
+    process = _popen(root_dir, *args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        for raw_commit in _iter_records(process.stdout, b"\x01"):
+            yield _parse_log_record(raw_commit)
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        returncode = process.wait()
+        if returncode:
+            logger.debug("Shell command %r failed with returncode %d", args, returncode)
+
+
+def _iter_ls_files(root_dir: str, include_untracked: bool) -> Iterator[str]:
+    """Run ``git ls-files`` and yield tracked paths as soon as they are read
+    from its output."""
+    args = ("git", "ls-files", "-z")
+    if include_untracked:
+        args += ("--cached", "--others", "--exclude-standard")
+    # NOTE: STDERR goes to a file, as the process would block if it wrote
+    # more than pipe buffer can hold while STDOUT is being read
+    with tempfile.TemporaryFile() as stderr:
+        process = _popen(root_dir, *args, stdout=subprocess.PIPE, stderr=stderr)
+        completed = False
+        try:
+            for raw_path in _iter_records(process.stdout, b"\x00"):
+                yield os.fsdecode(raw_path)
+            completed = True
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            returncode = process.wait()
+        if completed and returncode:
+            stderr.seek(0)
+            raise exc.ShellCommandError(args, returncode, b"", stderr.read().strip())
+
+
+def _read_parents(root_dir: str, rev_range: str) -> Dict[str, List[str]]:
+    """Return mapping of commits from *rev_range* to lists of their parents."""
+    stdout = _shell_exec(root_dir, "git", "rev-list", "--parents", rev_range).decode()
+    result = {}
+    for line in stdout.splitlines():
+        rev, *parents = line.split()
+        result[rev] = parents
+    return result
+
+
+def _partition_commits(
+    boundaries: List[str], commits: Iterable[Commit], parents: Dict[str, List[str]]
+) -> List[List[Commit]]:
+    """Split *commits* into ``len(boundaries)`` lists, assigning each commit
+    to the list of the oldest boundary commit it is reachable from.
+
+    Commits are assigned by reachability rather than by their position in the
+    log, as commits merged from other branches can be older than the previous
+    boundary.
+
+    See :meth:`IVcsReader.list_commits_partitioned` for details.
+
+    :param boundaries:
+        Commit revisions to split commits by, excluding the first one.
+
+    :param commits:
+        Commits made after the first boundary, from oldest to newest.
+
+    :param parents:
+        Mapping of each commit from *commits* to a list of its parents.
+    """
+    indices = {}
+    for index, rev in enumerate(boundaries):
+        # Ancestors of already assigned commits are assigned as well
+        stack = [rev]
+        while stack:
+            rev = stack.pop()
+            if rev not in indices and rev in parents:
+                indices[rev] = index
+                stack.extend(parents[rev])
+    result = [[] for _ in boundaries]
+    for commit in commits:
+        index = indices.get(commit.rev)
+        if index is not None:
+            result[index].append(commit)
+    return result
+
+
+class _CatFileProcess:
+    """A long-lived ``git cat-file --batch-command`` process.
+
+    It is used to answer object and ref reads through a pipe, without spawning
+    a new Git process for each read. The process is started on first request
+    and lives until :meth:`close` is called.
+
+    :param root_dir:
+        Repository root directory.
+    """
+
+    _args = ("git", "cat-file", "--batch-command")
+
+    def __init__(self, root_dir: str):
+        self._root_dir = root_dir
+        self._process = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> subprocess.Popen:
+        return _popen(
+            self._root_dir,
+            *self._args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _request(self, command: str) -> bytes:
+        if self._process is None:
+            self._process = self._start()
+        try:
+            self._process.stdin.write(command.encode() + b"\n")
+            self._process.stdin.flush()
+            response = self._process.stdout.readline()
+        except BrokenPipeError:
+            response = b""
+        if not response:
+            returncode = self._process.wait()
+            self._process = None
+            raise exc.ShellCommandError(self._args, returncode, b"", b"")
+        return response.rstrip(b"\n")
+
+    def info(self, name: str) -> Optional[Tuple[str, str, int]]:
+        """Return ``(oid, type, size)`` tuple for object given by *name*, or
+        ``None`` if no such object exists.
+
+        Raises :exc:`ShellCommandError` if the process could not be started
+        or has terminated (f.e. when Git is too old to support
+        ``--batch-command``).
+
+        :param name:
+            Object name, f.e. revision, ref name or any other name accepted by
+            ``git rev-parse``.
+        """
+        with self._lock:
+            response = self._request(f"info {name}")
+        parts = response.split(b" ")
+        if len(parts) != 3:
+            return None  # "<name> missing" or "<name> ambiguous"
+        oid, type_, size = parts
+        return oid.decode(), type_.decode(), int(size)
+
+    def close(self):
+        """Terminate the process if it is running."""
+        with self._lock:
+            if self._process is None:
+                return
+            self._process.stdin.close()
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
 
 
 class GitVcsConnector(IVcsConnector):
@@ -50,15 +274,11 @@ class GitVcsConnector(IVcsConnector):
     class _ReaderWriter(IVcsReaderWriter):
         def __init__(self, root_dir: str):
             self._root_dir = root_dir
+            self._cat_file = _CatFileProcess(root_dir)
+            self._initial_rev = None
 
-        def _rev_list(self) -> List[str]:
-            try:
-                stdout = _shell_exec(
-                    self._root_dir, "git", "rev-list", "--reverse", "HEAD"
-                ).decode()
-            except exc.ShellCommandError as e:
-                raise vcs_exc.NoCommitsFound(self._root_dir, original_exc=e)
-            return stdout.split()
+        def close(self):
+            self._cat_file.close()
 
         def current_branch(self) -> str:
             try:
@@ -69,15 +289,44 @@ class GitVcsConnector(IVcsConnector):
                 raise vcs_exc.NoCommitsFound(self._root_dir, original_exc=e)
 
         def find_head_rev(self) -> str:
-            return self._rev_list()[-1]
+            try:
+                maybe_info = self._cat_file.info("HEAD")
+            except exc.ShellCommandError:
+                maybe_info = None
+            else:
+                if maybe_info is None:
+                    raise vcs_exc.NoCommitsFound(self._root_dir)
+                return maybe_info[0]
+            try:
+                return _shell_exec(self._root_dir, "git", "rev-parse", "--verify", "HEAD").decode()
+            except exc.ShellCommandError as e:
+                raise vcs_exc.NoCommitsFound(self._root_dir, original_exc=e)
 
         def find_initial_rev(self) -> str:
-            return self._rev_list()[0]
+            if self._initial_rev is None:
+                try:
+                    stdout = _shell_exec(
+                        self._root_dir, "git", "rev-list", "--max-parents=0", "HEAD"
+                    ).decode()
+                except exc.ShellCommandError as e:
+                    raise vcs_exc.NoCommitsFound(self._root_dir, original_exc=e)
+                # NOTE: There can be more root commits if unrelated histories
+                # were merged; the last one is the oldest
+                self._initial_rev = stdout.split()[-1]
+            return self._initial_rev
 
         def add(self, path: str, *more_paths: str):
             _shell_exec(self._root_dir, "git", "add", path, *more_paths)
 
-        def commit(self, message: str, allow_empty: bool = False) -> str:
+        def reset(self, path: str, *more_paths: str):
+            _shell_exec(self._root_dir, "git", "reset", "-q", "--", path, *more_paths)
+
+        def commit(
+            self, message: str, allow_empty: bool = False, date: datetime.datetime = None
+        ) -> str:
+            env = None
+            if date is not None:
+                env = {"GIT_AUTHOR_DATE": date.isoformat(), "GIT_COMMITTER_DATE": date.isoformat()}
             _shell_exec(
                 self._root_dir,
                 "git",
@@ -85,6 +334,7 @@ class GitVcsConnector(IVcsConnector):
                 "--allow-empty" if allow_empty else None,
                 "-m",
                 message,
+                env=env,
             )
             return self.find_head_rev()
 
@@ -106,8 +356,12 @@ class GitVcsConnector(IVcsConnector):
 
         def checkout(self, rev_or_name: str):
             _shell_exec(self._root_dir, "git", "checkout", rev_or_name)
+            self._initial_rev = None
 
         def list_commits(self, start_rev: str = None, end_rev: str = None) -> List[Commit]:
+            return list(self.iter_commits(start_rev=start_rev, end_rev=end_rev))
+
+        def iter_commits(self, start_rev: str = None, end_rev: str = None) -> Iterator[Commit]:
             def format_range() -> str:
                 if start_rev is not None and end_rev is not None:
                     return f"{start_rev}..{end_rev}"
@@ -116,43 +370,30 @@ class GitVcsConnector(IVcsConnector):
                 if end_rev is not None:
                     return end_rev
 
-            result = []
+            return _iter_log(self._root_dir, format_range())
+
+        def list_commits_partitioned(self, revs: List[str]) -> List[List[Commit]]:
+            if len(revs) < 2:
+                return []
             try:
                 stdout = _shell_exec(
-                    self._root_dir,
-                    "git",
-                    "log",
-                    "--reverse",
-                    "--format=%H%x00%an%x00%ae%x00%aI%x00%B%x01",
-                    format_range(),
+                    self._root_dir, "git", "rev-parse", *(f"{x}^{{commit}}" for x in revs)
                 )
+                revs = stdout.decode().split()
+                rev_range = f"{revs[0]}..{revs[-1]}"
+                parents = _read_parents(self._root_dir, rev_range)
             except exc.ShellCommandError:
-                pass
-            else:
-                for raw_commit in filter(lambda x: x, stdout.split(b"\x01")):
-                    (
-                        commit_id,
-                        author,
-                        author_email,
-                        author_date,
-                        message,
-                    ) = raw_commit.strip().split(b"\x00")
-                    result.append(
-                        Commit(
-                            rev=commit_id,
-                            author=author,
-                            author_email=author_email,
-                            author_date=author_date,
-                            message=message,
-                        )
-                    )
-            return result
+                return [[] for _ in revs[1:]]
+            return _partition_commits(revs[1:], _iter_log(self._root_dir, rev_range), parents)
 
         def list_committed_paths(self, rev: str) -> List[str]:
             stdout = _shell_exec(self._root_dir, "git", "show", "--name-only", rev).decode()
             parts = stdout.split("\n\n")
             return parts[-1].splitlines()
 
+        def list_tracked_paths(self, include_untracked: bool = False) -> Iterator[str]:
+            return _iter_ls_files(self._root_dir, include_untracked)
+
         def list_merged_tags(self, rev: str = None) -> List[Tag]:
             try:
                 stdout = _shell_exec(
@@ -161,7 +402,7 @@ class GitVcsConnector(IVcsConnector):
                     "tag",
                     "-l",
                     "--sort=creatordate",
-                    "--format=%(objectname)\t%(refname:strip=2)\t%(creatordate:iso)",
+                    "--format=%(objectname)\t%(*objectname)\t%(refname:strip=2)\t%(creatordate:iso)",
                     "--merged",
                     rev or "HEAD",
                 )
@@ -171,12 +412,12 @@ class GitVcsConnector(IVcsConnector):
             if not stdout:
                 return result
             for row in stdout.split(b"\n"):
-                rev, name, created = row.split(b"\t")
+                rev, peeled_rev, name, created = row.split(b"\t")
                 # TODO: Check if Git can output strict iso here instead of: YYYY-MM-DD HH:MM:SS Z
                 created_strict = created.replace(b" ", b"T", 1).replace(b" ", b"", 1)
                 result.append(
                     Tag(
-                        rev=rev,
+                        rev=peeled_rev or rev,  # Annotated tags must be peeled to commits
                         name=name,
                         created=created_strict,
                     )
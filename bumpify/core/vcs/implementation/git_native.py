@@ -0,0 +1,742 @@
+import collections
+import datetime
+import functools
+import heapq
+import itertools
+import logging
+import mmap
+import os
+import re
+import struct
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bumpify import exc
+from bumpify.core.vcs import exc as vcs_exc
+from bumpify.core.vcs.implementation.git import GitVcsConnector, _partition_commits
+from bumpify.core.vcs.interface import IVcsReaderWriter
+from bumpify.core.vcs.objects import Commit, Tag
+
+logger = logging.getLogger(__name__)
+
+_HEX_OID_RE = re.compile(r"^[0-9a-f]{40}$")
+
+_PSEUDO_REF_RE = re.compile(r"^[A-Z_]+$")
+
+_PACK_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+
+_OFS_DELTA = 6
+
+_REF_DELTA = 7
+
+_DELTA_BASE_CACHE_SIZE = 256
+
+_WALK_SLOP = 5
+
+
+class _UnsupportedRepository(Exception):
+    """Raised when repository uses a format that cannot be read natively.
+
+    This is never propagated outside of this module; reads fall back to the
+    Git CLI instead.
+    """
+
+
+def _find_git_dir(root_dir: str) -> Optional[str]:
+    path = os.path.abspath(root_dir)
+    while True:
+        candidate = os.path.join(path, ".git")
+        if os.path.isdir(candidate):
+            return candidate
+        if os.path.isfile(candidate):
+            with open(candidate, "r") as fd:
+                value = fd.read().strip()
+            if value.startswith("gitdir:"):
+                return os.path.join(path, value[7:].strip())
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _find_common_dir(git_dir: str) -> str:
+    try:
+        with open(os.path.join(git_dir, "commondir"), "r") as fd:
+            return os.path.join(git_dir, fd.read().strip())
+    except FileNotFoundError:
+        return git_dir
+
+
+def _is_supported(common_dir: str) -> bool:
+    if os.path.isdir(os.path.join(common_dir, "reftable")):
+        return False
+    try:
+        with open(os.path.join(common_dir, "config"), "r") as fd:
+            config = fd.read().lower()
+    except FileNotFoundError:
+        return True
+    return re.search(r"objectformat\s*=\s*sha256", config) is None
+
+
+def _read_size(data: bytes, pos: int) -> Tuple[int, int]:
+    size = shift = 0
+    while True:
+        c = data[pos]
+        pos += 1
+        size |= (c & 0x7F) << shift
+        shift += 7
+        if not c & 0x80:
+            return size, pos
+
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    _, pos = _read_size(delta, 0)
+    size, pos = _read_size(delta, pos)
+    out = bytearray()
+    end = len(delta)
+    while pos < end:
+        cmd = delta[pos]
+        pos += 1
+        if cmd & 0x80:
+            offset = size = 0
+            for i in range(4):
+                if cmd & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if cmd & (1 << (4 + i)):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset : offset + (size or 0x10000)]
+        elif cmd:
+            out += delta[pos : pos + cmd]
+            pos += cmd
+        else:
+            raise _UnsupportedRepository("invalid delta opcode")
+    return bytes(out)
+
+
+def _parse_object(data: bytes) -> Tuple[Dict[bytes, List[bytes]], bytes]:
+    header, _, message = data.partition(b"\n\n")
+    fields = {}
+    for line in header.split(b"\n"):
+        if line.startswith(b" "):
+            continue  # Continuation of a multi-line header, f.e. gpgsig
+        key, _, value = line.partition(b" ")
+        fields.setdefault(key, []).append(value)
+    return fields, message
+
+
+def _parse_ident(value: bytes) -> Tuple[str, str, datetime.datetime]:
+    lt = value.index(b"<")
+    gt = value.rindex(b">")
+    timestamp, tz = value[gt + 1 :].split()
+    minutes = int(tz[1:3]) * 60 + int(tz[3:5])
+    if tz.startswith(b"-"):
+        minutes = -minutes
+    return (
+        value[:lt].strip().decode("utf-8", "replace"),
+        value[lt + 1 : gt].decode("utf-8", "replace"),
+        datetime.datetime.fromtimestamp(
+            int(timestamp), datetime.timezone(datetime.timedelta(minutes=minutes))
+        ),
+    )
+
+
+def _parse_timestamp(value: bytes) -> int:
+    return int(value[value.rindex(b">") + 1 :].split()[0])
+
+
+def _with_cli_fallback(func):
+
+    @functools.wraps(func)
+    def proxy(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        except _UnsupportedRepository as e:
+            logger.warning("Falling back to Git executable: %s", e)
+            return getattr(GitVcsConnector._ReaderWriter, func.__name__)(self, *args, **kwargs)
+
+    return proxy
+
+
+class _Pack:
+    """A single ``.pack`` file with its version 2 ``.idx`` file, both mapped
+    into memory."""
+
+    def __init__(self, idx_path: str, pack_path: str):
+        self._idx = self._map(idx_path)
+        self._pack = self._map(pack_path)
+        if self._idx[:8] != b"\xfftOc\x00\x00\x00\x02":
+            self.close()
+            raise _UnsupportedRepository(f"unsupported pack index format: {idx_path}")
+        self._fanout = struct.unpack(">256I", self._idx[8:1032])
+        count = self._fanout[255]
+        self._names_pos = 1032
+        self._offsets_pos = self._names_pos + 24 * count
+        self._large_offsets_pos = self._offsets_pos + 4 * count
+        self._cache = collections.OrderedDict()
+
+    @staticmethod
+    def _map(path: str) -> mmap.mmap:
+        with open(path, "rb") as fd:
+            return mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def find(self, oid: bytes) -> Optional[int]:
+        """Return offset of object *oid* in the pack, or ``None`` if the pack
+        does not contain it."""
+        first = oid[0]
+        lo = self._fanout[first - 1] if first else 0
+        hi = self._fanout[first]
+        idx = self._idx
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = self._names_pos + 20 * mid
+            name = idx[pos : pos + 20]
+            if name < oid:
+                lo = mid + 1
+            elif name > oid:
+                hi = mid
+            else:
+                pos = self._offsets_pos + 4 * mid
+                (offset,) = struct.unpack(">I", idx[pos : pos + 4])
+                if offset & 0x80000000:
+                    pos = self._large_offsets_pos + 8 * (offset & 0x7FFFFFFF)
+                    (offset,) = struct.unpack(">Q", idx[pos : pos + 8])
+                return offset
+        return None
+
+    def read(self, offset: int, store: "_ObjectStore") -> Tuple[str, bytes]:
+        """Read object stored at given *offset*, resolving delta chains.
+
+        :param store:
+            Object store to look up ``REF_DELTA`` bases in.
+        """
+        deltas = []
+        while True:
+            cached = self._cache.get(offset)
+            if cached is not None:
+                type_name, data = cached
+                break
+            type_, pos, size = self._read_header(offset)
+            if type_ == _OFS_DELTA:
+                c = self._pack[pos]
+                pos += 1
+                base_distance = c & 0x7F
+                while c & 0x80:
+                    c = self._pack[pos]
+                    pos += 1
+                    base_distance = ((base_distance + 1) << 7) | (c & 0x7F)
+                deltas.append((offset, self._inflate(pos, size)))
+                offset -= base_distance
+            elif type_ == _REF_DELTA:
+                base_oid = self._pack[pos : pos + 20]
+                deltas.append((offset, self._inflate(pos + 20, size)))
+                found = store.read(base_oid.hex())
+                if found is None:
+                    raise _UnsupportedRepository(f"missing delta base: {base_oid.hex()}")
+                type_name, data = found
+                break
+            elif type_ in _PACK_TYPES:
+                type_name, data = _PACK_TYPES[type_], self._inflate(pos, size)
+                break
+            else:
+                raise _UnsupportedRepository(f"invalid pack object type: {type_}")
+        if deltas:
+            self._remember(offset, type_name, data)
+        for delta_offset, delta in reversed(deltas):
+            data = _apply_delta(data, delta)
+            self._remember(delta_offset, type_name, data)
+        return type_name, data
+
+    def _remember(self, offset: int, type_name: str, data: bytes):
+        self._cache[offset] = type_name, data
+        self._cache.move_to_end(offset)
+        if len(self._cache) > _DELTA_BASE_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _read_header(self, offset: int) -> Tuple[int, int, int]:
+        pack = self._pack
+        c = pack[offset]
+        pos = offset + 1
+        type_ = (c >> 4) & 0x7
+        size = c & 0xF
+        shift = 4
+        while c & 0x80:
+            c = pack[pos]
+            pos += 1
+            size |= (c & 0x7F) << shift
+            shift += 7
+        return type_, pos, size
+
+    def _inflate(self, pos: int, size: int) -> bytes:
+        decompressor = zlib.decompressobj()
+        chunks = []
+        chunk_size = size + 64
+        while not decompressor.eof:
+            compressed = self._pack[pos : pos + chunk_size]
+            if not compressed:
+                raise _UnsupportedRepository("truncated pack file")
+            chunks.append(decompressor.decompress(compressed))
+            pos += len(compressed)
+            chunk_size = 4096
+        return b"".join(chunks)
+
+    def close(self):
+        self._idx.close()
+        self._pack.close()
+
+
+class _ObjectStore:
+    """Read-only access to loose and packed objects of a Git repository."""
+
+    def __init__(self, objects_dir: str):
+        self._objects_dirs = [objects_dir]
+        self._objects_dirs.extend(self._read_alternates(objects_dir))
+        self._packs: Dict[str, _Pack] = {}
+        self._packs_scanned = False
+
+    @staticmethod
+    def _read_alternates(objects_dir: str) -> List[str]:
+        try:
+            with open(os.path.join(objects_dir, "info", "alternates"), "r") as fd:
+                lines = fd.read().splitlines()
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(objects_dir, line)
+            for line in lines
+            if line.strip() and not line.startswith("#")
+        ]
+
+    def _scan_packs(self) -> bool:
+        found_new = False
+        for objects_dir in self._objects_dirs:
+            pack_dir = os.path.join(objects_dir, "pack")
+            try:
+                names = os.listdir(pack_dir)
+            except FileNotFoundError:
+                continue
+            for name in names:
+                if not name.endswith(".idx"):
+                    continue
+                idx_path = os.path.join(pack_dir, name)
+                pack_path = idx_path[:-4] + ".pack"
+                if idx_path in self._packs or not os.path.isfile(pack_path):
+                    continue
+                self._packs[idx_path] = _Pack(idx_path, pack_path)
+                found_new = True
+        self._packs_scanned = True
+        return found_new
+
+    def _read_packed(self, oid: bytes) -> Optional[Tuple[str, bytes]]:
+        for pack in self._packs.values():
+            offset = pack.find(oid)
+            if offset is not None:
+                return pack.read(offset, self)
+        return None
+
+    def _read_loose(self, oid: str) -> Optional[Tuple[str, bytes]]:
+        for objects_dir in self._objects_dirs:
+            try:
+                with open(os.path.join(objects_dir, oid[:2], oid[2:]), "rb") as fd:
+                    raw = zlib.decompress(fd.read())
+            except FileNotFoundError:
+                continue
+            header, _, data = raw.partition(b"\x00")
+            return header.split(b" ", 1)[0].decode(), data
+        return None
+
+    def read(self, oid: str) -> Optional[Tuple[str, bytes]]:
+        """Return ``(type, data)`` tuple for object *oid*, or ``None`` if it
+        was not found."""
+        if not self._packs_scanned:
+            self._scan_packs()
+        raw_oid = bytes.fromhex(oid)
+        found = self._read_packed(raw_oid) or self._read_loose(oid)
+        if found is None and self._scan_packs():
+            found = self._read_packed(raw_oid)  # Objects were repacked meanwhile
+        return found
+
+    def close(self):
+        for pack in self._packs.values():
+            pack.close()
+        self._packs.clear()
+        self._packs_scanned = False
+
+
+class _RefStore:
+    """Read-only access to loose and packed refs of a Git repository."""
+
+    def __init__(self, git_dir: str, common_dir: str):
+        self._git_dir = git_dir
+        self._common_dir = common_dir
+        self._packed_refs_stat = None
+        self._packed_refs: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    def _ref_path(self, name: str) -> str:
+        if name.startswith("refs/"):
+            return os.path.join(self._common_dir, name)
+        return os.path.join(self._git_dir, name)
+
+    def _read_loose(self, name: str) -> Optional[str]:
+        try:
+            with open(self._ref_path(name), "r") as fd:
+                return fd.read().strip()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+
+    def packed(self) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Return mapping of packed ref names to ``(oid, peeled_oid)`` tuples.
+
+        The file is read again only if it has changed since last call.
+        """
+        path = os.path.join(self._common_dir, "packed-refs")
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._packed_refs_stat, self._packed_refs = None, {}
+            return self._packed_refs
+        stat_key = st.st_mtime_ns, st.st_size, st.st_ino
+        if stat_key == self._packed_refs_stat:
+            return self._packed_refs
+        result = {}
+        last_name = None
+        with open(path, "r") as fd:
+            for line in fd:
+                line = line.rstrip("\n")
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("^"):
+                    if last_name is not None:
+                        result[last_name] = result[last_name][0], line[1:]
+                    continue
+                oid, last_name = line.split(" ", 1)
+                result[last_name] = oid, None
+        self._packed_refs_stat, self._packed_refs = stat_key, result
+        return result
+
+    def read_symbolic(self, name: str) -> Optional[str]:
+        """Return name of a ref that symbolic ref *name* points to, or
+        ``None`` if *name* is not a symbolic ref."""
+        value = self._read_loose(name)
+        if value is not None and value.startswith("ref:"):
+            return value[4:].strip()
+        return None
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Resolve ref *name* (following symbolic refs) to an object ID, or
+        return ``None`` if the ref does not exist."""
+        for _ in range(10):
+            value = self._read_loose(name)
+            if value is None:
+                packed = self.packed().get(name)
+                return packed[0] if packed is not None else None
+            if not value.startswith("ref:"):
+                return value
+            name = value[4:].strip()
+        return None
+
+    def list(self, prefix: str) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Return mapping of names of refs starting with *prefix* to
+        ``(oid, peeled_oid)`` tuples.
+
+        Peeled object ID is only known for some packed refs; it is ``None``
+        otherwise.
+        """
+        result = {k: v for k, v in self.packed().items() if k.startswith(prefix)}
+        base_dir = self._ref_path(prefix)
+        for dirpath, _, filenames in os.walk(base_dir):
+            for filename in filenames:
+                abspath = os.path.join(dirpath, filename)
+                name = prefix + os.path.relpath(abspath, base_dir).replace(os.sep, "/")
+                oid = self.resolve(name)
+                if oid is not None:
+                    result[name] = oid, None
+        return result
+
+
+class NativeGitVcsConnector(GitVcsConnector):
+    """Implementation of the Git repository connector that reads repository
+    data directly from Git's on-disk files instead of running Git commands.
+
+    Refs, packed refs, loose objects and pack files are parsed in-process,
+    so read operations do not spawn any subprocesses. Write operations are
+    still delegated to Git executable, just like in :class:`GitVcsConnector`.
+
+    Repositories using formats that are not supported by the native reader
+    (f.e. SHA-256 object names or reftable ref storage) are transparently
+    handled by Git executable instead.
+    """
+
+    def exists(self) -> bool:
+        return _find_git_dir(self._root_dir) is not None
+
+    def connect(self) -> IVcsReaderWriter:
+        root_dir = self._root_dir
+        git_dir = _find_git_dir(root_dir)
+        if git_dir is None:
+            raise vcs_exc.RepositoryDoesNotExist(root_dir)
+        common_dir = _find_common_dir(git_dir)
+        if not _is_supported(common_dir):
+            logger.info("Repository format not supported natively; using Git executable instead")
+            return self._ReaderWriter(root_dir)
+        return self._NativeReaderWriter(root_dir, git_dir, common_dir)
+
+    class _NativeReaderWriter(GitVcsConnector._ReaderWriter):
+
+        def __init__(self, root_dir: str, git_dir: str, common_dir: str):
+            super().__init__(root_dir)
+            self._objects = _ObjectStore(os.path.join(common_dir, "objects"))
+            self._refs = _RefStore(git_dir, common_dir)
+            self._shallow_path = os.path.join(common_dir, "shallow")
+            self._commit_headers: Dict[str, Tuple[int, List[str]]] = {}
+
+        def close(self):
+            self._objects.close()
+            super().close()
+
+        def _read_shallow(self) -> frozenset:
+            try:
+                with open(self._shallow_path, "r") as fd:
+                    return frozenset(fd.read().split())
+            except FileNotFoundError:
+                return frozenset()
+
+        def _resolve(self, rev: str) -> Optional[str]:
+            if _HEX_OID_RE.match(rev):
+                return rev
+            if ".." not in rev and not rev.startswith("/"):
+                candidates = [f"refs/{rev}", f"refs/tags/{rev}", f"refs/heads/{rev}"]
+                if rev.startswith("refs/") or _PSEUDO_REF_RE.match(rev):
+                    candidates.insert(0, rev)
+                for candidate in candidates:
+                    oid = self._refs.resolve(candidate)
+                    if oid is not None:
+                        return oid
+            try:
+                maybe_info = self._cat_file.info(rev)
+            except exc.ShellCommandError:
+                return None
+            return maybe_info[0] if maybe_info is not None else None
+
+        def _peel(self, oid: str) -> Optional[Tuple[str, bytes]]:
+            while True:
+                found = self._objects.read(oid)
+                if found is None:
+                    return None
+                type_name, data = found
+                if type_name == "commit":
+                    return oid, data
+                if type_name != "tag":
+                    return None
+                fields, _ = _parse_object(data)
+                oid = fields[b"object"][0].decode()
+
+        def _read_commit_header(
+            self, oid: str, shallow: frozenset
+        ) -> Optional[Tuple[int, List[str]]]:
+            header = self._commit_headers.get(oid)
+            if header is None:
+                found = self._objects.read(oid)
+                if found is None or found[0] != "commit":
+                    return None
+                fields, _ = _parse_object(found[1])
+                parents = [] if oid in shallow else [x.decode() for x in fields.get(b"parent", [])]
+                header = _parse_timestamp(fields[b"committer"][0]), parents
+                self._commit_headers[oid] = header
+            return header
+
+        def _walk(self, include: Iterable[str], exclude: Iterable[str] = tuple()) -> List[str]:
+            """Return list of commits reachable from *include* but not from
+            *exclude*, in order Git would list them by default (newest
+            first)."""
+
+            def push(oid: str, uninteresting: bool):
+                if oid in seen:
+                    if uninteresting and not seen[oid]:
+                        mark_uninteresting(oid)
+                    return
+                header = self._read_commit_header(oid, shallow)
+                if header is None:
+                    return
+                seen[oid] = uninteresting
+                heapq.heappush(queue, (-header[0], next(counter), oid))
+
+            def mark_uninteresting(oid: str):
+                stack = [oid]
+                while stack:
+                    oid = stack.pop()
+                    seen[oid] = True
+                    if oid in popped:
+                        stack.extend(
+                            p for p in self._commit_headers[oid][1] if not seen.get(p, True)
+                        )
+
+            shallow = self._read_shallow()
+            seen: Dict[str, bool] = {}
+            popped: Dict[str, None] = {}
+            queue: list = []
+            counter = itertools.count()
+            for oid in exclude:
+                push(oid, True)
+            for oid in include:
+                push(oid, False)
+            slop = _WALK_SLOP
+            while queue:
+                if all(seen[oid] for _, _, oid in queue):
+                    slop -= 1
+                    if slop == 0:
+                        break
+                else:
+                    slop = _WALK_SLOP
+                _, _, oid = heapq.heappop(queue)
+                popped[oid] = None
+                for parent in self._commit_headers[oid][1]:
+                    push(parent, seen[oid])
+            return [oid for oid in popped if not seen[oid]]
+
+        def _make_commit(self, oid: str) -> Commit:
+            _, data = self._objects.read(oid)
+            fields, message = _parse_object(data)
+            author, author_email, author_date = _parse_ident(fields[b"author"][0])
+            return Commit.construct(
+                rev=oid,
+                author=author,
+                author_email=author_email,
+                author_date=author_date,
+                message=message.decode("utf-8", "replace").strip(),
+            )
+
+        def _list_commits(self, start_rev: str = None, end_rev: str = None) -> Optional[List[str]]:
+            revs = [end_rev or "HEAD"] if start_rev is None else [end_rev or "HEAD", start_rev]
+            peeled = []
+            for rev in revs:
+                oid = self._resolve(rev)
+                found = None if oid is None else self._peel(oid)
+                if found is None:
+                    return None
+                peeled.append(found[0])
+            return self._walk(peeled[:1], peeled[1:])[::-1]
+
+        def _find_reachable(self, start_oid: str, oids: Iterable[str]) -> set:
+            shallow = self._read_shallow()
+            wanted = set(oids)
+            found = set()
+            visited = set()
+            stack = [start_oid]
+            while stack and wanted:
+                oid = stack.pop()
+                if oid in visited:
+                    continue
+                visited.add(oid)
+                if oid in wanted:
+                    wanted.remove(oid)
+                    found.add(oid)
+                header = self._read_commit_header(oid, shallow)
+                if header is not None:
+                    stack.extend(header[1])
+            return found
+
+        @_with_cli_fallback
+        def current_branch(self) -> str:
+            target = self._refs.read_symbolic("HEAD")
+            if self._refs.resolve("HEAD") is None:
+                raise vcs_exc.NoCommitsFound(self._root_dir)
+            if target is None:
+                return "HEAD"
+            if target.startswith("refs/heads/"):
+                return target[len("refs/heads/") :]
+            return target
+
+        @_with_cli_fallback
+        def find_head_rev(self) -> str:
+            oid = self._refs.resolve("HEAD")
+            if oid is None:
+                raise vcs_exc.NoCommitsFound(self._root_dir)
+            return oid
+
+        @_with_cli_fallback
+        def find_initial_rev(self) -> str:
+            if self._initial_rev is None:
+                head = self._refs.resolve("HEAD")
+                peeled = None if head is None else self._peel(head)
+                if peeled is None:
+                    raise vcs_exc.NoCommitsFound(self._root_dir)
+                roots = [x for x in self._walk([peeled[0]]) if not self._commit_headers[x][1]]
+                self._initial_rev = roots[-1]
+            return self._initial_rev
+
+        @_with_cli_fallback
+        def iter_commits(self, start_rev: str = None, end_rev: str = None) -> Iterator[Commit]:
+            oids = self._list_commits(start_rev=start_rev, end_rev=end_rev)
+            return self._iter_commits(oids or [], start_rev, end_rev)
+
+        def _iter_commits(
+            self, oids: List[str], start_rev: Optional[str], end_rev: Optional[str]
+        ) -> Iterator[Commit]:
+            # Commit objects are read lazily, so unsupported objects can only
+            # be found during iteration; these are handled by Git executable,
+            # continuing after the last commit that was already yielded
+            for i, oid in enumerate(oids):
+                try:
+                    commit = self._make_commit(oid)
+                except _UnsupportedRepository as e:
+                    logger.warning("Falling back to Git executable: %s", e)
+                    commits = GitVcsConnector._ReaderWriter.iter_commits(
+                        self, start_rev=start_rev, end_rev=end_rev
+                    )
+                    if i > 0:
+                        commits = itertools.dropwhile(lambda x: x.rev != oids[i - 1], commits)
+                        next(commits, None)
+                    yield from commits
+                    return
+                yield commit
+
+        @_with_cli_fallback
+        def list_commits_partitioned(self, revs: List[str]) -> List[List[Commit]]:
+            if len(revs) < 2:
+                return []
+            peeled = []
+            for rev in revs:
+                oid = self._resolve(rev)
+                found = None if oid is None else self._peel(oid)
+                if found is None:
+                    return [[] for _ in revs[1:]]
+                peeled.append(found[0])
+            oids = self._walk(peeled[-1:], peeled[:1])[::-1]
+            parents = {x: self._commit_headers[x][1] for x in oids}
+            return _partition_commits(peeled[1:], (self._make_commit(x) for x in oids), parents)
+
+        @_with_cli_fallback
+        def list_merged_tags(self, rev: str = None) -> List[Tag]:
+            oid = self._resolve(rev or "HEAD")
+            peeled = None if oid is None else self._peel(oid)
+            if peeled is None:
+                return []
+            candidates = {}
+            for name, (oid, peeled_oid) in self._refs.list("refs/tags/").items():
+                found = self._objects.read(oid)
+                if found is None:
+                    continue
+                type_name, data = found
+                if type_name == "tag":
+                    fields, _ = _parse_object(data)
+                    _, _, created = _parse_ident(fields[b"tagger"][0])
+                    target = self._peel(peeled_oid or oid)
+                elif type_name == "commit":
+                    fields, _ = _parse_object(data)
+                    _, _, created = _parse_ident(fields[b"committer"][0])
+                    target = oid, data
+                else:
+                    continue
+                if target is not None:
+                    candidates[name] = oid, target[0], created
+            reachable = self._find_reachable(peeled[0], (x[1] for x in candidates.values()))
+            result = [
+                Tag.construct(rev=target, name=name[len("refs/tags/") :], created=created)
+                for name, (_, target, created) in candidates.items()
+                if target in reachable
+            ]
+            result.sort(key=lambda x: (x.created.timestamp(), x.name))
+            return result
@@ -1,3 +1,5 @@
+import datetime
+
 from bumpify.core.console.interface import IConsoleOutput
 from bumpify.core.console.objects import Severity, Styled
 from bumpify.core.vcs.helpers import make_dummy_rev
@@ -24,6 +26,17 @@ class DryRunVcsReaderWriterProxy(IVcsWriter):
                 Styled(path, bold=True),
             )
 
+    def reset(self, *paths: str):
+        reset = Styled("reset", bold=True)
+        for path in paths:
+            self._cout.emit(
+                Severity.INFO,
+                "Would",
+                reset,
+                "following file in the index:",
+                Styled(path, bold=True),
+            )
+
     def branch(self, name: str):
         create = Styled("create", bold=True)
         name = Styled(name, bold=True)
@@ -35,7 +48,9 @@ class DryRunVcsReaderWriterProxy(IVcsWriter):
         rev_or_name = Styled(rev_or_name, bold=True)
         self._cout.emit(Severity.INFO, "Would", checkout, "HEAD at", rev_or_name)
 
-    def commit(self, message: str, allow_empty: bool = False) -> str:
+    def commit(
+        self, message: str, allow_empty: bool = False, date: datetime.datetime = None
+    ) -> str:
         result = make_dummy_rev(message)
         commit = Styled("commit", bold=True)
         message = Styled(message, bold=True)
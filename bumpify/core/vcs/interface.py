@@ -1,4 +1,5 @@
 import abc
+import datetime
 import typing
 
 from .objects import Commit, Tag
@@ -40,6 +41,47 @@ class IVcsReader(abc.ABC):
             End revision (inclusive).
         """
 
+    @abc.abstractmethod
+    def iter_commits(self, start_rev: str = None, end_rev: str = None) -> typing.Iterator[Commit]:
+        """Same as :meth:`list_commits`, but return an iterator that yields
+        commits one by one, as they are read from the repository.
+
+        This should be preferred over :meth:`list_commits` when commits are
+        only needed to be processed once, as memory used does not grow with
+        the number of commits.
+
+        :param start_rev:
+            See :meth:`list_commits`.
+
+        :param end_rev:
+            See :meth:`list_commits`.
+        """
+
+    @abc.abstractmethod
+    def list_commits_partitioned(self, revs: typing.List[str]) -> typing.List[typing.List[Commit]]:
+        """Return commits made between each two consecutive revisions from
+        *revs*, reading the history only once.
+
+        This is a bulk version of :meth:`list_commits`, meant to be used when
+        commits for many adjacent ranges are needed (f.e. for each pair of
+        version tags). For ``N`` revisions given, ``N - 1`` lists are returned,
+        with list at index ``i`` containing commits from ``(revs[i], revs[i +
+        1]]`` range, ordered by creation time in ascending order.
+
+        Each commit is assigned to the first range it belongs to, so commits
+        merged from other branches are listed in the range of the revision
+        they were merged before, even if those were created earlier than the
+        previous revision.
+
+        Returns empty list if less than two revisions were given.
+
+        :param revs:
+            List of revisions to split commits by.
+
+            It is assumed that each revision is reachable from the next one
+            (f.e. revisions of version tags sorted in ascending order).
+        """
+
     @abc.abstractmethod
     def list_committed_paths(self, rev: str) -> typing.List[str]:
         """List paths that were modified in commit given by *rev*.
@@ -48,6 +90,19 @@ class IVcsReader(abc.ABC):
             Commit revision.
         """
 
+    @abc.abstractmethod
+    def list_tracked_paths(self, include_untracked: bool = False) -> typing.Iterator[str]:
+        """Generate paths of files tracked by the VCS, relative to the project
+        root directory.
+
+        This is usually much faster than scanning the filesystem, as ignored
+        files and directories are never visited.
+
+        :param include_untracked:
+            Also generate paths of files that are not tracked yet, but are
+            not ignored either.
+        """
+
     @abc.abstractmethod
     def list_merged_tags(self, rev: str = None) -> typing.List[Tag]:
         """List all tags reachable from given *rev* or ``HEAD`` if *rev* is
@@ -73,7 +128,23 @@ class IVcsWriter(abc.ABC):
         """
 
     @abc.abstractmethod
-    def commit(self, message: str, allow_empty: bool = False) -> str:
+    def reset(self, *paths: str):
+        """Undo adding files to be committed.
+
+        This is the opposite of :meth:`add`; the index is restored to the
+        state from current HEAD for given paths, leaving files in the working
+        tree untouched.
+
+        :param `*paths`:
+            Paths to be removed from the index.
+
+            These must be paths relative to repository root dir.
+        """
+
+    @abc.abstractmethod
+    def commit(
+        self, message: str, allow_empty: bool = False, date: datetime.datetime = None
+    ) -> str:
         """Commit previously added files to the VCS repository and return
         revision of a newly created commit.
 
@@ -86,6 +157,12 @@ class IVcsWriter(abc.ABC):
             Allow creating commit object without any tree changes.
 
             .. note:: This is mostly useful for testing.
+
+        :param date:
+            Optional date to record in the commit instead of current date.
+
+            Tags created later for this commit will report this date as
+            their creation date.
         """
 
     @abc.abstractmethod
@@ -119,6 +196,14 @@ class IVcsWriter(abc.ABC):
 class IVcsReaderWriter(IVcsReader, IVcsWriter):
     """A read-write interface to interact with underlying VCS repository."""
 
+    @abc.abstractmethod
+    def close(self):
+        """Close connection with the repository, releasing all resources
+        acquired by this object.
+
+        This object must not be used once this method is called.
+        """
+
 
 class IVcsConnector(abc.ABC):
     """An entry point interface to access VCS repository."""
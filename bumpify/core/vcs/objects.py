@@ -16,6 +16,7 @@ class VCSConfig(Model):
 
         AUTO = "auto"
         GIT = "git"
+        GIT_NATIVE = "git-native"
 
     #: VCS type.
     type: Type
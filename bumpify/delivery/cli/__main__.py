@@ -2,15 +2,16 @@ import os
 
 import click
 from click_help_colors import HelpColorsGroup
-from pydio.api import Injector
 from pydio.base import IInjector
 
 from bumpify import __version__, utils
-from bumpify.core.api.interface import IBumpCommand, IInitCommand
-from bumpify.di import provider
 
 from .decorators import catch_errors
 
+# NOTE: Imports of DI providers and core modules are deferred until a command
+# is actually executed to keep startup time low, as options like --version or
+# --help do not need any of these.
+
 
 @click.group(
     cls=HelpColorsGroup,
@@ -35,9 +36,49 @@ from .decorators import catch_errors
 @click.option(
     "-n", "--dry-run", is_flag=True, help="Print what would be done without doing anything"
 )
+@click.option(
+    "--cache-dir",
+    default=".git/bumpify",
+    show_default=True,
+    type=click.Path(file_okay=False),
+    help="Path to the directory where cache files are stored.\n\nThis is relative to current working directory.",
+)
+@click.option("--no-cache", is_flag=True, help="Disable caching.")
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of processes to use for parsing commits.\n\nOverrides `parse_jobs` setting from the config file.",
+)
+@click.option(
+    "--fsync",
+    is_flag=True,
+    help="Flush modified files to the storage device before creating version bump commit.",
+)
+@click.option(
+    "--profile-hooks",
+    is_flag=True,
+    help="Measure execution time of hooks and report it once the command is done.",
+)
+@click.option(
+    "--profile-hooks-json",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write hook execution statistics to given file in JSON format.\n\nThis implies --profile-hooks.",
+)
 @click.version_option(__version__)
 @click.pass_context
-def bumpify(ctx: click.Context, config_file_path: str, config_file_encoding: str, dry_run: bool):
+def bumpify(
+    ctx: click.Context,
+    config_file_path: str,
+    config_file_encoding: str,
+    dry_run: bool,
+    cache_dir: str,
+    no_cache: bool,
+    jobs: int,
+    fsync: bool,
+    profile_hooks: bool,
+    profile_hooks_json: str,
+):
     """Automated semantic versioning and changelog generation for software
     projects.
 
@@ -53,12 +94,21 @@ def bumpify(ctx: click.Context, config_file_path: str, config_file_encoding: str
 
         https://semver.org/
     """
+    from pydio.api import Injector
+
+    from bumpify.di import provider
+
     injector = Injector(provider)
     bumpify_context = utils.inject_context(injector)
     bumpify_context.project_root_dir = os.getcwd()
     bumpify_context.config_file_path = config_file_path
     bumpify_context.config_file_encoding = config_file_encoding
     bumpify_context.dry_run = dry_run
+    bumpify_context.cache_dir = None if no_cache else cache_dir
+    bumpify_context.jobs = jobs
+    bumpify_context.fsync = fsync
+    bumpify_context.profile_hooks = profile_hooks
+    bumpify_context.profile_hooks_json = profile_hooks_json
     ctx.obj = ctx.with_resource(injector)
 
 
@@ -67,6 +117,8 @@ def bumpify(ctx: click.Context, config_file_path: str, config_file_encoding: str
 @catch_errors
 def init(injector: IInjector):
     """Initialize Bumpify for the current project."""
+    from bumpify.core.api.interface import IInitCommand
+
     command = utils.inject_type(injector, IInitCommand)
     provider = utils.inject_type(injector, IInitCommand.IInitProvider)
     presenter = utils.inject_type(injector, IInitCommand.IInitPresenter)
@@ -74,19 +126,67 @@ def init(injector: IInjector):
 
 
 @bumpify.command()
+@click.option(
+    "--rollback",
+    is_flag=True,
+    help="Restore files left modified by previously interrupted bump before bumping.",
+)
 @click.pass_obj
 @catch_errors
-def bump(injector: IInjector):
+def bump(injector: IInjector, rollback: bool):
     """Create new release of the current project.
 
     This command analyzes severity of recent changes and based on that
     determines which version component should be bumped. Once new version is
     calculated, the command then updates version and changelog files, and makes
     a bump commit, which finally is tagged with a newly calculated version tag.
+
+    If previous bump was interrupted before making the bump commit, then the
+    files it modified are reported and this command does nothing, unless
+    --rollback option is given. Interrupted bump can only be detected if
+    caching is enabled.
     """
+    from bumpify.core.api.interface import IBumpCommand
+
     command = utils.inject_type(injector, IBumpCommand)
     presenter = utils.inject_type(injector, IBumpCommand.IBumpPresenter)
-    command.bump(presenter)
+    command.bump(presenter, rollback=rollback)
+
+
+@bumpify.command()
+@click.pass_obj
+@catch_errors
+def next_version(injector: IInjector):
+    """Show the version the next bump would create.
+
+    This command only analyzes severity of changes made since the most recent
+    version tag and stops as soon as a breaking change is found. Nothing is
+    modified, so it is safe to be called f.e. on each pull request.
+    """
+    from bumpify.core.api.interface import INextVersionCommand
+
+    command = utils.inject_type(injector, INextVersionCommand)
+    presenter = utils.inject_type(injector, INextVersionCommand.INextVersionPresenter)
+    command.next_version(presenter)
+
+
+@bumpify.command()
+@click.pass_obj
+@catch_errors
+def discover(injector: IInjector):
+    """Find version files in the current project.
+
+    This command scans the project for known version files (like
+    pyproject.toml, package.json, Cargo.toml or __init__.py with __version__)
+    and shows where the version was found in each of them, warning about
+    files that are missing in the config file. Found locations are also
+    cached to speed up updating those files on bump.
+    """
+    from bumpify.core.api.interface import IDiscoverCommand
+
+    command = utils.inject_type(injector, IDiscoverCommand)
+    presenter = utils.inject_type(injector, IDiscoverCommand.IDiscoverPresenter)
+    command.discover(presenter)
 
 
 def main():
@@ -4,15 +4,16 @@ import sys
 from pydio.base import IInjector
 
 from bumpify import exc, utils
-from bumpify.core.console import helpers as console_helpers
-from bumpify.core.console.interface import IConsoleOutput
-from bumpify.core.console.objects import Severity, Styled
 
 
 def catch_errors(func):
 
     @functools.wraps(func)
     def proxy(injector: IInjector, *args, **kwargs):
+        from bumpify.core.console import helpers as console_helpers
+        from bumpify.core.console.interface import IConsoleOutput
+        from bumpify.core.console.objects import Severity
+
         cout = utils.inject_type(injector, IConsoleOutput)
         try:
             func(injector, *args, **kwargs)
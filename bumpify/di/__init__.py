@@ -1,17 +1,78 @@
-from pydio.api import Provider
+import importlib
+import threading
+import typing
+from typing import Hashable, List, Optional
+
+from pydio.api import Provider, Variant
 
 from bumpify.context import Context
 
-from . import api, config, console, filesystem, hook, semver, vcs
 
-provider = Provider()
-provider.attach(api.provider)
-provider.attach(config.provider)
-provider.attach(semver.provider)
-provider.attach(filesystem.provider)
-provider.attach(vcs.provider)
-provider.attach(console.provider)
-provider.attach(hook.provider)
+class _LazyProvider(Provider):
+    """Provider that imports and attaches subsystem providers on demand.
+
+    Each subsystem provider module is imported only when a key belonging to
+    that subsystem is requested for the first time, so commands that do not
+    use some subsystem do not pay the cost of importing it.
+
+    :param module_names:
+        Names of modules with subsystem providers.
+
+        Each module must be named after the subsystem it provides objects
+        for, i.e. ``bumpify.di.semver`` provides objects for keys declared in
+        ``bumpify.core.semver`` package.
+    """
+
+    def __init__(self, module_names: List[str]):
+        super().__init__()
+        self._pending_module_names = list(module_names)
+        self._attach_lock = threading.RLock()
+
+    def get(self, key, env=None):
+        found = super().get(key, env)
+        if found is not None:
+            return found
+        with self._attach_lock:
+            subsystem = self._find_subsystem(key)
+            module_names = [x for x in self._pending_module_names if x.endswith(f".{subsystem}")]
+            for module_name in module_names + list(self._pending_module_names):
+                found = super().get(key, env)
+                if found is not None:
+                    return found
+                self._attach_module(module_name)
+            return super().get(key, env)
+
+    def _attach_module(self, module_name: str):
+        if module_name not in self._pending_module_names:
+            return
+        module = importlib.import_module(module_name)
+        self.attach(module.provider)
+        self._pending_module_names.remove(module_name)
+
+    @staticmethod
+    def _find_subsystem(key: Hashable) -> Optional[str]:
+        if isinstance(key, Variant):
+            key = key.key
+        args = typing.get_args(key)
+        if args:
+            key = args[-1]  # Config sections are provided by the subsystem owning the section
+        parts = getattr(key, "__module__", "").split(".")
+        if len(parts) > 2 and parts[:2] == ["bumpify", "core"]:
+            return parts[2]
+        return None
+
+
+provider = _LazyProvider(
+    [
+        "bumpify.di.api",
+        "bumpify.di.config",
+        "bumpify.di.semver",
+        "bumpify.di.filesystem",
+        "bumpify.di.vcs",
+        "bumpify.di.console",
+        "bumpify.di.hook",
+    ]
+)
 
 
 @provider.provides(Context)
@@ -1,9 +1,19 @@
 from pydio.api import Provider
 
 from bumpify import utils
-from bumpify.core.api.commands import BumpCommand, InitCommand
-from bumpify.core.api.interface import IBumpCommand, IInitCommand
-from bumpify.core.api.presenters import BumpCommandPresenter, InitPresenter
+from bumpify.core.api.commands import BumpCommand, DiscoverCommand, InitCommand, NextVersionCommand
+from bumpify.core.api.interface import (
+    IBumpCommand,
+    IDiscoverCommand,
+    IInitCommand,
+    INextVersionCommand,
+)
+from bumpify.core.api.presenters import (
+    BumpCommandPresenter,
+    DiscoverCommandPresenter,
+    InitPresenter,
+    NextVersionCommandPresenter,
+)
 from bumpify.core.api.providers import InitProvider
 from bumpify.core.config.interface import IConfigReaderWriter
 from bumpify.core.config.objects import LoadedSection
@@ -47,3 +57,30 @@ def make_bump_command(injector):
 def make_bump_command_presenter(injector):
     cout = utils.inject_type(injector, IConsoleOutput)
     return BumpCommandPresenter(cout)
+
+
+@provider.provides(INextVersionCommand)
+def make_next_version_command(injector):
+    semver_config = utils.inject_type(injector, LoadedSection[SemVerConfig])
+    semver_api = utils.inject_type(injector, ISemVerApi)
+    vcs_reader_writer = utils.inject_type(injector, IVcsReaderWriter)
+    return NextVersionCommand(semver_config, semver_api, vcs_reader_writer)
+
+
+@provider.provides(INextVersionCommand.INextVersionPresenter)
+def make_next_version_command_presenter(injector):
+    cout = utils.inject_type(injector, IConsoleOutput)
+    return NextVersionCommandPresenter(cout)
+
+
+@provider.provides(IDiscoverCommand)
+def make_discover_command(injector):
+    semver_config = utils.inject_type(injector, LoadedSection[SemVerConfig])
+    semver_api = utils.inject_type(injector, ISemVerApi)
+    return DiscoverCommand(semver_config, semver_api)
+
+
+@provider.provides(IDiscoverCommand.IDiscoverPresenter)
+def make_discover_command_presenter(injector):
+    cout = utils.inject_type(injector, IConsoleOutput)
+    return DiscoverCommandPresenter(cout)
@@ -1,3 +1,5 @@
+import os
+
 from pydio.api import Provider
 
 from bumpify import utils
@@ -14,7 +16,12 @@ provider = Provider()
 @provider.provides(IFileSystemReaderWriter)
 def make_filesystem_reader_writer(injector):
     context = utils.inject_context(injector)
-    out = FileSystemReaderWriter(context.project_root_dir)
+    journal_dir = None
+    if context.cache_dir is not None:
+        journal_dir = os.path.join(context.project_root_dir, context.cache_dir, "journal")
+    out = FileSystemReaderWriter(
+        context.project_root_dir, journal_dir=journal_dir, fsync=context.fsync
+    )
     if not context.dry_run:
         return out
     cout = utils.inject_type(injector, IConsoleOutput)
@@ -1,22 +1,60 @@
+import json
+import os
+
 from pydio.api import Provider
 
 from bumpify import utils
 from bumpify.core.config.objects import LoadedConfig
+from bumpify.core.console.interface import IConsoleOutput
+from bumpify.core.filesystem.implementation import FileSystemReaderWriter
 from bumpify.core.filesystem.interface import IFileSystemReader
-from bumpify.core.hook.implementation import HookApiLoader
+from bumpify.core.hook import helpers as hook_helpers
+from bumpify.core.hook.implementation import HookApiLoader, ProfilingHookApiProxy
 from bumpify.core.hook.interface import IHookApi, IHookApiLoader
+from bumpify.model import dump_valid
 
 provider = Provider()
 
 
 @provider.provides(IHookApiLoader)
 def make_hook_file_loader(injector):
+    context = utils.inject_context(injector)
     loaded_config = utils.inject_type(injector, LoadedConfig)
     filesystem_reader = utils.inject_type(injector, IFileSystemReader)
-    return HookApiLoader(loaded_config, filesystem_reader)
+    cache_fs = None
+    if context.cache_dir is not None and not context.dry_run:
+        cache_fs = FileSystemReaderWriter(
+            os.path.join(context.project_root_dir, context.cache_dir, "hooks")
+        )
+    return HookApiLoader(loaded_config, filesystem_reader, cache_fs)
 
 
 @provider.provides(IHookApi)
 def make_hook_file(injector):
+    context = utils.inject_context(injector)
     hook_file_loader = utils.inject_type(injector, IHookApiLoader)
-    return hook_file_loader.load()
+    hook_api = hook_file_loader.load()
+    try:
+        if not context.profile_hooks and context.profile_hooks_json is None:
+            yield hook_api
+        else:
+            yield from _profile_hooks(injector, hook_api)
+    finally:
+        hook_api.close()
+
+
+def _profile_hooks(injector, hook_api: IHookApi):
+    context = utils.inject_context(injector)
+    cout = utils.inject_type(injector, IConsoleOutput)
+    profiling_hook_api = ProfilingHookApiProxy(hook_api)
+    try:
+        yield profiling_hook_api
+    finally:
+        stats = profiling_hook_api.list_stats()
+        hook_helpers.print_hook_stats(cout, stats)
+        if context.profile_hooks_json is not None:
+            abspath = os.path.join(context.project_root_dir, context.profile_hooks_json)
+            payload = json.dumps({"hooks": [dump_valid(x) for x in stats]}, indent=2)
+            FileSystemReaderWriter(os.path.dirname(abspath)).write(
+                os.path.basename(abspath), payload.encode()
+            )
@@ -1,11 +1,15 @@
+import os
+
 from pydio.api import Provider
 
 from bumpify import utils
 from bumpify.core.config.objects import LoadedConfig, LoadedSection
-from bumpify.core.filesystem.interface import IFileSystemReaderWriter
+from bumpify.core.filesystem.implementation import FileSystemReaderWriter
+from bumpify.core.filesystem.interface import IFileSystemReader, IFileSystemReaderWriter
 from bumpify.core.hook.interface import IHookApi
-from bumpify.core.semver.implementation import SemVerApi
-from bumpify.core.semver.interface import ISemVerApi
+from bumpify.core.semver import helpers as semver_helpers
+from bumpify.core.semver.implementation import ChangelogCache, SemVerApi, VersionFileIndex
+from bumpify.core.semver.interface import IChangelogCache, ISemVerApi, IVersionFileIndex
 from bumpify.core.semver.objects import SemVerConfig
 from bumpify.core.vcs.interface import IVcsReaderWriter
 
@@ -18,7 +22,42 @@ def make_semver_api(injector):
     filesystem_reader_writer = utils.inject_type(injector, IFileSystemReaderWriter)
     vcs_reader_writer = utils.inject_type(injector, IVcsReaderWriter)
     hook_api = utils.inject_type(injector, IHookApi)
-    return SemVerApi(semver_config, filesystem_reader_writer, vcs_reader_writer, hook_api)
+    changelog_cache = utils.inject_type(injector, IChangelogCache)
+    version_file_index = utils.inject_type(injector, IVersionFileIndex)
+    context = utils.inject_context(injector)
+    parse_jobs = context.jobs or semver_config.config.parse_jobs
+    return SemVerApi(
+        semver_config,
+        filesystem_reader_writer,
+        vcs_reader_writer,
+        hook_api,
+        changelog_cache=changelog_cache,
+        parse_jobs=parse_jobs,
+        version_file_index=version_file_index,
+    )
+
+
+@provider.provides(IChangelogCache)
+def make_changelog_cache(injector):
+    context = utils.inject_context(injector)
+    if context.cache_dir is None or context.dry_run:
+        return None
+    loaded_config = utils.inject_type(injector, LoadedConfig)
+    filesystem_reader = utils.inject_type(injector, IFileSystemReader)
+    fingerprint = semver_helpers.make_changelog_cache_fingerprint(
+        loaded_config.config, filesystem_reader
+    )
+    cache_fs = FileSystemReaderWriter(os.path.join(context.project_root_dir, context.cache_dir))
+    return ChangelogCache(cache_fs, "changelog.json", fingerprint)
+
+
+@provider.provides(IVersionFileIndex)
+def make_version_file_index(injector):
+    context = utils.inject_context(injector)
+    if context.cache_dir is None or context.dry_run:
+        return None
+    cache_fs = FileSystemReaderWriter(os.path.join(context.project_root_dir, context.cache_dir))
+    return VersionFileIndex(cache_fs, "version-files.json")
 
 
 @provider.provides(LoadedSection[SemVerConfig])
@@ -5,6 +5,7 @@ from bumpify.core.config.objects import LoadedConfig
 from bumpify.core.console.interface import IConsoleOutput
 from bumpify.core.filesystem.interface import IFileSystemReader
 from bumpify.core.vcs.implementation.git import GitVcsConnector
+from bumpify.core.vcs.implementation.git_native import NativeGitVcsConnector
 from bumpify.core.vcs.implementation.proxy import DryRunVcsReaderWriterProxy
 from bumpify.core.vcs.interface import IVcsConnector, IVcsReaderWriter
 from bumpify.core.vcs.objects import VCSConfig
@@ -19,6 +20,12 @@ def make_git_vcs_connector(injector):
     return GitVcsConnector(filesystem_reader)
 
 
+@provider.provides(Variant(IVcsConnector, what=VCSConfig.Type.GIT_NATIVE))
+def make_native_git_vcs_connector(injector):
+    filesystem_reader = utils.inject_type(injector, IFileSystemReader)
+    return NativeGitVcsConnector(filesystem_reader)
+
+
 @provider.provides(IVcsReaderWriter)
 def make_vcs_reader_writer(injector):
     context = utils.inject_context(injector)
@@ -26,7 +33,11 @@ def make_vcs_reader_writer(injector):
     loaded_vcs_config = loaded_config.require_section(VCSConfig)
     connector = utils.inject_variant(injector, IVcsConnector, what=loaded_vcs_config.config.type)
     obj = connector.connect()
-    if not context.dry_run:
-        return obj
-    cout = utils.inject_type(injector, IConsoleOutput)
-    return DryRunVcsReaderWriterProxy(obj, cout)
+    try:
+        if not context.dry_run:
+            yield obj
+        else:
+            cout = utils.inject_type(injector, IConsoleOutput)
+            yield DryRunVcsReaderWriterProxy(obj, cout)
+    finally:
+        obj.close()
@@ -3,6 +3,8 @@
 from modelity.api import Model as _BaseModel
 from modelity.api import dump, field_preprocessor, validate
 
+from bumpify import _modelity_compat
+
 
 class Model(_BaseModel):
     """Common base class for all models.
@@ -16,6 +18,25 @@ class Model(_BaseModel):
             return value
         return value.decode()  # utf-8 assumed
 
+    def __reduce__(self):
+        return _modelity_compat.restore_model, (
+            self.__class__,
+            _modelity_compat.dump_state(self),
+        )
+
+    @classmethod
+    def construct(cls, **kwargs):
+        """Create model from values that are already known to be valid.
+
+        Unlike the regular constructor, this skips field processors and type
+        parsing, so each value must already be of its field's type and pass
+        its field's processors unchanged. Used on hot paths, f.e. to create
+        objects for each repository commit, where the values come from
+        bumpify's own parsers. Fields missing in *kwargs* are set to their
+        defaults.
+        """
+        return _modelity_compat.restore_model(cls, _modelity_compat.fill_defaults(cls, kwargs))
+
 
 def dump_valid(model: Model, **kwargs) -> dict:
     """Validate model and dump it to dict.
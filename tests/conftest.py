@@ -127,7 +127,9 @@ def tmpdir_vcs_connector(tmpdir_fs):
 
 @pytest.fixture
 def tmpdir_vcs(tmpdir_vcs_connector: IVcsConnector):
-    return tmpdir_vcs_connector.connect()
+    vcs = tmpdir_vcs_connector.connect()
+    yield vcs
+    vcs.close()
 
 
 @pytest.fixture
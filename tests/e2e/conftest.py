@@ -43,8 +43,11 @@ class SUT(IBumpifyCliApp):
     def init(self, input: str = None) -> str:
         return self._run("init", input=input)
 
-    def bump(self) -> str:
-        return self._run("bump")
+    def bump(self, rollback: bool = False) -> str:
+        return self._run("bump", "--rollback" if rollback else None)
+
+    def next_version(self) -> str:
+        return self._run("next-version")
 
 
 @pytest.fixture
@@ -66,6 +69,7 @@ def config_file_path(request: pytest.FixtureRequest):
     params=[
         VCSConfig.Type.AUTO,
         VCSConfig.Type.GIT,
+        VCSConfig.Type.GIT_NATIVE,
     ]
 )
 def vcs_type(request: pytest.FixtureRequest):
@@ -12,5 +12,9 @@ class IBumpifyCliApp(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def bump(self) -> str:
+    def bump(self, rollback: bool = False) -> str:
+        pass
+
+    @abc.abstractmethod
+    def next_version(self) -> str:
         pass
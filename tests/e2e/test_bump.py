@@ -5,6 +5,7 @@ from bumpify.core.config.exc import ConfigFileNotFound
 from bumpify.core.config.interface import IConfigReaderWriter
 from bumpify.core.config.objects import Config
 from bumpify.core.console.objects import Styled
+from bumpify.core.filesystem.implementation import FileSystemReaderWriter
 from bumpify.core.filesystem.interface import IFileSystemReader, IFileSystemReaderWriter
 from bumpify.core.semver.objects import SemVerConfig
 from bumpify.core.vcs.exc import NoCommitsFound, RepositoryDoesNotExist
@@ -183,6 +184,35 @@ class TestWithExistingAndConfiguredProject:
                 ).strip()
             )
 
+        @pytest.mark.parametrize("expected_version_str", ["0.1.0"])
+        def test_next_version_shows_version_that_bump_creates(
+            self, sut: SUT, tmpdir_vcs: IVcsReaderWriter, expected_version_str: str
+        ):
+            sut.bump()
+            tmpdir_vcs.commit("feat: a feature", allow_empty=True)
+            expected_stdout = helpers.format_info(
+                "Version would be bumped:",
+                Styled("0.0.1", bold=True),
+                "->",
+                Styled(expected_version_str, bold=True),
+            ).strip()
+            assert sut.next_version() == expected_stdout
+            sut.bump()
+
+        @pytest.mark.parametrize("expected_version_str", ["0.0.1"])
+        def test_files_left_by_interrupted_bump_are_restored_only_if_rollback_option_given(
+            self, sut: SUT, tmpdir, tmpdir_vcs: IVcsReaderWriter, semver_config: SemVerConfig
+        ):
+            path = semver_config.version_files[0].path
+            interrupted = FileSystemReaderWriter(
+                tmpdir, journal_dir=tmpdir.join(".git", "bumpify", "journal")
+            )
+            interrupted.set_checkpoint(tmpdir_vcs.find_head_rev())
+            interrupted.write(path, b"partially bumped")
+            assert "--rollback" in sut.bump()
+            assert tmpdir_vcs.list_merged_tags() == []
+            assert "Version was bumped" in sut.bump(rollback=True)
+
         @pytest.mark.parametrize("dry_run", [True])
         @pytest.mark.parametrize("expected_version_str", ["0.0.1"])
         def test_bump_with_dry_run_enabled(self, sut: SUT):
@@ -0,0 +1,76 @@
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+import pytest
+
+# Modules that are expensive to import and are not needed before any command
+# is executed
+DEFERRED_MODULES = [
+    "asyncio",
+    "modelity",
+    "tomlkit",
+    "pydio.injector",
+    "bumpify.di",
+    "bumpify.core.api.interface",
+    "bumpify.core.semver.objects",
+    "bumpify.core.vcs.implementation",
+]
+
+
+def import_times(*args: str) -> Dict[str, Tuple[int, int]]:
+    # Returns self and cumulative import time of each module imported
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "bumpify.delivery.cli", *args],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+    result = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            result[name.strip()] = int(self_us), int(cumulative_us)
+    return result
+
+
+def list_loaded_modules(code: str) -> List[str]:
+    return subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys\nprint('\\n'.join(sys.modules))"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.splitlines()
+
+
+@pytest.mark.parametrize("option", ["--version", "--help"])
+def test_expensive_modules_are_not_imported_on_startup(option):
+    times = import_times(option)
+    for name in DEFERRED_MODULES:
+        assert name not in times
+
+
+@pytest.mark.parametrize("option", ["--version", "--help"])
+def test_importing_bumpify_modules_takes_less_time_than_importing_click(option):
+    # Click is imported by the CLI anyway, so it is used as a baseline that
+    # is measured in the same run and on the same machine
+    times = import_times(option)
+    _, click_us = times["click"]
+    assert sum(v for k, (v, _) in times.items() if k.startswith("bumpify")) < click_us
+
+
+def test_subsystem_providers_are_imported_only_when_used():
+    modules = list_loaded_modules(
+        "from pydio.api import Injector\n"
+        "from bumpify import utils\n"
+        "from bumpify.core.api.interface import IInitCommand\n"
+        "from bumpify.di import provider\n"
+        "injector = Injector(provider)\n"
+        "utils.inject_context(injector).project_root_dir = '.'\n"
+        "utils.inject_type(injector, IInitCommand)\n"
+    )
+    assert "bumpify.di.api" in modules
+    assert "bumpify.di.config" in modules
+    assert "bumpify.di.semver" not in modules
+    assert "bumpify.di.vcs" not in modules
+    assert "bumpify.di.hook" not in modules
@@ -4,12 +4,19 @@ from mockify.api import ABCMock, Mock, Return, ordered, patched, satisfied
 from mockify.matchers import Type
 from pydio.api import Injector
 
-from bumpify import utils
-from bumpify.core.api.interface import IBumpCommand, IInitCommand
+from bumpify import exc, utils
+from bumpify.core.api.interface import (
+    IBumpCommand,
+    IDiscoverCommand,
+    IInitCommand,
+    INextVersionCommand,
+)
 from bumpify.core.config.interface import IConfigReaderWriter
 from bumpify.core.config.objects import Config
 from bumpify.core.console.objects import Styled
+from bumpify.core.filesystem.implementation import FileSystemReaderWriter
 from bumpify.core.filesystem.interface import IFileSystemReader, IFileSystemReaderWriter
+from bumpify.core.semver.interface import ISemVerApi
 from bumpify.core.semver.objects import SemVerConfig
 from bumpify.core.vcs.interface import IVcsConnector, IVcsReaderWriter
 from bumpify.core.vcs.objects import VCSConfig
@@ -85,7 +92,7 @@ class TestInitCommand:
         builtins_mock.input.expect_call(
             helpers.format_prompt(
                 "Choose project's repository type",
-                Styled("[auto, git]", bold=True),
+                Styled("[auto, git, git-native]", bold=True),
                 Styled("(default: auto)", bold=True),
             )
         ).will_once(Return(selected_repository_type))
@@ -349,6 +356,122 @@ class TestBumpCommand:
             ]
         )
 
+    @pytest.mark.parametrize("verify_changelog_files", [None])
+    @pytest.mark.parametrize(
+        "expected_version_str, expected_prev_version_str",
+        [
+            ("0.1.0", "0.0.1"),
+        ],
+    )
+    def test_changelog_appended_during_bump_is_same_as_changelog_generated_from_scratch(
+        self,
+        injector,
+        config_file_path,
+        tmpdir,
+        tmpdir_fs: IFileSystemReaderWriter,
+        tmpdir_vcs: IVcsReaderWriter,
+        tmpdir_config: IConfigReaderWriter,
+        config: Config,
+        semver_config: SemVerConfig,
+        bump_presenter,
+        expected_version_str,
+        expected_prev_version_str,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        # Commits would otherwise be created at a different date than the
+        # date of a bump, like it happens when the clock ticks in between
+        monkeypatch.setenv("GIT_COMMITTER_DATE", "@1700000000 +0000")
+        semver_config.changelog_files.append(SemVerConfig.ChangelogFile(path="CHANGELOG.json"))
+        config.save_section(semver_config)
+        tmpdir_config.save(config)
+        utils.inject_context(injector).cache_dir = ".bumpify"
+        uut = utils.inject_type(injector, IBumpCommand)
+        uut.bump(bump_presenter)
+        tmpdir_vcs.commit("feat: a feature", allow_empty=True)
+        uut.bump(bump_presenter)
+        appended = {cf.path: tmpdir_fs.read(cf.path) for cf in semver_config.changelog_files}
+        regenerating_injector = Injector(provider)
+        context = utils.inject_context(regenerating_injector)
+        context.project_root_dir = tmpdir
+        context.config_file_path = config_file_path
+        with regenerating_injector.scoped("action") as action_injector:
+            semver_api = utils.inject_type(action_injector, ISemVerApi)
+            semver_api.update_changelog_files(
+                semver_api.fetch_changelog(semver_api.list_version_tags())
+            )
+        for path, content in appended.items():
+            assert tmpdir_fs.read(path) == content
+
+    @pytest.mark.parametrize(
+        "expected_version_str, expected_prev_version_str",
+        [
+            ("0.0.1", "(null)"),
+        ],
+    )
+    def test_when_files_left_by_interrupted_bump_found_then_bump_requires_rollback(
+        self,
+        injector,
+        tmpdir,
+        tmpdir_fs: IFileSystemReaderWriter,
+        tmpdir_vcs: IVcsReaderWriter,
+        semver_config: SemVerConfig,
+        bump_presenter,
+        expected_version_str,
+        capsys: pytest.CaptureFixture,
+    ):
+        path = semver_config.version_files[0].path
+        utils.inject_context(injector).cache_dir = ".bumpify"
+        interrupted = FileSystemReaderWriter(tmpdir, journal_dir=tmpdir.join(".bumpify", "journal"))
+        interrupted.set_checkpoint(tmpdir_vcs.find_head_rev())
+        interrupted.write(path, b"partially bumped")
+        uut = utils.inject_type(injector, IBumpCommand)
+        uut.bump(bump_presenter)
+        assert tmpdir_fs.read(path) == b"partially bumped"
+        assert tmpdir_vcs.list_merged_tags() == []
+        uut.bump(bump_presenter, rollback=True)
+        captured = capsys.readouterr()
+        assert captured.out == "".join(
+            [
+                helpers.format_warning(
+                    "Files left modified by interrupted bump found:", Styled(path, bold=True)
+                ),
+                helpers.format_warning(
+                    "Bump was skipped; run it again with",
+                    Styled("--rollback", bold=True),
+                    "option to restore those files first",
+                ),
+                helpers.format_info(
+                    "Files left modified by interrupted bump were restored:",
+                    Styled(path, bold=True),
+                ),
+                helpers.format_info(
+                    "Version was bumped:",
+                    Styled("(null)", bold=True),
+                    "->",
+                    Styled(expected_version_str, bold=True),
+                ),
+            ]
+        )
+
+    @pytest.mark.parametrize("verify_bump_commit", [None])
+    @pytest.mark.parametrize("verify_version_tag", [None])
+    @pytest.mark.parametrize("verify_changelog_files", [None])
+    @pytest.mark.parametrize("expected_version_str", ["0.0.0"])
+    def test_when_bump_commit_fails_then_modified_files_are_restored_and_removed_from_index(
+        self, injector, tmpdir, tmpdir_vcs: IVcsReaderWriter, semver_config: SemVerConfig
+    ):
+        tmpdir.join(".git", "hooks", "pre-commit").write("#!/bin/sh\nexit 1\n", ensure=True)
+        tmpdir.join(".git", "hooks", "pre-commit").chmod(0o755)
+        utils.inject_context(injector).cache_dir = ".bumpify"
+        uut = utils.inject_type(injector, IBumpCommand)
+        with pytest.raises(exc.ShellCommandError):
+            uut.bump(utils.inject_type(injector, IBumpCommand.IBumpPresenter))
+        with utils.cwd(tmpdir):
+            staged = utils.shell_exec("git", "diff", "--cached", "--name-only").decode()
+        assert staged == ""
+        for cf in semver_config.changelog_files:
+            assert not tmpdir.join(cf.path).exists()
+
     @pytest.mark.parametrize("verify_bump_commit", [None])
     @pytest.mark.parametrize(
         "commit_message, expected_version_str, expected_prev_version_str",
@@ -406,3 +529,155 @@ class TestBumpCommand:
                 ),
             ]
         )
+
+
+class TestNextVersionCommand:
+    UUT = INextVersionCommand
+
+    @pytest.fixture
+    def uut(self, injector):
+        return utils.inject_type(injector, INextVersionCommand)
+
+    @pytest.fixture
+    def presenter(self, injector):
+        return utils.inject_type(injector, INextVersionCommand.INextVersionPresenter)
+
+    @pytest.fixture
+    def bump(self, injector):
+        command = utils.inject_type(injector, IBumpCommand)
+        presenter = utils.inject_type(injector, IBumpCommand.IBumpPresenter)
+        return lambda: command.bump(presenter)
+
+    @pytest.fixture(autouse=True)
+    def tmpdir_vcs_connector(self, tmpdir_vcs_connector: IVcsConnector, default_branch: str):
+        tmpdir_vcs_connector.init()
+        connection = tmpdir_vcs_connector.connect()
+        connection.commit("chore: initial commit", allow_empty=True)
+        connection.branch(default_branch)
+        connection.checkout(default_branch)
+        return tmpdir_vcs_connector
+
+    @pytest.fixture(autouse=True)
+    def tmpdir_config(self, tmpdir_config: IConfigReaderWriter, config: Config):
+        tmpdir_config.save(config)
+        return tmpdir_config
+
+    @pytest.fixture(autouse=True)
+    def version_files(self, tmpdir_fs: IFileSystemReaderWriter, data_fs: IFileSystemReader):
+        template = data_fs.read("templates/dummy-project/pyproject.toml.txt").decode()
+        tmpdir_fs.write("pyproject.toml", template.format(version="0.0.0").encode())
+
+    def test_when_no_version_tags_found_then_initial_version_is_presented(
+        self, uut: UUT, presenter, tmpdir_vcs: IVcsReaderWriter, capsys: pytest.CaptureFixture
+    ):
+        uut.next_version(presenter)
+        captured = capsys.readouterr()
+        assert captured.out == helpers.format_info(
+            "Version would be bumped:",
+            Styled("(null)", bold=True),
+            "->",
+            Styled("0.0.1", bold=True),
+        )
+        assert tmpdir_vcs.list_merged_tags() == []
+
+    @pytest.mark.parametrize(
+        "commit_messages, expected_version_str",
+        [
+            (["fix: a fix", "fix!: a breaking fix", "feat: a feature"], "1.0.0"),
+            (["fix: a fix", "feat: a feature"], "0.1.0"),
+            (["fix: a fix"], "0.0.2"),
+        ],
+    )
+    def test_when_changes_found_then_next_version_is_presented(
+        self,
+        uut: UUT,
+        presenter,
+        bump,
+        tmpdir_vcs: IVcsReaderWriter,
+        commit_messages,
+        expected_version_str,
+        capsys: pytest.CaptureFixture,
+    ):
+        bump()
+        for message in commit_messages:
+            tmpdir_vcs.commit(message, allow_empty=True)
+        head_rev = tmpdir_vcs.find_head_rev()
+        capsys.readouterr()
+        uut.next_version(presenter)
+        captured = capsys.readouterr()
+        assert captured.out == helpers.format_info(
+            "Version would be bumped:",
+            Styled("0.0.1", bold=True),
+            "->",
+            Styled(expected_version_str, bold=True),
+        )
+        assert tmpdir_vcs.find_head_rev() == head_rev
+
+    def test_when_no_changes_found_then_warning_is_presented(
+        self, uut: UUT, presenter, bump, tmpdir_vcs: IVcsReaderWriter, capsys
+    ):
+        bump()
+        tmpdir_vcs.commit("chore: a chore", allow_empty=True)
+        capsys.readouterr()
+        uut.next_version(presenter)
+        captured = capsys.readouterr()
+        assert captured.out == helpers.format_warning(
+            "No changes found between version",
+            Styled("0.0.1", bold=True),
+            "and current",
+            Styled("HEAD", bold=True),
+        )
+
+
+class TestDiscoverCommand:
+    UUT = IDiscoverCommand
+
+    @pytest.fixture
+    def uut(self, injector):
+        return utils.inject_type(injector, IDiscoverCommand)
+
+    @pytest.fixture
+    def presenter(self, injector):
+        return utils.inject_type(injector, IDiscoverCommand.IDiscoverPresenter)
+
+    @pytest.fixture(autouse=True)
+    def tmpdir_vcs_connector(self, tmpdir_vcs_connector: IVcsConnector):
+        tmpdir_vcs_connector.init()
+        return tmpdir_vcs_connector
+
+    @pytest.fixture(autouse=True)
+    def tmpdir_config(self, tmpdir_config: IConfigReaderWriter, config: Config):
+        tmpdir_config.save(config)
+        return tmpdir_config
+
+    def test_when_no_version_files_found_then_warning_is_presented(
+        self, uut: UUT, presenter, capsys: pytest.CaptureFixture
+    ):
+        uut.discover(presenter)
+        captured = capsys.readouterr()
+        assert captured.out == helpers.format_warning("No version files found")
+
+    def test_version_files_missing_in_config_are_presented_as_warnings(
+        self,
+        uut: UUT,
+        presenter,
+        tmpdir_fs: IFileSystemReaderWriter,
+        data_fs: IFileSystemReader,
+        capsys: pytest.CaptureFixture,
+    ):
+        template = data_fs.read("templates/dummy-project/pyproject.toml.txt").decode()
+        tmpdir_fs.write("pyproject.toml", template.format(version="0.1.0").encode())
+        tmpdir_fs.write("bumpify/__init__.py", b'__version__ = "0.1.0"\n')
+        uut.discover(presenter)
+        captured = capsys.readouterr()
+        assert captured.out == helpers.format_warning(
+            "Found version file missing in config:",
+            Styled("bumpify/__init__.py:1", bold=True),
+            "with version",
+            Styled("0.1.0", bold=True),
+        ) + helpers.format_info(
+            "Found version file:",
+            Styled("pyproject.toml:3", bold=True),
+            "with version",
+            Styled("0.1.0", bold=True),
+        )
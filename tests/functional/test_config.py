@@ -63,7 +63,7 @@ class TestConfigReaderWriter:
 
     @pytest.mark.parametrize(
         "payload, expected_errors",
-        [(b'[vcs]\ntype="dummy"', [("vcs.type", "value not allowed; allowed values: <Type.AUTO: 'auto'>, <Type.GIT: 'git'>")])],
+        [(b'[vcs]\ntype="dummy"', [("vcs.type", "value not allowed; allowed values: <Type.AUTO: 'auto'>, <Type.GIT: 'git'>, <Type.GIT_NATIVE: 'git-native'>")])],
     )
     def test_load_fails_with_validation_error_if_config_file_has_invalid_settings(
         self, sut: SUT, payload, expected_errors
@@ -18,6 +18,25 @@ def randbytes(count: int) -> bytes:
     return bytes(random.randint(0, 255) for _ in range(count))
 
 
+SCANNED_PATHS = [
+    ".gitignore",
+    "README.md",
+    "setup.py",
+    "build/lib/module.py",
+    "docs/build/index.html",
+    "docs/conf.py",
+    "node_modules/lib/package.json",
+    "src/app/__init__.py",
+    "src/app/__pycache__/__init__.cpython-311.pyc",
+    "src/app/data/file.txt",
+    "src/app/data/important.txt",
+    "src/app/build",
+    "src/debug.log",
+    "src/[x].txt",
+    "weird name.txt",
+]
+
+
 @pytest.fixture(
     params=[
         ("foo.txt", "foo.txt", b"content of foo.txt"),
@@ -76,6 +95,15 @@ class TestFileSystemReaderWriter:
         sut.write(path, payload)
         assert sut.read(path) == payload
 
+    def test_open_file_for_writing_and_write_it_in_chunks(
+        self, sut: SUT, path: str, normalized_path: str, payload: bytes
+    ):
+        with sut.open_write(path) as fd:
+            for i in range(len(payload)):
+                fd.write(payload[i : i + 1])
+        assert sut.read(path) == payload
+        assert sut.modified_paths() == {normalized_path}
+
     def test_write_fails_if_relative_path_is_used(
         self, sut: SUT, relative_path: str, payload: bytes
     ):
@@ -142,6 +170,394 @@ class TestFileSystemReaderWriter:
             sut.write(path, b"dummy content")
         assert set(sut.scan(exclude=exclude)) == expected_result
 
+    def test_write_replaces_existing_file_keeping_its_mode_and_leaving_no_temporary_files(
+        self, sut: SUT, tmpdir
+    ):
+        sut.write("foo.sh", b"old")
+        os.chmod(sut.abspath("foo.sh"), 0o750)
+        sut.write("foo.sh", b"new")
+        assert sut.read("foo.sh") == b"new"
+        assert os.stat(sut.abspath("foo.sh")).st_mode & 0o777 == 0o750
+        assert os.listdir(tmpdir) == ["foo.sh"]
+
+    @pytest.mark.parametrize("use_open_write", [False, True])
+    def test_write_through_symbolic_link_replaces_file_it_points_to(
+        self, sut: SUT, tmpdir, use_open_write: bool
+    ):
+        sut.write("docs/CHANGELOG.md", b"old")
+        os.symlink(os.path.join("docs", "CHANGELOG.md"), sut.abspath("CHANGELOG.md"))
+        if use_open_write:
+            with sut.open_write("CHANGELOG.md") as fd:
+                fd.write(b"new")
+        else:
+            sut.write("CHANGELOG.md", b"new")
+        assert os.path.islink(sut.abspath("CHANGELOG.md"))
+        assert sut.read("docs/CHANGELOG.md") == b"new"
+        assert sorted(os.listdir(tmpdir)) == ["CHANGELOG.md", "docs"]
+        assert os.listdir(tmpdir.join("docs")) == ["CHANGELOG.md"]
+
+    def test_write_keeps_hard_links_of_written_file(self, sut: SUT):
+        sut.write("foo.txt", b"old")
+        os.link(sut.abspath("foo.txt"), sut.abspath("bar.txt"))
+        sut.write("foo.txt", b"new")
+        assert sut.read("bar.txt") == b"new"
+        assert os.path.samefile(sut.abspath("foo.txt"), sut.abspath("bar.txt"))
+
+    def test_when_writing_fails_then_original_file_is_left_intact(self, sut: SUT, tmpdir):
+        sut.write("foo.txt", b"old")
+        sut.clear_modified_paths()
+        with pytest.raises(ValueError):
+            with sut.open_write("foo.txt") as fd:
+                fd.write(b"partial")
+                raise ValueError()
+        assert sut.read("foo.txt") == b"old"
+        assert sut.modified_paths() == set()
+        assert os.listdir(tmpdir) == ["foo.txt"]
+
+    @pytest.mark.parametrize(
+        "ignore, expected_ignored_paths",
+        [
+            ([], []),
+            (["# comment", "", "  "], []),
+            (["*.pyc"], ["src/app/__pycache__/__init__.cpython-311.pyc"]),
+            (["__pycache__/"], ["src/app/__pycache__/__init__.cpython-311.pyc"]),
+            (
+                ["build"],
+                ["build/lib/module.py", "docs/build/index.html", "src/app/build"],
+            ),
+            (["build/"], ["build/lib/module.py", "docs/build/index.html"]),
+            (["/build"], ["build/lib/module.py"]),
+            (["docs/build"], ["docs/build/index.html"]),
+            (["**/build/"], ["build/lib/module.py", "docs/build/index.html"]),
+            (["src/**"], [x for x in SCANNED_PATHS if x.startswith("src/")]),
+            (
+                ["src/**/*.txt"],
+                ["src/app/data/file.txt", "src/app/data/important.txt", "src/[x].txt"],
+            ),
+            (["src/app/data/*", "!src/app/data/important.txt"], ["src/app/data/file.txt"]),
+            (
+                ["src/app/data/", "!src/app/data/important.txt"],
+                ["src/app/data/file.txt", "src/app/data/important.txt"],
+            ),
+            (["*.md", "!README.md"], []),
+            (["?etup.py"], ["setup.py"]),
+            (["src/[a-z]*.log"], ["src/debug.log"]),
+            (["src/[!a-c]*.log"], ["src/debug.log"]),
+            (["src/\\[x\\].txt"], ["src/[x].txt"]),
+            (["weird name.txt  "], ["weird name.txt"]),
+            (
+                ["\\#not-a-comment", "node_modules/", ".*"],
+                [".gitignore", "node_modules/lib/package.json"],
+            ),
+        ],
+    )
+    def test_when_ignore_patterns_given_then_scan_skips_ignored_paths(
+        self, sut: SUT, ignore, expected_ignored_paths
+    ):
+        for path in SCANNED_PATHS:
+            sut.write(path, b"dummy content")
+        expected_result = {x for x in SCANNED_PATHS if x not in expected_ignored_paths}
+        assert set(sut.scan(ignore=ignore)) == expected_result
+
+    def test_when_ignore_patterns_given_then_scan_does_not_enter_ignored_directories(
+        self, sut: SUT, monkeypatch
+    ):
+        for path in ["setup.py", "src/app.py", "src/app.pyc", "node_modules/a/package.json"]:
+            sut.write(path, b"dummy content")
+        scanned_dirs = []
+        scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: scanned_dirs.append(path) or scandir(path))
+        assert set(sut.scan(ignore=["node_modules/", "*.pyc"])) == {"setup.py", "src/app.py"}
+        assert [os.path.relpath(x, sut.abspath()) for x in scanned_dirs] == [".", "src"]
+
+    def test_when_gitignore_is_used_then_scan_ignores_paths_matching_gitignore_files(
+        self, sut: SUT
+    ):
+        sut.write(".gitignore", b"*.log\n/build/\n")
+        sut.write("src/.gitignore", b"generated/\n!keep.log\n")
+        for path in [
+            ".git/HEAD",
+            "app.log",
+            "build/out.txt",
+            "setup.py",
+            "src/build/out.txt",
+            "src/debug.log",
+            "src/keep.log",
+            "src/generated/code.py",
+        ]:
+            sut.write(path, b"dummy content")
+        assert set(sut.scan(use_gitignore=True)) == {
+            ".gitignore",
+            "setup.py",
+            "src/.gitignore",
+            "src/build/out.txt",
+            "src/keep.log",
+        }
+        assert set(sut.scan(ignore=["src/"], use_gitignore=True)) == {".gitignore", "setup.py"}
+        assert set(sut.scan(ignore=["!app.log"], use_gitignore=True)) >= {"app.log"}
+
+    def test_scan_is_lazy(self, sut: SUT):
+        for i in range(10):
+            sut.write(f"dir{i}/file.txt", b"dummy content")
+        paths = sut.scan()
+        first = next(paths)
+        paths.close()
+        assert first.endswith("file.txt")
+
+    @pytest.mark.parametrize("payload", [b"", b"content"])
+    def test_map_file_and_read_its_content(self, sut: SUT, path: str, payload: bytes):
+        sut.write(path, payload)
+        with sut.open_mapped(path) as buf:
+            assert buf[:] == payload
+
+    def test_open_mapped_fails_if_file_does_not_exist(self, sut: SUT, path: str):
+        with pytest.raises(fs_exc.FileNotFound) as excinfo:
+            with sut.open_mapped(path):
+                pass
+        assert excinfo.value.path == path
+
+    def test_stat_returns_size_of_a_file(self, sut: SUT, path: str):
+        sut.write(path, b"content")
+        assert sut.stat(path).st_size == 7
+
+    def test_stat_fails_if_file_does_not_exist(self, sut: SUT, path: str):
+        with pytest.raises(fs_exc.FileNotFound) as excinfo:
+            sut.stat(path)
+        assert excinfo.value.path == path
+
+    @pytest.mark.parametrize("use_open_write", [False, True])
+    def test_when_written_content_did_not_change_then_file_is_left_untouched(
+        self, sut: SUT, path: str, payload: bytes, use_open_write: bool
+    ):
+        sut.write(path, payload)
+        sut.clear_modified_paths()
+        os.utime(sut.abspath(path), ns=(0, 0))
+        if use_open_write:
+            with sut.open_write(path) as fd:
+                fd.write(payload)
+        else:
+            sut.write(path, payload)
+        assert sut.modified_paths() == set()
+        assert os.stat(sut.abspath(path)).st_mtime_ns == 0
+        assert sut.read(path) == payload
+
+    @pytest.mark.parametrize("use_open_write", [False, True])
+    @pytest.mark.parametrize("new_payload", [b"same size", b"other size"])
+    def test_when_written_content_changed_then_file_is_replaced(
+        self, sut: SUT, use_open_write: bool, new_payload: bytes
+    ):
+        sut.write("foo.txt", b"same Size")
+        sut.clear_modified_paths()
+        if use_open_write:
+            with sut.open_write("foo.txt") as fd:
+                fd.write(new_payload)
+        else:
+            sut.write("foo.txt", new_payload)
+        assert sut.modified_paths() == {"foo.txt"}
+        assert sut.read("foo.txt") == new_payload
+
+    def test_files_written_while_staged_are_published_when_staging_ends(self, sut: SUT):
+        sut.write("foo.txt", b"foo")
+        sut.clear_modified_paths()
+        with sut.staged():
+            sut.write("foo.txt", b"foo v2")
+            with sut.open_write("bar/baz.txt") as fd:
+                fd.write(b"baz")
+            assert sut.read("foo.txt") == b"foo"
+            assert not sut.exists("bar/baz.txt")
+            assert sut.modified_paths() == set()
+        assert sut.read("foo.txt") == b"foo v2"
+        assert sut.read("bar/baz.txt") == b"baz"
+        assert sut.modified_paths() == {"foo.txt", "bar/baz.txt"}
+        assert sorted(sut.scan()) == ["bar/baz.txt", "foo.txt"]
+
+    def test_when_error_occurs_while_staged_then_no_file_is_written(self, sut: SUT):
+        sut.write("foo.txt", b"foo")
+        sut.clear_modified_paths()
+        with pytest.raises(RuntimeError):
+            with sut.staged():
+                sut.write("foo.txt", b"foo v2")
+                with sut.open_write("bar.txt") as fd:
+                    fd.write(b"bar")
+                    raise RuntimeError("failed while writing")
+        assert sut.read("foo.txt") == b"foo"
+        assert sut.modified_paths() == set()
+        assert list(sut.scan()) == ["foo.txt"]
+
+    def test_when_file_is_written_again_while_staged_then_last_content_is_published(self, sut: SUT):
+        sut.write("foo.txt", b"foo")
+        sut.clear_modified_paths()
+        with sut.staged():
+            sut.write("foo.txt", b"foo v2")
+            sut.write("foo.txt", b"foo v3")
+            sut.write("bar.txt", b"bar")
+            with sut.staged():
+                sut.write("bar.txt", b"bar v2")
+            assert not sut.exists("bar.txt")
+            sut.write("foo.txt", b"foo")
+        assert sut.read("foo.txt") == b"foo"
+        assert sut.read("bar.txt") == b"bar v2"
+        assert sut.modified_paths() == {"bar.txt"}
+        assert sorted(sut.scan()) == ["bar.txt", "foo.txt"]
+
+    def test_rollback_does_nothing_if_journal_is_not_enabled(self, sut: SUT):
+        sut.write("foo.txt", b"foo")
+        assert sut.pending_paths() == set()
+        assert sut.rollback() == set()
+        assert sut.read("foo.txt") == b"foo"
+
+
+class TestFileSystemReaderWriterWithJournal:
+    SUT = IFileSystemReaderWriter
+
+    @pytest.fixture
+    def root_dir(self, tmpdir):
+        return tmpdir.join("root")
+
+    @pytest.fixture
+    def journal_dir(self, tmpdir):
+        return tmpdir.join("journal")
+
+    @pytest.fixture(params=[False, True])
+    def fsync(self, request):
+        return request.param
+
+    @pytest.fixture
+    def sut(self, root_dir, journal_dir, fsync):
+        return FileSystemReaderWriter(root_dir, journal_dir=journal_dir, fsync=fsync)
+
+    @pytest.fixture
+    def setup(self, sut: SUT):
+        sut.write("foo.txt", b"foo")
+        sut.write("bar/baz.txt", b"baz")
+        sut.clear_modified_paths()
+
+    @pytest.mark.usefixtures("setup")
+    def test_rollback_restores_modified_files_and_removes_created_ones(self, sut: SUT):
+        sut.write("foo.txt", b"foo v2")
+        sut.write("foo.txt", b"foo v3")
+        sut.write("bar/baz.txt", b"baz v2")
+        sut.write("spam.txt", b"spam")
+        assert sut.rollback() == {"foo.txt", "bar/baz.txt", "spam.txt"}
+        assert sut.read("foo.txt") == b"foo"
+        assert sut.read("bar/baz.txt") == b"baz"
+        assert not sut.exists("spam.txt")
+        assert sut.modified_paths() == set()
+
+    @pytest.mark.usefixtures("setup")
+    def test_rollback_restores_files_modified_by_interrupted_writer(
+        self, sut: SUT, root_dir, journal_dir
+    ):
+        sut.write("foo.txt", b"foo v2")
+        sut.write("spam.txt", b"spam")
+        other = FileSystemReaderWriter(root_dir, journal_dir=journal_dir)
+        assert other.rollback() == {"foo.txt", "spam.txt"}
+        assert other.read("foo.txt") == b"foo"
+        assert not other.exists("spam.txt")
+        assert not os.path.exists(journal_dir)
+
+    @pytest.mark.usefixtures("setup")
+    def test_rollback_ignores_incomplete_last_journal_entry(self, sut: SUT, journal_dir):
+        sut.write("foo.txt", b"foo v2")
+        with open(os.path.join(journal_dir, "journal.jsonl"), "a") as fd:
+            fd.write('{"path": "bar/baz')
+        assert sut.rollback() == {"foo.txt"}
+        assert sut.read("foo.txt") == b"foo"
+        assert sut.read("bar/baz.txt") == b"baz"
+
+    @pytest.mark.usefixtures("setup")
+    def test_rollback_restores_files_modified_at_same_checkpoint(
+        self, sut: SUT, root_dir, journal_dir
+    ):
+        sut.set_checkpoint("rev-1")
+        sut.write("foo.txt", b"foo v2")
+        other = FileSystemReaderWriter(root_dir, journal_dir=journal_dir)
+        assert other.rollback("rev-1") == {"foo.txt"}
+        assert other.read("foo.txt") == b"foo"
+
+    @pytest.mark.usefixtures("setup")
+    def test_pending_paths_returns_paths_modified_at_same_checkpoint_without_restoring_them(
+        self, sut: SUT, root_dir, journal_dir
+    ):
+        sut.set_checkpoint("rev-1")
+        sut.write("foo.txt", b"foo v2")
+        sut.write("spam.txt", b"spam")
+        other = FileSystemReaderWriter(root_dir, journal_dir=journal_dir)
+        assert other.pending_paths("rev-1") == {"foo.txt", "spam.txt"}
+        assert other.pending_paths() == {"foo.txt", "spam.txt"}
+        assert other.pending_paths("rev-2") == set()
+        assert other.read("foo.txt") == b"foo v2"
+        assert other.rollback("rev-1") == {"foo.txt", "spam.txt"}
+        assert other.pending_paths("rev-1") == set()
+
+    @pytest.mark.usefixtures("setup")
+    def test_rollback_keeps_files_modified_at_other_checkpoint_and_discards_journal(
+        self, sut: SUT, root_dir, journal_dir
+    ):
+        sut.set_checkpoint("rev-1")
+        sut.write("foo.txt", b"foo v2")
+        sut.write("spam.txt", b"spam")
+        other = FileSystemReaderWriter(root_dir, journal_dir=journal_dir)
+        assert other.rollback("rev-2") == set()
+        assert other.read("foo.txt") == b"foo v2"
+        assert other.read("spam.txt") == b"spam"
+        assert not os.path.exists(journal_dir)
+
+    @pytest.mark.usefixtures("setup")
+    def test_rollback_restores_files_written_while_staged(self, sut: SUT):
+        with sut.staged():
+            sut.write("foo.txt", b"foo v2")
+            sut.write("spam.txt", b"spam")
+        assert sut.rollback() == {"foo.txt", "spam.txt"}
+        assert sut.read("foo.txt") == b"foo"
+        assert not sut.exists("spam.txt")
+
+    @pytest.mark.usefixtures("setup")
+    def test_rollback_restores_files_keeping_symbolic_and_hard_links(self, sut: SUT):
+        os.symlink("foo.txt", sut.abspath("foo-link.txt"))
+        os.link(sut.abspath("bar/baz.txt"), sut.abspath("baz-link.txt"))
+        sut.write("foo-link.txt", b"foo v2")
+        sut.write("bar/baz.txt", b"baz v2")
+        assert sut.read("baz-link.txt") == b"baz v2"
+        assert sut.rollback() == {"foo-link.txt", "bar/baz.txt"}
+        assert os.path.islink(sut.abspath("foo-link.txt"))
+        assert sut.read("foo.txt") == b"foo"
+        assert sut.read("baz-link.txt") == b"baz"
+        assert os.path.samefile(sut.abspath("bar/baz.txt"), sut.abspath("baz-link.txt"))
+
+    def test_when_journal_cannot_be_written_then_files_are_modified_without_journal(
+        self, root_dir, tmpdir, caplog: pytest.LogCaptureFixture
+    ):
+        # Like .git in worktrees and submodules, which is a file
+        tmpdir.join("dot-git").write("gitdir: /elsewhere")
+        sut = FileSystemReaderWriter(root_dir, journal_dir=tmpdir.join("dot-git", "journal"))
+        assert sut.rollback("rev-1") == set()
+        sut.write("foo.txt", b"foo")
+        sut.write("bar.txt", b"bar")
+        assert sut.read("foo.txt") == b"foo"
+        assert sut.modified_paths() == {"foo.txt", "bar.txt"}
+        assert len([x for x in caplog.records if "journal" in x.getMessage()]) == 1
+        assert sut.rollback() == set()
+        sut.clear_modified_paths()
+
+    @pytest.mark.usefixtures("setup")
+    def test_when_modified_paths_are_cleared_then_changes_can_no_longer_be_rolled_back(
+        self, sut: SUT, journal_dir
+    ):
+        sut.write("foo.txt", b"foo v2")
+        sut.clear_modified_paths()
+        assert not os.path.exists(journal_dir)
+        assert sut.rollback() == set()
+        assert sut.read("foo.txt") == b"foo v2"
+
+    @pytest.mark.usefixtures("setup")
+    def test_sync_modified_files(self, sut: SUT):
+        sut.write("foo.txt", b"foo v2")
+        sut.write("bar/baz.txt", b"baz v2")
+        sut.sync()
+        assert sut.read("foo.txt") == b"foo v2"
+        assert sut.modified_paths() == {"foo.txt", "bar/baz.txt"}
+
 
 class TestDryRunFileSystemReaderWriterProxy:
     SUT = IFileSystemReaderWriter
@@ -231,6 +647,24 @@ class TestDryRunFileSystemReaderWriterProxy:
         self.console_output_mock.emit.expect_call(Severity.INFO, *expected_message)
         sut.write(path, payload)
 
+    def test_when_file_opened_for_writing_then_content_is_printed_once_file_is_closed(
+        self, sut: SUT
+    ):
+        self.target_mock.exists.expect_call("dummy.txt").will_once(Return(False))
+        self.console_output_mock.emit.expect_call(
+            Severity.INFO,
+            "Would",
+            Styled("create", bold=True),
+            "file at",
+            Styled("dummy.txt", bold=True),
+            "and set it with following content:\n",
+            Styled("  spam\n  more spam", fg="blue"),
+        )
+        with sut.open_write("dummy.txt") as fd:
+            fd.write(b"spam\n")
+            fd.write(b"more spam")
+        assert sut.modified_paths() == {"dummy.txt"}
+
     def test_when_write_called_then_path_is_added_to_modified_paths(
         self, sut: SUT, path, normalized_path
     ):
@@ -248,3 +682,18 @@ class TestDryRunFileSystemReaderWriterProxy:
         assert sut.modified_paths() == {normalized_path}
         sut.clear_modified_paths()
         assert sut.modified_paths() == set()
+
+    def test_sync_and_rollback_do_nothing(self, sut: SUT):
+        sut.sync()
+        assert sut.rollback() == set()
+
+    def test_when_staged_then_files_are_printed_immediately(self, sut: SUT):
+        self.target_mock.exists.expect_call("dummy.txt").will_once(Return(False))
+        self.console_output_mock.emit.expect_call(Severity.INFO, _, _, _, _, _, _)
+        with sut.staged():
+            sut.write("dummy.txt", b"content")
+        assert sut.modified_paths() == {"dummy.txt"}
+
+    def test_pending_paths_are_read_from_target(self, sut: SUT):
+        self.target_mock.pending_paths.expect_call("rev-1").will_once(Return({"foo.txt"}))
+        assert sut.pending_paths("rev-1") == {"foo.txt"}
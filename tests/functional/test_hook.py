@@ -1,3 +1,9 @@
+import builtins
+import concurrent.futures
+import datetime
+import multiprocessing
+import os
+import sys
 import textwrap
 from typing import Dict, Optional
 
@@ -5,11 +11,20 @@ import pytest
 from mockify.api import FunctionMock, Return, satisfied
 
 from bumpify.core.config.objects import LoadedConfig
+from bumpify.core.console.objects import Styled
+from bumpify.core.console.output import StdoutConsoleOutput
+from bumpify.core.filesystem.exc import FileNotFound
+from bumpify.core.filesystem.implementation import FileSystemReaderWriter
 from bumpify.core.filesystem.interface import IFileSystemReaderWriter
-from bumpify.core.hook.exc import HookExecFailed
-from bumpify.core.hook.implementation import HookApiLoader
-from bumpify.core.hook.interface import IHookApiLoader
-from bumpify.core.hook.objects import HookConfig
+from bumpify.core.hook import implementation
+from bumpify.core.hook.exc import HookCallFailed, HookExecFailed
+from bumpify.core.hook.helpers import print_hook_stats
+from bumpify.core.hook.implementation import HookApiLoader, ProfilingHookApiProxy
+from bumpify.core.hook.interface import IHookApi, IHookApiLoader
+from bumpify.core.hook.objects import HookConfig, HookStats
+from bumpify.core.semver.objects import ConventionalCommit
+from bumpify.core.vcs.objects import Commit
+from tests import helpers
 
 SUT = IHookApiLoader
 
@@ -148,8 +163,9 @@ class TestLoadHook:
     ):
         for path in hook_config.paths:
             tmpdir_fs.write(path, hook_file_payload[path].encode())
+        api = sut.load()
         with pytest.raises(HookExecFailed) as excinfo:
-            sut.load()
+            api.loaded_hook_names()
         assert excinfo.value.abspath == tmpdir_fs.abspath("hook.py")
         assert excinfo.value.original_exc.__class__ is SyntaxError
         assert "not a Python code" in excinfo.value.traceback
@@ -217,3 +233,368 @@ class TestLoadHook:
         api = sut.load()
         default_func_mock.expect_call(0, 255).times(0)
         assert 0 <= api.get_hook("bar", default_func_mock).invoke(0, 255) <= 255
+
+    @pytest.mark.parametrize("hook_config", [HookConfig(paths=["hook.py"])])
+    def test_hook_files_are_not_loaded_until_hook_is_requested(self, sut: SUT, default_func_mock):
+        api = sut.load()
+        with pytest.raises(FileNotFound) as excinfo:
+            api.get_hook("add", default_func_mock)
+        assert excinfo.value.path == "hook.py"
+
+    @pytest.mark.parametrize("hook_config", [HookConfig(paths=["hook.py"])])
+    def test_hook_module_is_loaded_in_its_own_namespace(
+        self, sut: SUT, tmpdir_fs: IFileSystemReaderWriter, default_func_mock
+    ):
+        tmpdir_fs.write("hook.py", make_add_hook().encode())
+        api = sut.load()
+        func = api.get_hook("add", default_func_mock)
+        default_func_mock.expect_call(2, 3).times(0)
+        assert func.invoke(2, 3) == 5
+        assert not hasattr(implementation, "add")
+        assert not hasattr(implementation, "hook")
+
+    @pytest.mark.parametrize("hook_config", [HookConfig(paths=["hook.py"])])
+    def test_hook_can_be_invoked_by_process_that_did_not_load_hook_file(
+        self, sut: SUT, tmpdir_fs: IFileSystemReaderWriter, default_func_mock
+    ):
+        tmpdir_fs.write("hook.py", make_add_hook().encode())
+        func = sut.load().get_hook("add", default_func_mock)
+        default_func_mock.expect_call(2, 3).times(0)
+        mp_context = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(1, mp_context=mp_context) as executor:
+            assert executor.submit(func.invoke, 2, 3).result() == 5
+
+
+class TestLoadHookWithBytecodeCache:
+
+    @pytest.fixture
+    def loaded_config(self, loaded_config: LoadedConfig):
+        loaded_config.config.save_section(HookConfig(paths=["hook.py"]))
+        return loaded_config
+
+    @pytest.fixture
+    def cache_fs(self, tmpdir):
+        return FileSystemReaderWriter(tmpdir.join("cache"))
+
+    @pytest.fixture
+    def make_sut(self, loaded_config, tmpdir_fs, cache_fs):
+        return lambda: HookApiLoader(loaded_config, tmpdir_fs, cache_fs)
+
+    @pytest.fixture
+    def compile_calls(self, monkeypatch):
+        calls = []
+
+        def compile_proxy(*args, **kwargs):
+            calls.append(args[1])
+            return builtins.compile(*args, **kwargs)
+
+        monkeypatch.setattr(implementation, "compile", compile_proxy, raising=False)
+        return calls
+
+    def test_hook_file_is_compiled_only_once_if_not_modified(
+        self, make_sut, tmpdir_fs: IFileSystemReaderWriter, compile_calls
+    ):
+        tmpdir_fs.write("hook.py", make_add_hook().encode())
+        for _ in range(3):
+            assert make_sut().load().get_hook("add", None).invoke(2, 3) == 5
+        assert compile_calls == [tmpdir_fs.abspath("hook.py")]
+
+    def test_hook_file_is_compiled_again_if_modified(
+        self, make_sut, tmpdir_fs: IFileSystemReaderWriter, compile_calls
+    ):
+        tmpdir_fs.write("hook.py", make_add_hook().encode())
+        assert make_sut().load().loaded_hook_names() == {"add"}
+        tmpdir_fs.write("hook.py", make_add_hook().encode() + make_sub_hook().encode())
+        assert make_sut().load().loaded_hook_names() == {"add", "sub"}
+        assert len(compile_calls) == 2
+
+    def test_corrupted_cache_file_is_ignored(
+        self,
+        make_sut,
+        tmpdir_fs: IFileSystemReaderWriter,
+        cache_fs: IFileSystemReaderWriter,
+        compile_calls,
+    ):
+        tmpdir_fs.write("hook.py", make_add_hook().encode())
+        assert make_sut().load().loaded_hook_names() == {"add"}
+        for path in cache_fs.scan():
+            cache_fs.write(path, cache_fs.read(path)[:-10])
+        assert make_sut().load().loaded_hook_names() == {"add"}
+        assert len(compile_calls) == 2
+
+    def test_when_hook_fails_then_traceback_contains_source_line(
+        self, make_sut, tmpdir_fs: IFileSystemReaderWriter
+    ):
+        tmpdir_fs.write("hook.py", b"x = 1\nraise ValueError('invalid hook')\n")
+        for _ in range(2):
+            with pytest.raises(HookExecFailed) as excinfo:
+                make_sut().load().loaded_hook_names()
+            assert "raise ValueError('invalid hook')" in excinfo.value.traceback
+
+
+class TestSandboxedHooks:
+
+    @pytest.fixture
+    def sandbox(self):
+        return HookConfig.Sandbox(timeout=5)
+
+    @pytest.fixture
+    def loaded_config(self, loaded_config: LoadedConfig, sandbox: HookConfig.Sandbox):
+        loaded_config.config.save_section(HookConfig(paths=["hook.py"], sandbox=sandbox))
+        return loaded_config
+
+    @pytest.fixture
+    def sut(self, loaded_config, tmpdir_fs: IFileSystemReaderWriter):
+        tmpdir_fs.write(
+            "hook.py",
+            textwrap.dedent(
+                """
+            import os
+            import time
+
+            from bumpify.core.hook.decorators import hook
+            from bumpify.core.semver.objects import ConventionalCommit
+
+            @hook("add")
+            def add(a, b):
+                print("adding", a, b)
+                return a + b
+
+            @hook("getpid")
+            def getpid():
+                return os.getpid()
+
+            @hook("getenv")
+            def getenv(name):
+                return os.environ.get(name)
+
+            @hook("getpath")
+            def getpath():
+                import sys
+                return sys.path
+
+            @hook("parse")
+            def parse(commit):
+                return ConventionalCommit.from_commit(commit)
+
+            @hook("fail")
+            def fail():
+                raise ValueError("failed")
+
+            @hook("sleep")
+            def sleep(seconds):
+                time.sleep(seconds)
+
+            @hook("exit")
+            def exit():
+                os._exit(3)
+
+            @hook("allocate")
+            def allocate(size):
+                return len(bytearray(size))
+            """
+            ).encode(),
+        )
+        api = HookApiLoader(loaded_config, tmpdir_fs).load()
+        yield api
+        api.close()
+
+    def test_hooks_are_executed_by_worker_process(self, sut: IHookApi):
+        assert sut.loaded_hook_names() == {
+            "add",
+            "getpid",
+            "getenv",
+            "getpath",
+            "parse",
+            "fail",
+            "sleep",
+            "exit",
+            "allocate",
+        }
+        assert sut.get_hook("add", None).invoke(2, 3) == 5
+        pid = sut.get_hook("getpid", None).invoke()
+        assert pid != os.getpid()
+        assert sut.get_hook("getpid", None).invoke() == pid
+
+    def test_worker_process_uses_same_module_search_path_as_parent(self, sut: IHookApi):
+        assert sut.get_hook("getpath", None).invoke() == sys.path
+        assert sut.get_hook("getenv", None).invoke("PYTHONPATH") == os.environ.get("PYTHONPATH")
+
+    def test_invoke_hook_with_many_arguments_at_once(self, sut: IHookApi):
+        hook = sut.get_hook("add", None)
+        assert hook.invoke_many([(1, 2), (3, 4), ("a", "b")]) == [3, 7, "ab"]
+        assert hook.invoke_many([]) == []
+
+    def test_models_are_sent_to_and_received_from_worker_process(self, sut: IHookApi):
+        commits = [
+            Commit(
+                rev=str(i),
+                author="John Doe",
+                author_email="jd@example.com",
+                author_date=datetime.datetime(2024, 1, 1),
+                message=message,
+            )
+            for i, message in enumerate(["fix: a fix", "non conventional change"])
+        ]
+        result = sut.get_hook("parse", None).invoke_many([(x,) for x in commits])
+        assert result == [ConventionalCommit.from_commit(x) for x in commits]
+
+    def test_when_hook_fails_then_hook_call_failed_error_is_raised(self, sut: IHookApi):
+        with pytest.raises(HookCallFailed) as excinfo:
+            sut.get_hook("fail", None).invoke()
+        assert excinfo.value.name == "fail"
+        assert excinfo.value.abspath.endswith("hook.py")
+        assert 'raise ValueError("failed")' in excinfo.value.reason
+        assert isinstance(excinfo.value.original_exc, ValueError)
+        assert sut.get_hook("add", None).invoke(2, 3) == 5
+
+    @pytest.mark.parametrize("sandbox", [HookConfig.Sandbox(timeout=0.2)])
+    def test_when_hook_times_out_then_worker_is_killed(self, sut: IHookApi):
+        with pytest.raises(HookCallFailed) as excinfo:
+            sut.get_hook("sleep", None).invoke(5)
+        assert excinfo.value.reason == "worker process timed out after 0.2 second(-s)"
+        with pytest.raises(HookCallFailed) as excinfo:
+            sut.get_hook("add", None).invoke(2, 3)
+        assert excinfo.value.reason == "worker process timed out after 0.2 second(-s)"
+
+    def test_when_worker_process_exits_then_hook_call_failed_error_is_raised(self, sut: IHookApi):
+        with pytest.raises(HookCallFailed) as excinfo:
+            sut.get_hook("exit", None).invoke()
+        assert excinfo.value.reason == "worker process exited with code 3"
+
+    @pytest.mark.parametrize("sandbox", [HookConfig.Sandbox(memory_limit=512)])
+    def test_when_memory_limit_is_exceeded_then_hook_fails_with_memory_error(self, sut: IHookApi):
+        hook = sut.get_hook("allocate", None)
+        assert hook.invoke(1024) == 1024
+        with pytest.raises(HookCallFailed) as excinfo:
+            hook.invoke(1024 * 1024 * 1024)
+        assert isinstance(excinfo.value.original_exc, MemoryError)
+        assert hook.invoke(1024) == 1024
+
+    def test_hook_cannot_be_used_once_closed(self, sut: IHookApi):
+        hook = sut.get_hook("add", None)
+        sut.close()
+        with pytest.raises(HookCallFailed) as excinfo:
+            hook.invoke(2, 3)
+        assert excinfo.value.reason == "worker process was stopped"
+
+    def test_loading_hook_fails_if_hook_file_fails_in_worker_process(
+        self, loaded_config, tmpdir_fs: IFileSystemReaderWriter
+    ):
+        tmpdir_fs.write("hook.py", b"x = 1\nraise ValueError('invalid hook')\n")
+        api = HookApiLoader(loaded_config, tmpdir_fs).load()
+        try:
+            with pytest.raises(HookExecFailed) as excinfo:
+                api.loaded_hook_names()
+            assert "raise ValueError('invalid hook')" in excinfo.value.traceback
+        finally:
+            api.close()
+
+
+class TestProfilingHookApiProxy:
+
+    @pytest.fixture(params=[None, HookConfig.Sandbox(timeout=5)])
+    def loaded_config(self, request: pytest.FixtureRequest, loaded_config: LoadedConfig):
+        loaded_config.config.save_section(HookConfig(paths=["hook.py"], sandbox=request.param))
+        return loaded_config
+
+    @pytest.fixture
+    def sut(self, loaded_config, tmpdir_fs: IFileSystemReaderWriter):
+        tmpdir_fs.write(
+            "hook.py",
+            textwrap.dedent(
+                """
+            import time
+
+            from bumpify.core.hook.decorators import hook
+
+            @hook("div")
+            def div(a, b):
+                return a / b
+
+            @hook("sleep")
+            def sleep(seconds):
+                time.sleep(seconds)
+            """
+            ).encode(),
+        )
+        api = ProfilingHookApiProxy(HookApiLoader(loaded_config, tmpdir_fs).load())
+        yield api
+        api.close()
+
+    def test_when_no_hooks_used_then_stats_are_empty(self, sut: IHookApi):
+        assert sut.loaded_hook_names() == {"div", "sleep"}
+        assert sut.list_stats() == []
+
+    def test_count_calls_and_errors_of_loaded_hooks(self, sut: IHookApi):
+        div = sut.get_hook("div", None)
+        for _ in range(99):
+            assert div.invoke(4, 2) == 2
+        with pytest.raises((ZeroDivisionError, HookCallFailed)):
+            div.invoke(1, 0)
+        assert sut.get_hook("default", lambda: 1).invoke() == 1
+        stats = sut.list_stats()
+        assert len(stats) == 1
+        assert stats[0].name == "div"
+        assert stats[0].calls == 100
+        assert stats[0].errors == 1
+        assert 0 < stats[0].p50_time <= stats[0].p99_time <= stats[0].total_time
+
+    def test_calls_invoked_in_batch_are_timed_separately(self, sut: IHookApi):
+        sut.get_hook("sleep", None).invoke_many([(0,)] * 98 + [(0.05,)] * 2)
+        (stats,) = sut.list_stats()
+        assert stats.calls == 100
+        assert stats.errors == 0
+        assert stats.p50_time < 0.01
+        assert stats.p99_time >= 0.05
+
+    def test_when_batch_fails_then_only_calls_made_are_counted(self, sut: IHookApi):
+        with pytest.raises((ZeroDivisionError, HookCallFailed)):
+            sut.get_hook("div", None).invoke_many([(4, 2), (2, 1), (1, 0), (3, 1)])
+        (stats,) = sut.list_stats()
+        assert stats.calls == 3
+        assert stats.errors == 1
+
+    def test_same_stats_are_used_for_hook_requested_twice(self, sut: IHookApi):
+        sut.get_hook("div", None).invoke(4, 2)
+        sut.get_hook("div", None).invoke(4, 2)
+        stats = sut.list_stats()
+        assert len(stats) == 1
+        assert stats[0].calls == 2
+
+
+class TestPrintHookStats:
+
+    def test_print_message_when_no_hooks_were_used(self, capsys: pytest.CaptureFixture):
+        print_hook_stats(StdoutConsoleOutput(), [])
+        assert capsys.readouterr().out == helpers.format_info("No hooks were used")
+
+    def test_print_stats_of_each_hook(self, capsys: pytest.CaptureFixture):
+        stats = [
+            HookStats(name="slow", calls=3, errors=1, total_time=2.5, p50_time=0.5, p99_time=1.5),
+            HookStats(
+                name="fast", calls=2, errors=0, total_time=0.002, p50_time=0.001, p99_time=0.001
+            ),
+        ]
+        print_hook_stats(StdoutConsoleOutput(), stats)
+        assert capsys.readouterr().out == helpers.format_warning(
+            "Hook",
+            Styled("slow", bold=True),
+            "called 3 time(-s), failed 1 time(-s):",
+            "total",
+            Styled("2.500s", bold=True),
+            "p50",
+            Styled("500.000ms", bold=True),
+            "p99",
+            Styled("1.500s", bold=True),
+        ) + helpers.format_info(
+            "Hook",
+            Styled("fast", bold=True),
+            "called 2 time(-s), failed 0 time(-s):",
+            "total",
+            Styled("2.000ms", bold=True),
+            "p50",
+            Styled("1.000ms", bold=True),
+            "p99",
+            Styled("1.000ms", bold=True),
+        )
@@ -1,24 +1,40 @@
 import datetime
+import json
+import os
+import textwrap
 
 import pytest
-from mockify.api import Return
+from mockify.api import ABCMock, Invoke, Raise, Return, _, satisfied
 
 from bumpify.core.filesystem.helpers import read_json
+from bumpify.core.filesystem.implementation import FileSystemReaderWriter
 from bumpify.core.filesystem.interface import IFileSystemReaderWriter
-from bumpify.core.semver.exc import UnsupportedChangelogFormat, VersionFileNotUpdated
+from bumpify.core.hook.implementation import HookApiLoader
+from bumpify.core.hook.interface import IHookApi, IHookFunction
+from bumpify.core.hook.objects import HookConfig
+from bumpify.core.semver._changelog_formatters import JsonChangelogFormatter
+from bumpify.core.semver.exc import (
+    CommitParserBatchHookError,
+    UnsupportedChangelogFormat,
+    VersionFileNotUpdated,
+)
 from bumpify.core.semver.helpers import make_dummy_conventional_commit, make_dummy_version_tag
-from bumpify.core.semver.implementation import SemVerApi
-from bumpify.core.semver.interface import ISemVerApi
+from bumpify.core.semver.implementation import ChangelogCache, SemVerApi, VersionFileIndex
+from bumpify.core.semver.interface import IChangelogFormatter, ISemVerApi
 from bumpify.core.semver.objects import (
     Changelog,
     ChangelogEntry,
     ChangelogEntryData,
+    ChangeSeverity,
+    ConventionalCommit,
     ConventionalCommitData,
     SemVerConfig,
     Version,
     VersionTag,
 )
 from bumpify.core.vcs.helpers import make_dummy_commit, make_dummy_rev, make_dummy_tag
+from bumpify.exc import ShellCommandError
+from bumpify.model import dump_valid
 
 API = ISemVerApi
 
@@ -99,7 +115,7 @@ class TestListConventionalCommits:
         self, start_rev, end_rev
     ):
         commits = [make_dummy_commit("non conventional change")]
-        self.vcs_reader_writer_mock.list_commits.expect_call(
+        self.vcs_reader_writer_mock.iter_commits.expect_call(
             start_rev=start_rev, end_rev=end_rev
         ).will_once(Return(commits))
         conventional_commits = self.api.list_conventional_commits(start_rev, end_rev)
@@ -113,7 +129,7 @@ class TestListConventionalCommits:
     )
     def test_parse_conventional_commit(self, message, expected_conventional_commit_data):
         commits = [make_dummy_commit(message)]
-        self.vcs_reader_writer_mock.list_commits.expect_call(
+        self.vcs_reader_writer_mock.iter_commits.expect_call(
             start_rev=None, end_rev=None
         ).will_once(Return(commits))
         conventional_commits = self.api.list_conventional_commits()
@@ -131,14 +147,14 @@ class TestFetchUnreleasedChanges:
         self.version_tag = make_dummy_version_tag(Version.from_str("1.0.0"))
 
     def test_when_no_changes_made_since_last_version_tag_then_return_none(self):
-        self.vcs_reader_writer_mock.list_commits.expect_call(
+        self.vcs_reader_writer_mock.iter_commits.expect_call(
             start_rev=self.version_tag.tag.rev, end_rev=None
         ).will_once(Return([]))
         assert self.api.fetch_unreleased_changes(self.version_tag) is None
 
     def test_parse_unreleased_fix(self):
         commits = [make_dummy_commit("fix: a fix")]
-        self.vcs_reader_writer_mock.list_commits.expect_call(
+        self.vcs_reader_writer_mock.iter_commits.expect_call(
             start_rev=self.version_tag.tag.rev, end_rev=None
         ).will_once(Return(commits))
         unreleased_changes = self.api.fetch_unreleased_changes(self.version_tag)
@@ -151,7 +167,7 @@ class TestFetchUnreleasedChanges:
 
     def test_parse_unreleased_feature(self):
         commits = [make_dummy_commit("feat: a feat")]
-        self.vcs_reader_writer_mock.list_commits.expect_call(
+        self.vcs_reader_writer_mock.iter_commits.expect_call(
             start_rev=self.version_tag.tag.rev, end_rev=None
         ).will_once(Return(commits))
         unreleased_changes = self.api.fetch_unreleased_changes(self.version_tag)
@@ -164,7 +180,7 @@ class TestFetchUnreleasedChanges:
 
     def test_parse_unreleased_other_breaking_change(self):
         commits = [make_dummy_commit("test!: a breaking test fix")]
-        self.vcs_reader_writer_mock.list_commits.expect_call(
+        self.vcs_reader_writer_mock.iter_commits.expect_call(
             start_rev=self.version_tag.tag.rev, end_rev=None
         ).will_once(Return(commits))
         unreleased_changes = self.api.fetch_unreleased_changes(self.version_tag)
@@ -179,6 +195,217 @@ class TestFetchUnreleasedChanges:
         assert unreleased.data.description == "a breaking test fix"
 
 
+class TestDetectBumpSeverity:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, api: API, vcs_reader_writer_mock):
+        self.api = api
+        self.vcs_reader_writer_mock = vcs_reader_writer_mock
+        self.version_tag = make_dummy_version_tag(Version.from_str("1.0.0"))
+
+    def expect_commits(self, *messages: str):
+        commits = iter([make_dummy_commit(x) for x in messages])
+        self.vcs_reader_writer_mock.iter_commits.expect_call(
+            start_rev=self.version_tag.tag.rev, end_rev=None
+        ).will_once(Return(commits))
+        return commits
+
+    @pytest.mark.parametrize(
+        "messages, expected_severity",
+        [
+            ([], None),
+            (["non conventional change", "chore: a chore"], None),
+            (["fix: a fix", "chore: a chore"], ChangeSeverity.FIX),
+            (["fix: a fix", "feat: a feat", "fix: another fix"], ChangeSeverity.FEAT),
+            (["fix: a fix", "test!: a breaking test fix"], ChangeSeverity.BREAKING),
+        ],
+    )
+    def test_detect_highest_severity_of_changes(self, messages, expected_severity):
+        self.expect_commits(*messages)
+        assert self.api.detect_bump_severity(self.version_tag) == expected_severity
+
+    def test_stop_reading_commits_once_breaking_change_is_found(self):
+        commits = self.expect_commits("feat!: a breaking feat", "fix: a fix", "fix: another fix")
+        assert self.api.detect_bump_severity(self.version_tag) == ChangeSeverity.BREAKING
+        assert len(list(commits)) == 2
+
+
+class TestParseCommitsInParallel:
+
+    @pytest.fixture
+    def commits(self):
+        messages = ["fix: a fix", "non conventional change", "feat!: a breaking feat"]
+        return [make_dummy_commit(messages[i % len(messages)]) for i in range(1500)]
+
+    @pytest.fixture
+    def hook_api_mock(self):
+        hook_function_mock = ABCMock("hook_function_mock", IHookFunction)
+        hook_function_mock.invoke_many.expect_call(_).will_repeatedly(
+            Invoke(lambda args_list: [ConventionalCommit.from_commit(*x) for x in args_list])
+        )
+        hook_api_mock = ABCMock("hook_api_mock", IHookApi)
+        hook_api_mock.get_hook.expect_call("core.semver.commit_parser", _).will_once(
+            Return(hook_function_mock)
+        )
+        hook_api_mock.loaded_hook_names.expect_call().will_once(Return(set()))
+        with satisfied(hook_api_mock):
+            yield hook_api_mock
+
+    def test_commits_are_parsed_in_original_order(
+        self, loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, hook_api_stub, commits
+    ):
+        api = SemVerApi(
+            loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, hook_api_stub, parse_jobs=2
+        )
+        vcs_reader_writer_mock.iter_commits.expect_call(start_rev=None, end_rev=None).will_once(
+            Return(iter(commits))
+        )
+        conventional_commits = api.list_conventional_commits()
+        assert conventional_commits == [
+            x for x in map(ConventionalCommit.from_commit, commits) if x is not None
+        ]
+
+    def test_commit_parser_defined_in_hook_file_is_run_by_worker_processes(
+        self, loaded_config, loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, commits
+    ):
+        tmpdir_fs.write(
+            "hook.py",
+            textwrap.dedent(
+                """
+            import os
+
+            from bumpify.core.semver.hooks import commit_parser_hook
+            from bumpify.core.semver.objects import ConventionalCommit
+
+            @commit_parser_hook
+            def parse(commit):
+                with open(os.path.join(os.path.dirname(__file__), "pids.txt"), "a") as fd:
+                    fd.write(f"{os.getpid()}\\n")
+                return ConventionalCommit.from_commit(commit)
+            """
+            ).encode(),
+        )
+        loaded_config.config.save_section(HookConfig(paths=["hook.py"]))
+        hook_api = HookApiLoader(loaded_config, tmpdir_fs).load()
+        api = SemVerApi(
+            loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, hook_api, parse_jobs=2
+        )
+        vcs_reader_writer_mock.iter_commits.expect_call(start_rev=None, end_rev=None).will_once(
+            Return(iter(commits))
+        )
+        conventional_commits = api.list_conventional_commits()
+        assert conventional_commits == [
+            x for x in map(ConventionalCommit.from_commit, commits) if x is not None
+        ]
+        pids = tmpdir_fs.read("pids.txt").decode().split()
+        assert len(pids) == len(commits)
+        assert str(os.getpid()) not in pids
+
+    def test_commits_are_parsed_serially_if_hook_cannot_be_pickled(
+        self, loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, hook_api_mock, commits
+    ):
+        api = SemVerApi(
+            loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, hook_api_mock, parse_jobs=2
+        )
+        vcs_reader_writer_mock.iter_commits.expect_call(start_rev=None, end_rev=None).will_once(
+            Return(iter(commits))
+        )
+        conventional_commits = api.list_conventional_commits()
+        assert len(conventional_commits) == 1000
+
+
+def parse_fixes_in_batch(commits):
+    return [
+        ConventionalCommit.from_commit(x) if x.message.startswith("fix") else None for x in commits
+    ]
+
+
+def parse_in_batch_dropping_last(commits):
+    return [ConventionalCommit.from_commit(x) for x in commits[:-1]]
+
+
+class HookFunctionStub(IHookFunction):
+
+    def __init__(self, func):
+        self._func = func
+
+    def invoke(self, *args, **kwargs):
+        return self._func(*args, **kwargs)
+
+    def invoke_many(self, args_list):
+        return [self._func(*x) for x in args_list]
+
+
+class BatchHookApiStub(IHookApi):
+
+    def __init__(self, batch_func):
+        self._batch_func = batch_func
+
+    def loaded_hook_names(self):
+        return {"core.semver.commit_parser_batch"}
+
+    def get_hook(self, name, default_func):
+        if name == "core.semver.commit_parser_batch":
+            return HookFunctionStub(self._batch_func)
+        return HookFunctionStub(default_func)
+
+    def close(self):
+        pass
+
+
+class TestParseCommitsInBatch:
+
+    @pytest.fixture
+    def commits(self):
+        messages = ["fix: a fix", "non conventional change", "feat!: a breaking feat"]
+        return [make_dummy_commit(messages[i % len(messages)]) for i in range(1500)]
+
+    @pytest.fixture
+    def make_api(self, loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, commits):
+        vcs_reader_writer_mock.iter_commits.expect_call(start_rev=None, end_rev=None).will_once(
+            Return(iter(commits))
+        )
+        return lambda hook_api, parse_jobs: SemVerApi(
+            loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, hook_api, parse_jobs=parse_jobs
+        )
+
+    @pytest.mark.parametrize("parse_jobs", [1, 2])
+    def test_when_batch_hook_is_defined_then_it_is_used_instead_of_commit_parser_hook(
+        self, make_api, commits, parse_jobs
+    ):
+        api = make_api(BatchHookApiStub(parse_fixes_in_batch), parse_jobs)
+        conventional_commits = api.list_conventional_commits()
+        assert conventional_commits == [
+            ConventionalCommit.from_commit(x) for x in commits if x.message.startswith("fix")
+        ]
+
+    @pytest.mark.parametrize("parse_jobs", [1, 2])
+    def test_when_batch_hook_returns_wrong_number_of_results_then_error_is_raised(
+        self, make_api, parse_jobs
+    ):
+        api = make_api(BatchHookApiStub(parse_in_batch_dropping_last), parse_jobs)
+        with pytest.raises(CommitParserBatchHookError) as excinfo:
+            api.list_conventional_commits()
+        assert excinfo.value.num_commits == 512
+        assert excinfo.value.num_results == 511
+
+    def test_commit_parser_hooks_are_resolved_only_once(
+        self, make_api, vcs_reader_writer_mock, commits
+    ):
+        hook_api_mock = ABCMock("hook_api_mock", IHookApi)
+        hook_api_mock.get_hook.expect_call("core.semver.commit_parser", _).will_once(
+            Invoke(lambda _, default_func: HookFunctionStub(default_func))
+        )
+        hook_api_mock.loaded_hook_names.expect_call().will_once(Return(set()))
+        api = make_api(hook_api_mock, 1)
+        with satisfied(hook_api_mock):
+            assert len(api.list_conventional_commits()) == 1000
+            vcs_reader_writer_mock.iter_commits.expect_call(start_rev=None, end_rev=None).will_once(
+                Return(iter(commits))
+            )
+            assert len(api.list_conventional_commits()) == 1000
+
+
 class TestFetchChangelog:
 
     @pytest.fixture(autouse=True)
@@ -218,9 +445,9 @@ class TestFetchChangelog:
             make_dummy_version_tag(Version.from_str("0.0.2")),
         ]
         commits = [make_dummy_commit("fix: a fix")]
-        self.vcs_reader_writer_mock.list_commits.expect_call(
-            start_rev=version_tags[0].tag.rev, end_rev=version_tags[1].tag.rev
-        ).will_once(Return(commits))
+        self.vcs_reader_writer_mock.list_commits_partitioned.expect_call(
+            [x.tag.rev for x in version_tags]
+        ).will_once(Return([commits]))
         changelog = self.api.fetch_changelog(version_tags)
         assert changelog is not None
         assert len(changelog.entries) == 2
@@ -242,16 +469,13 @@ class TestFetchChangelog:
             make_dummy_version_tag(Version.from_str("0.0.3")),
         ]
         first_commits = [make_dummy_commit("fix: a fix")]
-        self.vcs_reader_writer_mock.list_commits.expect_call(
-            start_rev=version_tags[0].tag.rev, end_rev=version_tags[1].tag.rev
-        ).will_once(Return(first_commits))
         second_commits = [
             make_dummy_commit("fix: a fix"),
             make_dummy_commit("feat: a feat"),
         ]
-        self.vcs_reader_writer_mock.list_commits.expect_call(
-            start_rev=version_tags[1].tag.rev, end_rev=version_tags[2].tag.rev
-        ).will_once(Return(second_commits))
+        self.vcs_reader_writer_mock.list_commits_partitioned.expect_call(
+            [x.tag.rev for x in version_tags]
+        ).will_once(Return([first_commits, second_commits]))
         changelog = self.api.fetch_changelog(version_tags)
         assert changelog is not None
         assert len(changelog.entries) == 3
@@ -290,9 +514,9 @@ class TestFetchChangelog:
             make_dummy_version_tag(Version.from_str("0.0.1")),
             make_dummy_version_tag(Version.from_str("0.0.2")),
         ]
-        self.vcs_reader_writer_mock.list_commits.expect_call(
-            start_rev=version_tags[0].tag.rev, end_rev=version_tags[1].tag.rev
-        ).will_once(Return([]))
+        self.vcs_reader_writer_mock.list_commits_partitioned.expect_call(
+            [x.tag.rev for x in version_tags]
+        ).will_once(Return([[]]))
         changelog = self.api.fetch_changelog(version_tags)
         assert changelog is not None
         assert len(changelog.entries) == 2
@@ -301,6 +525,87 @@ class TestFetchChangelog:
         self.validate_middle_entry(second, version_tags[1], version_tags[0], None)
 
 
+class TestFetchChangelogWithCache:
+
+    @staticmethod
+    def make_version_tag(version_str: str) -> VersionTag:
+        # NOTE: Cached dates are stored with a resolution of seconds, just like
+        # the dates read from VCS repository
+        created = datetime.datetime(1999, 1, 1)
+        return VersionTag(
+            tag=make_dummy_tag(f"v{version_str}", created=created),
+            version=Version.from_str(version_str),
+        )
+
+    @staticmethod
+    def make_commit(message: str):
+        return make_dummy_commit(message, author_date=datetime.datetime(1999, 1, 1))
+
+    @pytest.fixture
+    def cache_fs(self, tmpdir):
+        return FileSystemReaderWriter(tmpdir.join("cache"))
+
+    @pytest.fixture
+    def make_api(
+        self, loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, hook_api_stub, cache_fs
+    ):
+
+        def make_api(fingerprint: str = "dummy") -> API:
+            changelog_cache = ChangelogCache(cache_fs, "changelog.json", fingerprint)
+            return SemVerApi(
+                loaded_semver_config,
+                tmpdir_fs,
+                vcs_reader_writer_mock,
+                hook_api_stub,
+                changelog_cache,
+            )
+
+        return make_api
+
+    @pytest.fixture(autouse=True)
+    def setup(self, make_api, vcs_reader_writer_mock, tmpdir_fs):
+        self.make_api = make_api
+        self.vcs_reader_writer_mock = vcs_reader_writer_mock
+        self.tmpdir_fs = tmpdir_fs
+        self.version_tags = [
+            self.make_version_tag("0.0.1"),
+            self.make_version_tag("0.0.2"),
+            self.make_version_tag("0.1.0"),
+        ]
+        self.commits = [
+            [self.make_commit("fix: a fix")],
+            [self.make_commit("feat: a feat")],
+        ]
+        self.vcs_reader_writer_mock.list_commits_partitioned.expect_call(
+            [x.tag.rev for x in self.version_tags]
+        ).will_once(Return(self.commits))
+        self.expected_changelog = self.make_api().fetch_changelog(self.version_tags)
+
+    def test_when_called_again_then_changelog_is_loaded_from_cache(self):
+        assert self.make_api().fetch_changelog(self.version_tags) == self.expected_changelog
+
+    def test_cache_files_are_not_written_to_project_filesystem(self):
+        assert self.tmpdir_fs.modified_paths() == set()
+
+    def test_when_new_version_tag_added_then_only_commits_after_newest_cached_tag_are_read(self):
+        new_version_tag = self.make_version_tag("0.1.1")
+        new_commits = [self.make_commit("fix: another fix")]
+        self.vcs_reader_writer_mock.list_commits_partitioned.expect_call(
+            [self.version_tags[-1].tag.rev, new_version_tag.tag.rev]
+        ).will_once(Return([new_commits]))
+        changelog = self.make_api().fetch_changelog(self.version_tags + [new_version_tag])
+        assert changelog.entries[:-1] == self.expected_changelog.entries
+        assert changelog.entries[-1].version == new_version_tag.version
+        assert changelog.entries[-1].data.fixes[0].commit == new_commits[0]
+
+    def test_when_fingerprint_changes_then_cache_is_discarded(self):
+        self.vcs_reader_writer_mock.list_commits_partitioned.expect_call(
+            [x.tag.rev for x in self.version_tags]
+        ).will_once(Return(self.commits))
+        api = self.make_api(fingerprint="changed")
+        assert api.fetch_changelog(self.version_tags) == self.expected_changelog
+
+
 class TestUpdateChangelogFiles:
 
     @pytest.fixture
@@ -441,6 +746,30 @@ class TestUpdateChangelogFiles:
             self.api.update_changelog_files(changelog)
             assert self.tmpdir_fs.exists(self.changelog_json_path)
             assert read_json(self.tmpdir_fs, self.changelog_json_path) == expected_json_data
+            content = self.tmpdir_fs.read(self.changelog_json_path).decode()
+            assert content == json.dumps(dump_valid(changelog, exclude_none=True), indent=2)
+
+        @pytest.mark.parametrize("encoding", ["utf-16"])
+        def test_changelog_file_is_written_using_configured_encoding(
+            self, semver_config: SemVerConfig, encoding: str
+        ):
+            semver_config.changelog_files[0].encoding = encoding
+            changelog = Changelog(
+                entries=[
+                    ChangelogEntry(
+                        version=Version.from_str("0.0.1"), released=datetime.datetime(1999, 1, 1)
+                    ),
+                    ChangelogEntry(
+                        version=Version.from_str("0.0.2"),
+                        prev_version=Version.from_str("0.0.1"),
+                        released=datetime.datetime(1999, 1, 2),
+                    ),
+                ]
+            )
+            self.api.update_changelog_files(changelog)
+            content = self.tmpdir_fs.read(self.changelog_json_path)
+            expected_content = json.dumps(dump_valid(changelog, exclude_none=True), indent=2)
+            assert content.decode(encoding) == expected_content
 
     class TestUpdateChangelogMarkdownFile:
 
@@ -529,6 +858,206 @@ class TestUpdateChangelogFiles:
             content = self.tmpdir_fs.read(self.changelog_markdown_path).decode()
             assert content == expected_content
 
+    class TestUpdateChangelogJsonLinesFile:
+
+        @pytest.fixture
+        def changelog_file_path(self):
+            return "CHANGELOG.jsonl"
+
+        def test_each_entry_is_written_as_a_single_json_line_with_newest_entry_last(
+            self, api: API, tmpdir_fs: IFileSystemReaderWriter, changelog_file_path: str
+        ):
+            changelog = Changelog(
+                entries=[
+                    ChangelogEntry(
+                        version=Version.from_str("0.0.1"), released=datetime.datetime(1999, 1, 1)
+                    ),
+                    ChangelogEntry(
+                        version=Version.from_str("0.0.2"),
+                        prev_version=Version.from_str("0.0.1"),
+                        released=datetime.datetime(1999, 1, 2),
+                    ),
+                ]
+            )
+            api.update_changelog_files(changelog)
+            lines = tmpdir_fs.read(changelog_file_path).decode().splitlines()
+            assert [json.loads(x) for x in lines] == [
+                dump_valid(x, exclude_none=True) for x in changelog.entries
+            ]
+
+    class TestUpdateChangelogMessagePackFile:
+
+        @pytest.fixture
+        def changelog_file_path(self):
+            return "CHANGELOG.msgpack"
+
+        def test_each_entry_is_written_as_messagepack_map_with_newest_entry_last(
+            self, api: API, tmpdir_fs: IFileSystemReaderWriter, changelog_file_path: str
+        ):
+            changelog = Changelog(
+                entries=[
+                    ChangelogEntry(
+                        version=Version.from_str("0.0.1"), released=datetime.datetime(1999, 1, 1)
+                    ),
+                    ChangelogEntry(
+                        version=Version.from_str("0.0.2"), released=datetime.datetime(1999, 1, 2)
+                    ),
+                ]
+            )
+            api.update_changelog_files(changelog)
+            assert tmpdir_fs.read(changelog_file_path) == (
+                b"\x82\xa7version\x84\xa5major\x00\xa5minor\x00\xa5patch\x01\xaaprerelease\x90"
+                b"\xa8released\xb31999-01-01T00:00:00"
+                b"\x82\xa7version\x84\xa5major\x00\xa5minor\x00\xa5patch\x02\xaaprerelease\x90"
+                b"\xa8released\xb31999-01-02T00:00:00"
+            )
+
+    class TestUpdateChangelogFileUsingCustomFormatter:
+
+        class TextChangelogFormatter(IChangelogFormatter):
+
+            def format(self, changelog: Changelog, encoding: str):
+                for entry in changelog.entries:
+                    yield f"{entry.version.to_str()}\n".encode(encoding)
+
+            def format_appended(self, content, entries, encoding):
+                return None
+
+        @pytest.fixture
+        def changelog_file_path(self):
+            return "CHANGELOG.txt"
+
+        @pytest.fixture
+        def hook_api_mock(self):
+            hook_function_mock = ABCMock("hook_function_mock", IHookFunction)
+            hook_function_mock.invoke.expect_call(_).will_once(
+                Invoke(lambda x: {**x, ".txt": self.TextChangelogFormatter()})
+            )
+            hook_api_mock = ABCMock("hook_api_mock", IHookApi)
+            hook_api_mock.get_hook.expect_call("core.semver.changelog_formatters", _).will_once(
+                Return(hook_function_mock)
+            )
+            with satisfied(hook_api_mock, hook_function_mock):
+                yield hook_api_mock
+
+        def test_changelog_formatter_registered_by_hook_is_used(
+            self,
+            loaded_semver_config,
+            tmpdir_fs: IFileSystemReaderWriter,
+            vcs_reader_writer_mock,
+            hook_api_mock,
+            changelog_file_path: str,
+        ):
+            api = SemVerApi(loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, hook_api_mock)
+            changelog = Changelog(
+                entries=[
+                    ChangelogEntry(
+                        version=Version.from_str("0.0.1"), released=datetime.datetime(1999, 1, 1)
+                    ),
+                ]
+            )
+            api.update_changelog_files(changelog)
+            assert tmpdir_fs.read(changelog_file_path) == b"0.0.1\n"
+
+
+class TestUpdateChangelogFilesWithCache:
+
+    @staticmethod
+    def make_entry(version_str: str, prev_version_str: str = None, *messages: str):
+        return ChangelogEntry(
+            version=Version.from_str(version_str),
+            prev_version=Version.from_str(prev_version_str) if prev_version_str else None,
+            released=datetime.datetime(1999, 1, 1),
+            data=(
+                ChangelogEntryData.from_conventional_commit_list(
+                    [
+                        make_dummy_conventional_commit(
+                            x, rev="abc", author_date=datetime.datetime(1999, 1, 1)
+                        )
+                        for x in messages
+                    ]
+                )
+                if messages
+                else None
+            ),
+        )
+
+    @pytest.fixture
+    def semver_config(self, semver_config: SemVerConfig, changelog_file_path):
+        semver_config.changelog_files = [SemVerConfig.ChangelogFile(path=changelog_file_path)]
+        return semver_config
+
+    @pytest.fixture(
+        params=["CHANGELOG.md", "CHANGELOG.json", "CHANGELOG.jsonl", "CHANGELOG.msgpack"]
+    )
+    def changelog_file_path(self, request):
+        return request.param
+
+    @pytest.fixture
+    def make_api(
+        self, loaded_semver_config, tmpdir_fs, vcs_reader_writer_mock, hook_api_stub, tmpdir
+    ):
+
+        def make_api() -> API:
+            cache_fs = FileSystemReaderWriter(tmpdir.join("cache"))
+            changelog_cache = ChangelogCache(cache_fs, "changelog.json", "dummy")
+            return SemVerApi(
+                loaded_semver_config,
+                tmpdir_fs,
+                vcs_reader_writer_mock,
+                hook_api_stub,
+                changelog_cache,
+            )
+
+        return make_api
+
+    @pytest.fixture(autouse=True)
+    def setup(self, make_api, tmpdir_fs: IFileSystemReaderWriter, changelog_file_path: str):
+        self.make_api = make_api
+        self.tmpdir_fs = tmpdir_fs
+        self.changelog_file_path = changelog_file_path
+        self.entries = [
+            self.make_entry("0.0.1"),
+            self.make_entry("0.0.2", "0.0.1", "fix: a fix"),
+            self.make_entry("0.1.0", "0.0.2", "feat: a feat", "fix!: a breaking fix"),
+            self.make_entry("0.1.1", "0.1.0"),
+        ]
+        self.make_api().update_changelog_files(Changelog(entries=self.entries[:2]))
+
+    def read_changelog_file(self) -> bytes:
+        return self.tmpdir_fs.read(self.changelog_file_path)
+
+    def update_changelog_file(self, changelog: Changelog) -> bytes:
+        self.make_api().update_changelog_files(changelog)
+        return self.read_changelog_file()
+
+    def test_when_new_entries_added_then_file_is_same_as_if_formatted_from_scratch(self):
+        changelog = Changelog(entries=self.entries)
+        content = self.update_changelog_file(changelog)
+        self.tmpdir_fs.write(self.changelog_file_path, b"")
+        assert self.update_changelog_file(changelog) == content
+
+    def test_entries_already_written_to_file_are_not_formatted_again(self):
+        entries = [self.make_entry("0.0.1"), self.make_entry("0.0.2", "0.0.1", "fix: changed")]
+        entries += self.entries[2:]
+        content = self.update_changelog_file(Changelog(entries=entries))
+        assert b"a fix" in content
+        assert b"changed" not in content
+
+    def test_when_file_was_modified_then_it_is_formatted_from_scratch(self):
+        self.tmpdir_fs.write(self.changelog_file_path, self.read_changelog_file() + b"\n")
+        entries = [self.make_entry("0.0.1"), self.make_entry("0.0.2", "0.0.1", "fix: changed")]
+        entries += self.entries[2:]
+        content = self.update_changelog_file(Changelog(entries=entries))
+        assert b"a fix" not in content
+        assert b"changed" in content
+
+    def test_when_cached_version_does_not_match_then_file_is_formatted_from_scratch(self):
+        entries = [self.make_entry("0.0.1"), self.make_entry("0.0.3", "0.0.1", "fix: changed")]
+        content = self.update_changelog_file(Changelog(entries=entries))
+        assert b"a fix" not in content
+        assert b"changed" in content
+
 
 class TestUpdateVersionFiles:
 
@@ -729,3 +1258,207 @@ class TestUpdateVersionFiles:
             self, api: API, version_after: Version
         ):
             api.update_version_files(version_after)
+
+
+class TestUpdateFiles:
+
+    @pytest.fixture
+    def semver_config(self, semver_config: SemVerConfig):
+        semver_config.changelog_files = [SemVerConfig.ChangelogFile(path="CHANGELOG.md")]
+        semver_config.version_files = [
+            SemVerConfig.VersionFile(path=f"pkg{i}/pyproject.toml", prefix="version")
+            for i in range(20)
+        ]
+        return semver_config
+
+    @pytest.fixture(autouse=True)
+    def setup(self, api: API, tmpdir_fs: IFileSystemReaderWriter, semver_config: SemVerConfig):
+        self.api = api
+        self.tmpdir_fs = tmpdir_fs
+        self.semver_config = semver_config
+        for vf in semver_config.version_files:
+            tmpdir_fs.write(vf.path, b'[project]\nversion = "0.0.1"\n')
+        tmpdir_fs.clear_modified_paths()
+        self.changelog = Changelog(
+            entries=[
+                ChangelogEntry(
+                    version=Version.from_str("0.0.1"), released=datetime.datetime(1999, 1, 1)
+                )
+            ]
+        )
+
+    def test_update_changelog_and_all_version_files(self):
+        self.api.update_files(self.changelog, Version.from_str("0.1.0"))
+        for vf in self.semver_config.version_files:
+            assert self.tmpdir_fs.read(vf.path) == b'[project]\nversion = "0.1.0"\n'
+        assert (
+            self.tmpdir_fs.read("CHANGELOG.md") == b"## 0.0.1 (1999-01-01)\n\nInitial release.\n\n"
+        )
+        assert self.tmpdir_fs.modified_paths() == {
+            "CHANGELOG.md",
+            *(vf.path for vf in self.semver_config.version_files),
+        }
+
+    def test_when_one_of_version_files_cannot_be_updated_then_no_file_is_written(self):
+        invalid_version_file = self.semver_config.version_files[10]
+        self.tmpdir_fs.write(invalid_version_file.path, b"[project]\n")
+        self.tmpdir_fs.clear_modified_paths()
+        with pytest.raises(VersionFileNotUpdated) as excinfo:
+            self.api.update_files(self.changelog, Version.from_str("0.0.1"))
+        assert excinfo.value.path == invalid_version_file.path
+        assert self.tmpdir_fs.modified_paths() == set()
+        assert not self.tmpdir_fs.exists("CHANGELOG.md")
+
+    def test_when_changelog_formatter_fails_part_way_then_no_file_is_written(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+
+        def format(self, changelog, encoding):
+            yield b'{\n  "entries": ['
+            raise RuntimeError("formatting failed")
+
+        monkeypatch.setattr(JsonChangelogFormatter, "format", format)
+        self.semver_config.changelog_files.append(SemVerConfig.ChangelogFile(path="CHANGELOG.json"))
+        with pytest.raises(RuntimeError):
+            self.api.update_files(self.changelog, Version.from_str("0.1.0"))
+        assert self.tmpdir_fs.modified_paths() == set()
+        assert sorted(self.tmpdir_fs.scan()) == sorted(
+            vf.path for vf in self.semver_config.version_files
+        )
+        for vf in self.semver_config.version_files:
+            assert self.tmpdir_fs.read(vf.path) == b'[project]\nversion = "0.0.1"\n'
+
+    def test_when_changelog_file_format_is_not_supported_then_no_file_is_written(self):
+        self.semver_config.changelog_files[0].path = "CHANGELOG.unsupported"
+        with pytest.raises(UnsupportedChangelogFormat):
+            self.api.update_files(self.changelog, Version.from_str("0.0.1"))
+        assert self.tmpdir_fs.modified_paths() == set()
+
+
+class TestDiscoverVersionFiles:
+
+    @pytest.fixture
+    def index(self, tmpdir):
+        return VersionFileIndex(FileSystemReaderWriter(tmpdir.join("cache")), "index.json")
+
+    @pytest.fixture(params=["git", "scan"])
+    def vcs(self, request: pytest.FixtureRequest, tmpdir_vcs_connector, vcs_reader_writer_mock):
+        if request.param == "git":
+            tmpdir_vcs_connector.init()
+            vcs = tmpdir_vcs_connector.connect()
+            yield vcs
+            vcs.close()
+            return
+        vcs_reader_writer_mock.list_tracked_paths.expect_call(
+            include_untracked=True
+        ).will_repeatedly(
+            Raise(ShellCommandError(("git", "ls-files"), 128, b"", b"fatal: not a git repository"))
+        )
+        yield vcs_reader_writer_mock
+
+    @pytest.fixture
+    def api(self, loaded_semver_config, tmpdir_fs, vcs, hook_api_stub, index):
+        return SemVerApi(
+            loaded_semver_config,
+            tmpdir_fs,
+            vcs,
+            hook_api_stub,
+            version_file_index=index,
+        )
+
+    @pytest.fixture(autouse=True)
+    def setup(self, api: API, tmpdir_fs: IFileSystemReaderWriter, index: VersionFileIndex):
+        self.api = api
+        self.tmpdir_fs = tmpdir_fs
+        self.index = index
+        tmpdir_fs.write(".gitignore", b"node_modules/\n")
+        tmpdir_fs.write(
+            "pyproject.toml",
+            b'[build-system]\nrequires = ["poetry-core"]\n\n[tool.poetry]\nversion = "0.1.0"\n',
+        )
+        tmpdir_fs.write("web/package.json", b'{\n  "name": "web",\n  "version": "0.2.0"\n}\n')
+        tmpdir_fs.write("web/node_modules/dep/package.json", b'{"version": "9.9.9"}\n')
+        tmpdir_fs.write("rust/Cargo.toml", b'[package]\nname = "x"\nversion = "0.3.0-rc.1"\n')
+        tmpdir_fs.write("src/pkg/__init__.py", b'"""Package."""\n\n__version__ = "0.4.0"\n')
+        tmpdir_fs.write("src/pkg/sub/__init__.py", b"")
+        tmpdir_fs.write(
+            "other/pyproject.toml", b'[project]\nname = "x"\n\n[tool.x]\nversion = "1.0.0"\n'
+        )
+
+    def test_find_version_files_and_locate_versions(self):
+        locations = self.api.discover_version_files()
+        assert [
+            (x.version_file.path, x.version_file.section, x.version_file.prefix, x.line)
+            for x in locations
+        ] == [
+            ("pyproject.toml", "[tool.poetry]", "version", 5),
+            ("rust/Cargo.toml", "[package]", "version", 3),
+            ("src/pkg/__init__.py", None, "__version__", 3),
+            ("web/package.json", None, '"version"', 3),
+        ]
+        assert [x.version.to_str() for x in locations] == ["0.1.0", "0.3.0-rc.1", "0.4.0", "0.2.0"]
+        for x in locations:
+            content = self.tmpdir_fs.read(x.version_file.path)
+            assert x.version.to_str().encode() in content[x.offset : x.offset + x.length]
+
+    def test_files_ignored_by_vcs_are_skipped(self, tmpdir_fs: IFileSystemReaderWriter):
+        tmpdir_fs.write(".gitignore", b"node_modules/\nrust/\n")
+        locations = self.api.discover_version_files()
+        assert [x.version_file.path for x in locations] == [
+            "pyproject.toml",
+            "src/pkg/__init__.py",
+            "web/package.json",
+        ]
+
+    def test_project_tree_is_scanned_only_if_vcs_cannot_list_files(
+        self, vcs, vcs_reader_writer_mock, tmpdir_fs: IFileSystemReaderWriter, monkeypatch
+    ):
+        scan_calls = []
+        scan = tmpdir_fs.scan
+        monkeypatch.setattr(tmpdir_fs, "scan", lambda **kw: scan_calls.append(kw) or scan(**kw))
+        assert len(self.api.discover_version_files()) == 4
+        if vcs is vcs_reader_writer_mock:
+            assert scan_calls == [{"use_gitignore": True}]
+        else:
+            assert scan_calls == []
+
+    def test_found_locations_are_saved_in_index(self, tmpdir):
+        locations = self.api.discover_version_files()
+        index = VersionFileIndex(FileSystemReaderWriter(tmpdir.join("cache")), "index.json")
+        for x in locations:
+            assert index.load_location(x.version_file.path) == x
+
+    def test_version_file_is_updated_at_indexed_location(self, semver_config: SemVerConfig):
+        locations = self.api.discover_version_files()
+        semver_config.version_files = [x.version_file for x in locations]
+        for version_str in ["1.0.0", "1.0.0-alpha.1", "1.0.1"]:
+            self.api.update_version_files(Version.from_str(version_str))
+            for x in semver_config.version_files:
+                location = self.index.load_location(x.path)
+                content = self.tmpdir_fs.read(x.path)
+                assert location.version.to_str() == version_str
+                assert (
+                    content[location.offset : location.offset + location.length].count(
+                        version_str.encode()
+                    )
+                    == 1
+                )
+        assert self.tmpdir_fs.read("web/package.json") == (
+            b'{\n  "name": "web",\n  "version": "1.0.1"\n}\n'
+        )
+
+    def test_when_version_file_was_modified_after_indexing_then_index_is_not_used(
+        self, semver_config: SemVerConfig
+    ):
+        self.api.discover_version_files()
+        semver_config.version_files = [
+            SemVerConfig.VersionFile(path="src/pkg/__init__.py", prefix="__version__")
+        ]
+        self.tmpdir_fs.write(
+            "src/pkg/__init__.py", b'"""Package.\n\nLonger docstring."""\n\n__version__ = "0.4.0"\n'
+        )
+        self.api.update_version_files(Version.from_str("1.0.0"))
+        assert self.tmpdir_fs.read("src/pkg/__init__.py") == (
+            b'"""Package.\n\nLonger docstring."""\n\n__version__ = "1.0.0"\n'
+        )
+        assert self.index.load_location("src/pkg/__init__.py").line == 5
@@ -1,16 +1,20 @@
+import datetime
 from typing import List
 
 import pytest
 
+from bumpify import utils
 from bumpify.core.filesystem.interface import IFileSystemReaderWriter
 from bumpify.core.vcs import exc as vcs_exc
+from bumpify.core.vcs.implementation import git_native
 from bumpify.core.vcs.implementation.git import GitVcsConnector
+from bumpify.core.vcs.implementation.git_native import NativeGitVcsConnector
 from bumpify.core.vcs.interface import IVcsConnector, IVcsReaderWriter
 
 
-@pytest.fixture
-def connector(tmpdir_fs):
-    return GitVcsConnector(tmpdir_fs)
+@pytest.fixture(params=[GitVcsConnector, NativeGitVcsConnector])
+def connector(request: pytest.FixtureRequest, tmpdir_fs):
+    return request.param(tmpdir_fs)
 
 
 class TestWithNonExistingRepository:
@@ -135,12 +139,43 @@ class TestWithInitialCommit:
         assert len(commits) == 1
         assert self.sut.list_commits(end_rev=self.initial_rev) == commits
 
+    def test_list_commits_partitioned_with_single_rev_returns_empty_list(self):
+        assert self.sut.list_commits_partitioned([self.initial_rev]) == []
+
     def test_list_committed_paths_returns_paths_that_were_modified_in_given_commit(
         self, committed_paths
     ):
         paths = self.sut.list_committed_paths(self.initial_rev)
         assert set(paths) == set(committed_paths)
 
+    def test_list_tracked_paths_returns_paths_of_committed_files(self, committed_paths):
+        self.tmpdir_fs.write("untracked.txt", b"dummy content")
+        assert set(self.sut.list_tracked_paths()) == set(committed_paths)
+
+    def test_list_tracked_paths_can_include_untracked_files_that_are_not_ignored(
+        self, committed_paths
+    ):
+        self.tmpdir_fs.write(".gitignore", b"*.log\n")
+        self.tmpdir_fs.write("untracked.txt", b"dummy content")
+        self.tmpdir_fs.write("ignored.log", b"dummy content")
+        assert set(self.sut.list_tracked_paths(include_untracked=True)) == {
+            *committed_paths,
+            ".gitignore",
+            "untracked.txt",
+        }
+
+    def test_reset_removes_added_files_from_index_without_modifying_them(self, committed_paths):
+        self.tmpdir_fs.write(committed_paths[0], b"modified content")
+        self.tmpdir_fs.write("new.txt", b"new content")
+        self.sut.add(committed_paths[0], "new.txt")
+        self.sut.reset(committed_paths[0], "new.txt")
+        self.tmpdir_fs.write("other.txt", b"other content")
+        self.sut.add("other.txt")
+        rev = self.sut.commit("add other.txt")
+        assert self.sut.list_committed_paths(rev) == ["other.txt"]
+        assert self.tmpdir_fs.read(committed_paths[0]) == b"modified content"
+        assert self.tmpdir_fs.read("new.txt") == b"new content"
+
     def test_list_reachable_tags_returns_empty_list_if_no_tags_are_found(self):
         assert self.sut.list_merged_tags(self.initial_rev) == []
 
@@ -169,6 +204,14 @@ class TestWithInitialCommit:
         assert excinfo.value.repository_root_dir == str(tmpdir)
         assert excinfo.value.tag_name == tag_name
 
+    @pytest.mark.parametrize("tag_name", ["dummy"])
+    def test_when_commit_created_with_date_then_its_tag_is_created_at_that_date(self, tag_name):
+        date = datetime.datetime(2024, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc)
+        rev = self.sut.commit("chore: dated commit", allow_empty=True, date=date)
+        self.sut.tag(rev, tag_name)
+        assert self.sut.list_commits()[-1].author_date == date
+        assert self.sut.list_merged_tags()[-1].created == date
+
     def test_branch_cannot_be_created_twice(self, branch_name, tmpdir):
         with pytest.raises(vcs_exc.BranchAlreadyExists) as excinfo:
             self.sut.branch(branch_name)
@@ -190,6 +233,36 @@ class TestWithMultipleCommits:
             self.sut.commit(f"chore: commit message #{i}", allow_empty=True)
         self.all_commits = self.sut.list_commits()
 
+    def test_find_head_rev_follows_newly_created_commits(self):
+        assert self.sut.find_head_rev() == self.all_commits[-1].rev
+        rev = self.sut.commit("chore: one more commit", allow_empty=True)
+        assert self.sut.find_head_rev() == rev
+        self.sut.branch("dummy")
+        self.sut.checkout("dummy")
+        rev = self.sut.commit("chore: commit on a branch", allow_empty=True)
+        assert self.sut.find_head_rev() == rev
+
+    def test_find_initial_rev_returns_root_commit(self):
+        assert self.sut.find_initial_rev() == self.all_commits[0].rev
+        self.sut.commit("chore: one more commit", allow_empty=True)
+        assert self.sut.find_initial_rev() == self.all_commits[0].rev
+
+    def test_iter_commits_yields_same_commits_as_list_commits(self):
+        assert list(self.sut.iter_commits()) == self.all_commits
+        start_rev, end_rev = self.all_commits[2].rev, self.all_commits[-2].rev
+        assert list(self.sut.iter_commits(start_rev, end_rev)) == self.all_commits[3:-1]
+
+    def test_iter_commits_can_be_stopped_before_all_commits_are_read(self):
+        iterator = self.sut.iter_commits()
+        assert next(iterator) == self.all_commits[0]
+        iterator.close()
+
+    def test_iter_commits_yields_commits_with_messages_larger_than_read_buffer(self):
+        message = "chore: a long commit\n\n" + "Lorem ipsum dolor sit amet. " * 3500
+        self.sut.commit(message, allow_empty=True)
+        *_, commit = self.sut.iter_commits(start_rev=self.all_commits[-1].rev)
+        assert commit.message == message.strip()
+
     def test_list_commits_with_start_rev_only(self):
         commits = self.sut.list_commits(start_rev=self.all_commits[0].rev)
         assert len(commits) == len(self.all_commits) - 1
@@ -206,3 +279,164 @@ class TestWithMultipleCommits:
         )
         assert len(commits) == len(self.all_commits) - 2
         assert commits == self.all_commits[1:-1]
+
+    def test_list_commits_partitioned_returns_same_commits_as_list_commits_for_each_range(self):
+        revs = [self.all_commits[x].rev for x in (0, 3, 4, 9)]
+        expected_result = [
+            self.sut.list_commits(start_rev=start_rev, end_rev=end_rev)
+            for start_rev, end_rev in zip(revs, revs[1:])
+        ]
+        result = self.sut.list_commits_partitioned(revs)
+        assert [len(x) for x in result] == [3, 1, 5]
+        assert result == expected_result
+
+    def test_list_commits_partitioned_returns_empty_lists_for_duplicated_revs(self):
+        revs = [self.all_commits[x].rev for x in (0, 0, 2, 2, 5)]
+        result = self.sut.list_commits_partitioned(revs)
+        assert result == [[], self.all_commits[1:3], [], self.all_commits[3:6]]
+
+
+class TestPartitionCommitsByTags:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, connector: IVcsConnector, tmpdir_fs: IFileSystemReaderWriter):
+        connector.init()
+        self.sut = connector.connect()
+        self.tmpdir_fs = tmpdir_fs
+        self._commit("chore: initial commit", 1)
+        self._git("tag", "v0.1.0")
+        main_branch = self.sut.current_branch()
+        self._git("checkout", "-q", "-b", "side")
+        self._commit("feat: side", 2)
+        self._git("checkout", "-q", main_branch)
+        self._commit("fix: main", 3)
+        self._git("tag", "-a", "v0.1.1", "-m", "Annotated tag")
+        self._git("merge", "--no-ff", "-m", "Merge branch 'side'", "side", date=4)
+        self._git("tag", "-a", "v0.2.0", "-m", "Annotated tag")
+
+    def _git(self, *args: str, date: int = None):
+        env = None
+        if date is not None:
+            timestamp = f"@{1700000000 + 60 * date} +0000"
+            env = {"GIT_AUTHOR_DATE": timestamp, "GIT_COMMITTER_DATE": timestamp}
+        with utils.cwd(self.tmpdir_fs.abspath()):
+            return utils.shell_exec("git", *args, env=env).decode()
+
+    def _commit(self, message: str, date: int):
+        self._git("commit", "-q", "--allow-empty", "-m", message, date=date)
+
+    def test_annotated_tags_are_peeled_to_commits(self):
+        tags = self.sut.list_merged_tags()
+        assert [x.name for x in tags] == ["v0.1.0", "v0.1.1", "v0.2.0"]
+        assert [x.rev for x in tags] == [
+            self._git("rev-parse", f"{x.name}^{{commit}}") for x in tags
+        ]
+
+    def test_commits_merged_from_other_branches_belong_to_release_they_were_merged_in(self):
+        revs = [x.rev for x in self.sut.list_merged_tags()]
+        result = self.sut.list_commits_partitioned(revs)
+        assert [[x.message for x in commits] for commits in result] == [
+            ["fix: main"],
+            ["feat: side", "Merge branch 'side'"],
+        ]
+
+    def test_commits_are_partitioned_by_annotated_tag_names(self):
+        result = self.sut.list_commits_partitioned(["v0.1.0", "v0.1.1", "v0.2.0"])
+        assert [len(x) for x in result] == [1, 2]
+        assert result == [
+            self.sut.list_commits(start_rev=start_rev, end_rev=end_rev)
+            for start_rev, end_rev in [("v0.1.0", "v0.1.1"), ("v0.1.1", "v0.2.0")]
+        ]
+
+
+class TestNativeReaderMatchesGitExecutable:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir_fs: IFileSystemReaderWriter):
+        GitVcsConnector(tmpdir_fs).init()
+        self.git = GitVcsConnector(tmpdir_fs).connect()
+        self.tmpdir_fs = tmpdir_fs
+        yield
+        self.git.close()
+
+    def _git(self, *args: str):
+        with utils.cwd(self.tmpdir_fs.abspath()):
+            utils.shell_exec("git", *args)
+
+    def _make_history(self):
+        for i in range(3):
+            self.tmpdir_fs.write("file.txt", f"line #{i}\n".encode() * 200)
+            self.git.add("file.txt")
+            self.git.commit(f"feat: commit #{i}\n\nBody of commit #{i}")
+        self.git.tag(self.git.find_head_rev(), "v0.1.0")
+        self._git("tag", "-a", "v0.1.1", "-m", "Annotated tag")
+        main_branch = self.git.current_branch()
+        self.git.branch("feature")
+        self.git.checkout("feature")
+        self.git.commit("fix: on feature branch", allow_empty=True)
+        self.git.checkout(main_branch)
+        self.git.commit("fix: on master branch", allow_empty=True)
+        self._git("merge", "--no-ff", "-m", "Merge branch 'feature'", "feature")
+        self.git.tag(self.git.find_head_rev(), "v0.2.0")
+
+    def _assert_same_results(self):
+        native = NativeGitVcsConnector(self.tmpdir_fs).connect()
+        try:
+            tags = self.git.list_merged_tags()
+            assert native.list_merged_tags() == tags
+            assert native.current_branch() == self.git.current_branch()
+            assert native.find_head_rev() == self.git.find_head_rev()
+            assert native.find_initial_rev() == self.git.find_initial_rev()
+            assert native.list_commits() == self.git.list_commits()
+            for tag in tags:
+                assert native.list_commits(end_rev=tag.name) == self.git.list_commits(
+                    end_rev=tag.name
+                )
+                assert native.list_commits(start_rev=tag.rev) == self.git.list_commits(
+                    start_rev=tag.rev
+                )
+            revs = [tag.rev for tag in tags]
+            assert native.list_commits_partitioned(revs) == self.git.list_commits_partitioned(revs)
+        finally:
+            native.close()
+
+    def test_read_loose_objects_and_refs(self):
+        self._make_history()
+        self._assert_same_results()
+
+    def test_read_packed_objects_and_refs(self):
+        self._make_history()
+        self._git("gc", "--quiet", "--aggressive")
+        assert not self.tmpdir_fs.exists(".git/refs/tags/v0.1.0")
+        self._assert_same_results()
+
+    def test_read_objects_written_after_connecting(self):
+        self._make_history()
+        native = NativeGitVcsConnector(self.tmpdir_fs).connect()
+        try:
+            assert len(native.list_commits()) == 6
+            self._git("gc", "--quiet")
+            rev = self.git.commit("chore: one more commit", allow_empty=True)
+            assert native.find_head_rev() == rev
+            assert native.list_commits() == self.git.list_commits()
+        finally:
+            native.close()
+
+    def test_when_unsupported_object_is_found_during_iteration_then_git_executable_is_used(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        self._make_history()
+        commits = self.git.list_commits()
+        native = NativeGitVcsConnector(self.tmpdir_fs).connect()
+        make_commit = native._make_commit
+
+        def make_commit_failing_on_third_commit(oid: str):
+            if oid == commits[2].rev:
+                raise git_native._UnsupportedRepository("invalid pack object type: 0")
+            return make_commit(oid)
+
+        monkeypatch.setattr(native, "_make_commit", make_commit_failing_on_third_commit)
+        try:
+            assert native.list_commits() == commits
+        finally:
+            native.close()
@@ -43,6 +43,23 @@ class TestDryRunVcsReaderWriterProxy:
             )
         self.sut.add(*paths)
 
+    @pytest.mark.parametrize(
+        "paths",
+        [
+            ("foo.txt", "bar/spam.txt"),
+        ],
+    )
+    def test_reset(self, paths):
+        for path in paths:
+            self.console_output_mock.emit.expect_call(
+                Severity.INFO,
+                "Would",
+                Styled("reset", bold=True),
+                "following file in the index:",
+                Styled(path, bold=True),
+            )
+        self.sut.reset(*paths)
+
     @pytest.mark.parametrize("branch", ["dummy"])
     def test_branch(self, branch):
         rev = make_dummy_rev()
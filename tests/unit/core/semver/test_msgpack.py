@@ -0,0 +1,47 @@
+import pytest
+
+from bumpify.core.semver._msgpack import packb
+
+
+@pytest.mark.parametrize(
+    "obj, expected_data",
+    [
+        (None, b"\xc0"),
+        (False, b"\xc2"),
+        (True, b"\xc3"),
+        (0, b"\x00"),
+        (127, b"\x7f"),
+        (128, b"\xcc\x80"),
+        (65535, b"\xcd\xff\xff"),
+        (65536, b"\xce\x00\x01\x00\x00"),
+        (2**32, b"\xcf\x00\x00\x00\x01\x00\x00\x00\x00"),
+        (-1, b"\xff"),
+        (-32, b"\xe0"),
+        (-33, b"\xd0\xdf"),
+        (-129, b"\xd1\xff\x7f"),
+        (-(2**31), b"\xd2\x80\x00\x00\x00"),
+        (-(2**31) - 1, b"\xd3\xff\xff\xff\xff\x7f\xff\xff\xff"),
+        (1.5, b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00"),
+        ("", b"\xa0"),
+        ("zażółć", b"\xaaza\xc5\xbc\xc3\xb3\xc5\x82\xc4\x87"),
+        ("a" * 32, b"\xd9\x20" + b"a" * 32),
+        ("a" * 256, b"\xda\x01\x00" + b"a" * 256),
+        (b"\x00", b"\xc4\x01\x00"),
+        ([], b"\x90"),
+        ([1, [2]], b"\x92\x01\x91\x02"),
+        ([None] * 16, b"\xdc\x00\x10" + b"\xc0" * 16),
+        ({}, b"\x80"),
+        ({"a": {"b": None}}, b"\x81\xa1a\x81\xa1b\xc0"),
+        (
+            {str(i): i for i in range(16)},
+            b"\xde\x00\x10" + b"".join(packb(str(i)) + bytes([i]) for i in range(16)),
+        ),
+    ],
+)
+def test_pack_object(obj, expected_data):
+    assert packb(obj) == expected_data
+
+
+def test_packing_object_of_unsupported_type_fails():
+    with pytest.raises(TypeError):
+        packb(object())
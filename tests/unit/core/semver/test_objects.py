@@ -1,6 +1,18 @@
+import pickle
+
 import pytest
+from modelity.api import ParsingError
 
-from bumpify.core.semver.objects import ConventionalCommitData, Version, VersionComponent
+from bumpify.core.semver.objects import (
+    ChangeSeverity,
+    ConventionalCommit,
+    ConventionalCommitData,
+    SemVerConfig,
+    Version,
+    VersionComponent,
+)
+from bumpify.core.vcs.helpers import make_dummy_commit
+from bumpify.model import dump_valid
 
 
 class TestVersion:
@@ -75,6 +87,49 @@ class TestVersion:
         assert not (left < right)
         assert not (right > left)
 
+    @pytest.mark.parametrize(
+        "left, right",
+        [
+            ("1.0.0", "1.0.0-rc"),
+            ("1.0.0-rc.1", "1.0.0-rc"),
+        ],
+    )
+    def test_version_without_prerelease_part_or_with_more_prerelease_parts_is_higher(
+        self, left: str, right: str
+    ):
+        assert Version.from_str(left) > Version.from_str(right)
+        assert not (Version.from_str(left) < Version.from_str(right))
+
+    def test_sorting_by_sort_key_orders_versions_by_precedence(self):
+        ordered = [
+            "1.0.0-alpha",
+            "1.0.0-alpha.1",
+            "1.0.0-alpha.beta",
+            "1.0.0-beta",
+            "1.0.0-beta.2",
+            "1.0.0-beta.11",
+            "1.0.0-rc.1",
+            "1.0.0",
+            "1.0.1",
+            "1.10.0",
+            "2.0.0",
+        ]
+        versions = [Version.from_str(x) for x in reversed(ordered)]
+        versions.sort(key=lambda x: x.sort_key)
+        assert [x.to_str() for x in versions] == ordered
+
+    def test_parsing_same_string_twice_returns_independent_objects(self):
+        first = Version.from_str("1.0.0-rc.1")
+        first.prerelease.append(2)
+        assert Version.from_str("1.0.0-rc.1") == Version(
+            major=1, minor=0, patch=0, prerelease=["rc", 1]
+        )
+
+    def test_numeric_prerelease_identifiers_are_compared_numerically(self):
+        left = Version(major=1, minor=0, patch=0, prerelease=["rc", "2"])
+        right = Version(major=1, minor=0, patch=0, prerelease=["rc", 11])
+        assert left < right
+
     @pytest.mark.parametrize(
         "value, expected_version",
         [
@@ -337,3 +392,67 @@ class TestConventionalCommitData:
     )
     def test_when_commit_message_is_invalid_then_none_is_returned(self, invalid_message: str):
         assert ConventionalCommitData.from_commit_message(invalid_message) is None
+
+
+class TestConventionalCommit:
+
+    def test_conventional_commit_can_be_pickled(self):
+        commit = make_dummy_commit("feat(foo)!: a feat\n\nBREAKING CHANGE: a breaking change")
+        conventional_commit = ConventionalCommit.from_commit(commit)
+        restored = pickle.loads(pickle.dumps(conventional_commit))
+        assert restored == conventional_commit
+        restored.data.breaking_changes.append("another breaking change")
+        assert restored.data.breaking_changes == [
+            "a feat",
+            "a breaking change",
+            "another breaking change",
+        ]
+
+    def test_conventional_commit_parsed_from_commit_is_valid(self):
+        commit = make_dummy_commit("fix(foo): a fix\n\nA body.\n\nRefs: #1")
+        conventional_commit = ConventionalCommit.from_commit(commit)
+        assert dump_valid(conventional_commit) == dump_valid(
+            ConventionalCommit(
+                commit=commit,
+                data=ConventionalCommitData(
+                    type="fix",
+                    scope="foo",
+                    description="a fix",
+                    body="A body.",
+                    footers={"Refs": "#1"},
+                ),
+            )
+        )
+        with pytest.raises(ParsingError):
+            conventional_commit.data.breaking_changes.append(123)
+
+
+class TestChangeSeverity:
+
+    @pytest.mark.parametrize(
+        "message, expected_severity",
+        [
+            ("fix: a fix", ChangeSeverity.FIX),
+            ("feat: a feat", ChangeSeverity.FEAT),
+            ("fix!: a breaking fix", ChangeSeverity.BREAKING),
+            ("chore!: a breaking chore", ChangeSeverity.BREAKING),
+            ("chore: a chore", None),
+        ],
+    )
+    def test_severity_of_conventional_commit(self, message, expected_severity):
+        data = ConventionalCommitData.from_commit_message(message)
+        assert data.severity == expected_severity
+
+    @pytest.mark.parametrize(
+        "severity, expected_component",
+        [
+            (ChangeSeverity.BREAKING, VersionComponent.MINOR),
+            (ChangeSeverity.FEAT, VersionComponent.PATCH),
+            (ChangeSeverity.FIX, VersionComponent.PATCH),
+        ],
+    )
+    def test_find_version_component_to_bump_for_severity(self, severity, expected_component):
+        bump_rule = SemVerConfig.BumpRule(
+            branch="main", when_breaking="minor", when_feat="patch", when_fix="patch"
+        )
+        assert bump_rule.find_component(severity) == expected_component
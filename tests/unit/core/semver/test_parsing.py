@@ -0,0 +1,72 @@
+import itertools
+import random
+
+import pytest
+
+from bumpify.core.semver._parsing import ConventionalCommitParser, parse_conventional_commit
+
+
+def parse_using_state_machine(message: str):
+    parser = ConventionalCommitParser()
+    for line in message.splitlines():
+        if not parser.feed(line):
+            return None
+    return parser.output()
+
+
+SUBJECTS = [
+    "fix: a fix",
+    "feat(core): a feature",
+    "feat!: a breaking feature",
+    "refactor(api)!: a breaking refactor",
+    "fix: ",
+    "fix:no space",
+    "fix(): empty scope",
+    "fix(a-b): scope with dash",
+    "just a message",
+    "",
+]
+
+LINES = [
+    "",
+    " ",
+    "body line",
+    "Refs: #123",
+    "Signed-off-by: John Doe",
+    "BREAKING CHANGE: something changed",
+    "BREAKING-CHANGE: something else changed",
+    "BREAKING CHANGE:",
+    "not-a: tag: with colon",
+    "Bad Tag: value",
+    "  indented continuation",
+]
+
+LINE_BREAKS = ["\n", "\r\n", "\r", "\x0b", " "]
+
+
+def make_corpus():
+    corpus = [
+        "",
+        "\n",
+        "fix: a\n",
+        "fix: a\n\n",
+        "fix: a\nb",
+        "fix: a\n\nb\n\n\nRefs: #1",
+        "fix: a\r\n\r\nbody\x0bRefs: #1",
+        "feat!: a\n\nBREAKING CHANGE: b\n  continued\n\nRefs: #1\nRefs: #2\n",
+    ]
+    for subject, break_ in itertools.product(SUBJECTS, LINE_BREAKS):
+        corpus.append(subject)
+        corpus.append(break_.join([subject, "", "body line"]))
+    rnd = random.Random(0)
+    for _ in range(500):
+        lines = [rnd.choice(SUBJECTS[:4]), ""] + rnd.choices(LINES, k=rnd.randint(0, 8))
+        corpus.append(rnd.choice(LINE_BREAKS).join(lines) + rnd.choice(["", "\n"]))
+    return corpus
+
+
+class TestParseConventionalCommit:
+
+    @pytest.mark.parametrize("message", make_corpus())
+    def test_output_is_same_as_produced_by_reference_state_machine(self, message: str):
+        assert parse_conventional_commit(message) == parse_using_state_machine(message)
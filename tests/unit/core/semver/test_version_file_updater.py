@@ -0,0 +1,131 @@
+import io
+import mmap
+import random
+
+import pytest
+
+from bumpify.core.semver._version_file_updater import VersionFileUpdater, update_version_file_buffer
+from bumpify.core.semver.exc import VersionFileNotUpdated
+from bumpify.core.semver.objects import SemVerConfig, Version
+
+VERSION = Version.from_str("1.2.3")
+
+LINES = [
+    "",
+    "  ",
+    "# section",
+    "  # section \t",
+    "# section two",
+    "version = 0.1.0",
+    '  version = "0.1.0-rc.1+build.5"',
+    "other = 0.2.0",
+    "other = 1.2.3",
+    "version = 1.2.3",
+    "versions: 0.1.0 and 0.2.0",
+    "no version here",
+    "zażółć = 0.3.0",
+    "version = 0.4.0",
+    " # section",
+    "٣.0.0",
+]
+
+VERSION_FILES = [
+    SemVerConfig.VersionFile(path="dummy"),
+    SemVerConfig.VersionFile(path="dummy", prefix="version"),
+    SemVerConfig.VersionFile(path="dummy", section="# section"),
+    SemVerConfig.VersionFile(path="dummy", section="# section", prefix="version"),
+    SemVerConfig.VersionFile(path="dummy", prefix=" version"),
+    SemVerConfig.VersionFile(path="dummy", prefix="zażółć"),
+    SemVerConfig.VersionFile(path="dummy", encoding="latin-1"),
+    SemVerConfig.VersionFile(path="dummy", encoding="utf-16"),
+]
+
+
+def update_line_by_line(vf: SemVerConfig.VersionFile, content: bytes):
+    dest = io.StringIO()
+    updater = VersionFileUpdater(vf, VERSION, dest)
+    for line in io.StringIO(content.decode(vf.encoding)):
+        updater.feed(line)
+    try:
+        updater.feed("")
+    except VersionFileNotUpdated:
+        return None
+    return dest.getvalue().encode(vf.encoding)
+
+
+def make_corpus():
+    corpus = []
+    rnd = random.Random(0)
+    for vf in VERSION_FILES:
+        for _ in range(200):
+            lines = rnd.choices(LINES, k=rnd.randint(0, 8))
+            line_break = rnd.choice(["\n", "\r\n"])
+            text = line_break.join(lines) + rnd.choice(["", line_break])
+            try:
+                corpus.append((vf, text.encode(vf.encoding)))
+            except UnicodeEncodeError:
+                pass
+    return corpus
+
+
+class TestUpdateVersionFileBuffer:
+
+    @pytest.mark.parametrize("vf, content", make_corpus())
+    def test_output_is_same_as_produced_by_line_by_line_updater(
+        self, vf: SemVerConfig.VersionFile, content: bytes
+    ):
+        result = update_version_file_buffer(vf, VERSION, content)
+        if result is not None:
+            assert result == update_line_by_line(vf, content)
+
+    @pytest.mark.parametrize(
+        "vf, content, expected_result",
+        [
+            (
+                VERSION_FILES[0],
+                b'a = "1.2.3"\nb = "0.1.0"\nc = "0.2.0"\n',
+                b'a = "1.2.3"\nb = "1.2.3"\nc = "0.2.0"\n',
+            ),
+            (VERSION_FILES[1], b"x = 0.1.0\nversion = 0.2.0\n", b"x = 0.1.0\nversion = 1.2.3\n"),
+            (
+                VERSION_FILES[2],
+                b"x = 0.1.0\n# section\ny = 0.2.0",
+                b"x = 0.1.0\n# section\ny = 1.2.3",
+            ),
+            (
+                VERSION_FILES[3],
+                b"# section\nx = 0.1.0\nversion = 0.2.0\n",
+                b"# section\nx = 0.1.0\nversion = 1.2.3\n",
+            ),
+        ],
+    )
+    def test_update_ascii_content_without_fallback(
+        self, vf: SemVerConfig.VersionFile, content: bytes, expected_result: bytes
+    ):
+        assert update_version_file_buffer(vf, VERSION, content) == expected_result
+
+    def test_update_memory_mapped_file_leaving_tail_unchanged(self, tmpdir):
+        tail = "".join(f'"dep-{i}": "0.{i}.0",\n' for i in range(10000)).encode()
+        path = tmpdir.join("package-lock.json")
+        path.write_binary(b'{\n  "version": "0.1.0",\n' + tail + b"}\n")
+        vf = SemVerConfig.VersionFile(path="package-lock.json", prefix='"version"')
+        with open(path, "rb") as fd:
+            with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                result = update_version_file_buffer(vf, VERSION, buf)
+        assert result == b'{\n  "version": "1.2.3",\n' + tail + b"}\n"
+
+    @pytest.mark.parametrize(
+        "vf, content",
+        [
+            (VERSION_FILES[0], b"no version here\n"),
+            (VERSION_FILES[1], b"x = 0.1.0\n"),
+            (VERSION_FILES[2], b"x = 0.1.0\n"),
+            (VERSION_FILES[0], "zażółć = 0.3.0\n".encode()),
+            (VERSION_FILES[4], b" version = 0.1.0\n"),
+            (VERSION_FILES[7], "x = 0.1.0\n".encode("utf-16")),
+        ],
+    )
+    def test_return_none_if_line_by_line_updater_must_be_used(
+        self, vf: SemVerConfig.VersionFile, content: bytes
+    ):
+        assert update_version_file_buffer(vf, VERSION, content) is None
@@ -0,0 +1,94 @@
+import datetime
+import pickle
+
+import pytest
+
+from bumpify.core.hook import _sandbox
+from bumpify.core.semver.helpers import make_dummy_version_tag
+from bumpify.core.semver.objects import (
+    Changelog,
+    ChangelogEntry,
+    ChangelogEntryData,
+    ConventionalCommit,
+    Version,
+)
+from bumpify.core.vcs.helpers import make_dummy_commit, make_dummy_tag
+from bumpify.core.vcs.objects import Commit
+from bumpify.model import dump_valid
+
+RELEASED = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+
+
+def make_conventional_commit() -> ConventionalCommit:
+    commit = make_dummy_commit(
+        "feat(foo)!: a feat\n\nA body.\n\nBREAKING CHANGE: a breaking change\nRefs: #1"
+    )
+    return ConventionalCommit.from_commit(commit)
+
+
+def make_changelog_entry() -> ChangelogEntry:
+    data = ChangelogEntryData()
+    data.update(make_conventional_commit())
+    return ChangelogEntry(
+        version=Version.from_str("1.0.0-rc.1+build.5"),
+        prev_version=Version.from_str("0.1.0"),
+        released=RELEASED,
+        data=data,
+    )
+
+
+def make_changelog() -> Changelog:
+    changelog = Changelog()
+    changelog.add_entry(ChangelogEntry(version=Version.from_str("0.1.0"), released=RELEASED))
+    changelog.add_entry(make_changelog_entry())
+    return changelog
+
+
+# Models that are sent to worker processes, either by the pool parsing
+# commits in parallel, or as arguments and return values of sandboxed hooks
+MODELS = [
+    make_dummy_commit("fix: a fix"),
+    Commit.construct(
+        rev="a" * 40,
+        author="John Doe",
+        author_email="john@example.com",
+        author_date=RELEASED,
+        message="chore: constructed",
+    ),
+    make_dummy_tag("v1.0.0", created=RELEASED),
+    Version.from_str("1.0.0-rc.1+build.5"),
+    make_dummy_version_tag(Version.from_str("1.2.3")),
+    make_conventional_commit(),
+    make_conventional_commit().data,
+    make_changelog_entry().data,
+    make_changelog_entry(),
+    make_changelog(),
+]
+
+
+def pickle_round_trip(obj):
+    return pickle.loads(pickle.dumps(obj))
+
+
+def sandbox_round_trip(obj):
+    frame = _sandbox.dump_message(("ok", obj))
+    return _sandbox.load_message(frame[4:])[1]
+
+
+@pytest.mark.parametrize("round_trip", [pickle_round_trip, sandbox_round_trip])
+@pytest.mark.parametrize("model", MODELS, ids=lambda x: type(x).__name__)
+def test_model_is_same_after_being_sent_to_another_process(model, round_trip):
+    restored = round_trip(model)
+    assert type(restored) is type(model)
+    assert restored == model
+    assert pickle_round_trip(restored) == model
+
+
+@pytest.mark.parametrize("round_trip", [pickle_round_trip, sandbox_round_trip])
+def test_containers_of_restored_model_can_be_modified(round_trip):
+    restored = round_trip(make_conventional_commit())
+    restored.data.breaking_changes.append("another breaking change")
+    restored.data.footers["Closes"] = "#2"
+    assert restored.data.breaking_changes[-1] == "another breaking change"
+    assert restored.data.footers == {"Refs": "#1", "Closes": "#2"}
+    dump_valid(restored)